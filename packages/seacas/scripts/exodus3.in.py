@@ -63,11 +63,26 @@ import sys
 if sys.version_info[0] < 3:
     raise Exception("Python-3 version. If using python-2, try `import exodus2 as exodus`")
 
+import atexit
+import bisect
+import collections
 import ctypes
+import hashlib
+import itertools
+import json
 import os
 import locale
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from enum import Enum
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the manifest is then not locked
+    fcntl = None
+
 EXODUS_PY_COPYRIGHT_AND_LICENSE = __doc__
 
 EXODUS_PY_VERSION = "1.20.14 (seacas-py3)"
@@ -90,14 +105,17 @@ Authors:
   David Littlewood (djlittl@sandia.gov)
 """
 
+# console output (the banner on first use and the "Opening"/"Closing"
+# messages) is off unless EXODUS_PY_VERBOSE is set to a non-zero value in
+# the environment or VERBOSE is set to True
+VERBOSE = os.getenv('EXODUS_PY_VERBOSE', '0') not in ('', '0')
+
 # show the banner on first use
 SHOW_BANNER = True
 
 ## Documentation is generated on a Mac laptop using:
 ## pdoc --force --html ../lib/exodus.py
 
-sys.dont_write_bytecode = True
-
 ONELINE = "Gather from or export to Exodus files using the Exodus library"
 
 def basename(file_name):
@@ -130,12 +148,6 @@ def getExodusVersion():
                return 100 * version_major + version_minor
     return 0
 
-
-try:
-    locale.setlocale(locale.LC_ALL, 'en_US.utf-8')
-except locale.Error:
-    locale.setlocale(locale.LC_ALL, 'C')
-
 class ex_options(Enum):
     """
     `ex_opts()` function codes - codes are OR'ed into exopts
@@ -159,12 +171,37 @@ class ex_options(Enum):
     EX_ABORT       = 4
     EX_NULLVERBOSE = 8
 
+class ex_option_type(Enum):
+    """
+    `ex_set_option()` option codes
+
+    Parameters
+    ----------
+    EX_OPT_MAX_NAME_LENGTH
+         Maximum length of names that will be returned/passed via api call
+    EX_OPT_COMPRESSION_TYPE
+         Not currently used; default is gzip
+    EX_OPT_COMPRESSION_LEVEL
+         In the range [0..9]. A value of 0 indicates no compression (netCDF-4 files only)
+    EX_OPT_COMPRESSION_SHUFFLE
+         1 if enabled, 0 if disabled (netCDF-4 files only)
+    EX_OPT_INTEGER_SIZE_API
+         4 or 8 indicating byte size of integers used in api functions
+    EX_OPT_INTEGER_SIZE_DB
+         Query only, returns 4 or 8 indicating byte size of integers stored on the database
+    """
+    EX_OPT_MAX_NAME_LENGTH     = 1
+    EX_OPT_COMPRESSION_TYPE    = 2
+    EX_OPT_COMPRESSION_LEVEL   = 3
+    EX_OPT_COMPRESSION_SHUFFLE = 4
+    EX_OPT_INTEGER_SIZE_API    = 5
+    EX_OPT_INTEGER_SIZE_DB     = 6
+
 ACCESS = os.getenv('ACCESS', '@ACCESSDIR@')
 if os.uname()[0] == 'Darwin':
     EXODUS_SO = ACCESS + "/@SEACAS_LIBDIR@/libexodus.dylib"
 else:
     EXODUS_SO = ACCESS + "/@SEACAS_LIBDIR@/libexodus.so"
-EXODUS_LIB = ctypes.cdll.LoadLibrary(EXODUS_SO)
 
 MAX_STR_LENGTH = 32      # match exodus default
 MAX_NAME_LENGTH = 256     # match exodus default
@@ -217,9 +254,55 @@ EX_MPIIO = 0x20000
 EX_MPIPOSIX = 0x40000  # \deprecated As of libhdf5 1.8.13.
 EX_PNETCDF = 0x80000
 
-# set exodus error output option
+# named settings for files created by `exodus(..., write_profile=name)`:
+# 'format' is the file format flag, 'compression' the zlib level (0-9) and
+# 'shuffle' the byte shuffle filter applied to each variable (netCDF-4
+# only), and 'int64' stores integers in the file as 64-bit values
+WRITE_PROFILES = {
+    # uncompressed 64-bit offset netCDF: fastest to write and read back
+    'fast': {'format': EX_64BIT_OFFSET, 'compression': 0, 'shuffle': False, 'int64': False},
+    # netCDF-4 with light compression: most of the size reduction at a
+    # fraction of the cost of higher levels
+    'balanced': {'format': EX_NETCDF4, 'compression': 1, 'shuffle': True, 'int64': False},
+    # netCDF-4 with heavier compression, for archiving
+    'small': {'format': EX_NETCDF4, 'compression': 6, 'shuffle': True, 'int64': False},
+}
+
+# exodus error output option, set when the library is loaded
 exErrPrintMode = ctypes.c_int(ex_options.EX_VERBOSE.value)
-EXODUS_LIB.ex_opts(exErrPrintMode)
+
+# serializes calls into the exodus library made from background threads
+# (see `exodus.iter_steps`) when the library was not built thread-safe
+EXODUS_LIB_LOCK = threading.RLock()
+
+_EXODUS_LIB = None
+
+
+def exodus_lib():
+    """
+    Return the exodus library, loading it from `EXODUS_SO` on first use.
+    The module-level name `EXODUS_LIB` resolves to the same object.
+
+    >>> lib = exodus_lib()
+    """
+    global _EXODUS_LIB
+    if _EXODUS_LIB is None:
+        with EXODUS_LIB_LOCK:
+            if _EXODUS_LIB is None:
+                try:
+                    locale.setlocale(locale.LC_ALL, 'en_US.utf-8')
+                except locale.Error:
+                    locale.setlocale(locale.LC_ALL, 'C')
+                lib = ctypes.cdll.LoadLibrary(EXODUS_SO)
+                lib.ex_opts(exErrPrintMode)
+                _EXODUS_LIB = lib
+    return _EXODUS_LIB
+
+
+def __getattr__(name):
+    if name == 'EXODUS_LIB':
+        return exodus_lib()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 class ex_inquiry(Enum):
@@ -291,6 +374,8 @@ class ex_inquiry(Enum):
         EX_INQ_MAX_READ_NAME_LENGTH = 50
         # inquire size of floating-point values stored on database
         EX_INQ_DB_FLOAT_SIZE = 51
+        # inquire if the library was built thread-safe (1) or not (0)
+        EX_INQ_THREADSAFE = 59
         EX_INQ_ASSEMBLY = 60
         EX_INQ_BLOB = 61
         EX_INQ_INVALID = -1
@@ -581,6 +666,958 @@ class ex_attribute(ctypes.Structure):
                 ("value_count", ctypes.c_longlong),
                 ("values", ctypes.c_void_p)]
 
+class ex_var_params(ctypes.Structure):
+    """
+    Used for accessing underlying exodus library...
+    """
+    _fields_ = [("num_glob", ctypes.c_int),
+                ("num_node", ctypes.c_int),
+                ("num_edge", ctypes.c_int),
+                ("num_face", ctypes.c_int),
+                ("num_elem", ctypes.c_int),
+                ("num_nset", ctypes.c_int),
+                ("num_eset", ctypes.c_int),
+                ("num_fset", ctypes.c_int),
+                ("num_sset", ctypes.c_int),
+                ("num_elset", ctypes.c_int),
+                ("edge_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("face_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("elem_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("nset_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("eset_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("fset_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("sset_var_tab", ctypes.POINTER(ctypes.c_int)),
+                ("elset_var_tab", ctypes.POINTER(ctypes.c_int))]
+
+# `ex_var_params` count and truth table fields of each object type
+EX_VAR_PARAMS_FIELDS = {
+    'EX_GLOBAL': ("num_glob", None),
+    'EX_NODAL': ("num_node", None),
+    'EX_EDGE_BLOCK': ("num_edge", "edge_var_tab"),
+    'EX_FACE_BLOCK': ("num_face", "face_var_tab"),
+    'EX_ELEM_BLOCK': ("num_elem", "elem_var_tab"),
+    'EX_NODE_SET': ("num_nset", "nset_var_tab"),
+    'EX_EDGE_SET': ("num_eset", "eset_var_tab"),
+    'EX_FACE_SET': ("num_fset", "fset_var_tab"),
+    'EX_SIDE_SET': ("num_sset", "sset_var_tab"),
+    'EX_ELEM_SET': ("num_elset", "elset_var_tab"),
+}
+
+#
+# ----------------------------------------------------------------------
+#
+
+# Return and argument types of the exodus library entry points used by
+# this module.  Integer arrays whose width follows one of the int64 API
+# flags of an open file are given as 'bulk' (EX_BULK_INT64_API), 'ids'
+# (EX_IDS_INT64_API), 'maps' (EX_MAPS_INT64_API) or 'inq'
+# (EX_INQ_INT64_API) and resolved by `exodus_prototypes`.
+_INT = ctypes.c_int
+_INT64 = ctypes.c_longlong
+_DOUBLE_P = ctypes.POINTER(ctypes.c_double)
+_VOID_P = ctypes.c_void_p
+_CHAR_P = ctypes.c_char_p
+
+EXODUS_PROTOTYPES = {
+    'ex_close': (_INT, [_INT]),
+    'ex_copy': (_INT, [_INT, _INT]),
+    'ex_copy_transient': (_INT, [_INT, _INT]),
+    'ex_create_int': (_INT, [_CHAR_P, _INT, ctypes.POINTER(_INT), ctypes.POINTER(_INT), _INT]),
+    'ex_get_all_times': (_INT, [_INT, _DOUBLE_P]),
+    'ex_get_assemblies': (_INT, [_INT, _VOID_P]),
+    'ex_get_assembly': (_INT, [_INT, _VOID_P]),
+    'ex_get_attr': (_INT, [_INT, _INT, _INT64, _DOUBLE_P]),
+    'ex_get_attribute': (_INT, [_INT, _VOID_P]),
+    'ex_get_attribute_count': (_INT, [_INT, _INT, _INT64]),
+    'ex_get_attribute_param': (_INT, [_INT, _INT, _INT64, _VOID_P]),
+    'ex_get_blob': (_INT, [_INT, _VOID_P]),
+    'ex_get_block': (_INT, [_INT, _INT, _INT64, _CHAR_P, 'bulk', 'bulk', 'bulk', 'bulk',
+                            'bulk']),
+    'ex_get_block_id_map': (_INT, [_INT, _INT, _INT64, 'maps']),
+    'ex_get_coord': (_INT, [_INT, _DOUBLE_P, _DOUBLE_P, _DOUBLE_P]),
+    'ex_get_coord_names': (_INT, [_INT, _VOID_P]),
+    'ex_get_elem_attr_names': (_INT, [_INT, _INT64, _VOID_P]),
+    'ex_get_elem_conn': (_INT, [_INT, _INT64, 'bulk']),
+    'ex_get_elem_num_map': (_INT, [_INT, 'maps']),
+    'ex_get_entity_count_per_polyhedra': (_INT, [_INT, _INT, _INT64, ctypes.POINTER(_INT)]),
+    'ex_get_id_map': (_INT, [_INT, _INT, 'maps']),
+    'ex_get_ids': (_INT, [_INT, _INT, 'ids']),
+    'ex_get_info': (_INT, [_INT, _VOID_P]),
+    'ex_get_init': (_INT, [_INT, _CHAR_P, 'bulk', 'bulk', 'bulk', 'bulk', 'bulk', 'bulk']),
+    'ex_get_map': (_INT, [_INT, 'maps']),
+    'ex_get_name': (_INT, [_INT, _INT, _INT64, _CHAR_P]),
+    'ex_get_names': (_INT, [_INT, _INT, _VOID_P]),
+    'ex_get_node_num_map': (_INT, [_INT, 'maps']),
+    'ex_get_node_set': (_INT, [_INT, _INT64, 'bulk']),
+    'ex_get_node_set_dist_fact': (_INT, [_INT, _INT64, _DOUBLE_P]),
+    'ex_get_object_truth_vector': (_INT, [_INT, _INT, _INT64, _INT, ctypes.POINTER(_INT)]),
+    'ex_get_one_attr': (_INT, [_INT, _INT, _INT64, _INT, _DOUBLE_P]),
+    'ex_get_partial_coord': (_INT, [_INT, _INT64, _INT64, _DOUBLE_P, _DOUBLE_P, _DOUBLE_P]),
+    'ex_get_partial_var': (_INT, [_INT, _INT, _INT, _INT, _INT64, _INT64, _INT64, _DOUBLE_P]),
+    'ex_get_prop': (_INT, [_INT, _INT, _INT64, _CHAR_P, 'ids']),
+    'ex_get_prop_names': (_INT, [_INT, _INT, _VOID_P]),
+    'ex_get_qa': (_INT, [_INT, _VOID_P]),
+    'ex_get_reduction_variable_name': (_INT, [_INT, _INT, _INT, _CHAR_P]),
+    'ex_get_reduction_variable_names': (_INT, [_INT, _INT, _INT, _VOID_P]),
+    'ex_get_reduction_variable_param': (_INT, [_INT, _INT, ctypes.POINTER(_INT)]),
+    'ex_get_reduction_vars': (_INT, [_INT, _INT, _INT, _INT64, _INT64, _DOUBLE_P]),
+    'ex_get_set_param': (_INT, [_INT, _INT, _INT64, 'bulk', 'bulk']),
+    'ex_get_side_set': (_INT, [_INT, _INT64, 'bulk', 'bulk']),
+    'ex_get_side_set_dist_fact': (_INT, [_INT, _INT64, _DOUBLE_P]),
+    'ex_get_side_set_node_list': (_INT, [_INT, _INT64, 'bulk', 'bulk']),
+    'ex_get_side_set_node_list_len': (_INT, [_INT, _INT64, 'bulk']),
+    'ex_get_time': (_INT, [_INT, _INT, _DOUBLE_P]),
+    'ex_get_truth_table': (_INT, [_INT, _INT, _INT, _INT, ctypes.POINTER(_INT)]),
+    'ex_get_var': (_INT, [_INT, _INT, _INT, _INT, _INT64, _INT64, _DOUBLE_P]),
+    'ex_get_var_time': (_INT, [_INT, _INT, _INT, _INT64, _INT, _INT, _DOUBLE_P]),
+    'ex_get_variable_name': (_INT, [_INT, _INT, _INT, _CHAR_P]),
+    'ex_get_variable_names': (_INT, [_INT, _INT, _INT, _VOID_P]),
+    'ex_get_variable_param': (_INT, [_INT, _INT, ctypes.POINTER(_INT)]),
+    'ex_inquire': (_INT, [_INT, _INT, 'inq', ctypes.POINTER(ctypes.c_float), _CHAR_P]),
+    'ex_inquire_int': (_INT64, [_INT, _INT]),
+    'ex_int64_status': (ctypes.c_uint, [_INT]),
+    'ex_open_int': (_INT, [_CHAR_P, _INT, ctypes.POINTER(_INT), ctypes.POINTER(_INT),
+                           ctypes.POINTER(ctypes.c_float), _INT]),
+    'ex_put_assemblies': (_INT, [_INT, ctypes.c_size_t, _VOID_P]),
+    'ex_put_assembly': (_INT, [_INT, ex_assembly]),
+    'ex_put_attr': (_INT, [_INT, _INT, _INT64, _DOUBLE_P]),
+    'ex_put_all_var_param_ext': (_INT, [_INT, ctypes.POINTER(ex_var_params)]),
+    'ex_put_attribute': (_INT, [_INT, ex_attribute]),
+    'ex_put_block': (_INT, [_INT, _INT, _INT64, _CHAR_P, _INT64, _INT64, _INT64, _INT64,
+                            _INT64]),
+    'ex_put_concat_elem_block': (_INT, [_INT, 'ids', _VOID_P, 'ids', 'ids', 'ids', _INT]),
+    'ex_put_conn': (_INT, [_INT, _INT, _INT64, 'bulk', 'bulk', 'bulk']),
+    'ex_put_coord': (_INT, [_INT, _DOUBLE_P, _DOUBLE_P, _DOUBLE_P]),
+    'ex_put_coord_names': (_INT, [_INT, _VOID_P]),
+    'ex_put_elem_attr_names': (_INT, [_INT, _INT64, _VOID_P]),
+    'ex_put_elem_conn': (_INT, [_INT, _INT64, 'bulk']),
+    'ex_put_entity_count_per_polyhedra': (_INT, [_INT, _INT, _INT64, ctypes.POINTER(_INT)]),
+    'ex_put_glob_vars': (_INT, [_INT, _INT, _INT, _DOUBLE_P]),
+    'ex_put_id_map': (_INT, [_INT, _INT, 'maps']),
+    'ex_put_info': (_INT, [_INT, _INT, _VOID_P]),
+    'ex_put_init': (_INT, [_INT, _CHAR_P, _INT64, _INT64, _INT64, _INT64, _INT64, _INT64]),
+    'ex_put_init_ext': (_INT, [_INT, ctypes.POINTER(ex_init_params)]),
+    'ex_put_name': (_INT, [_INT, _INT, _INT64, _CHAR_P]),
+    'ex_put_names': (_INT, [_INT, _INT, _VOID_P]),
+    'ex_put_node_set': (_INT, [_INT, _INT64, 'bulk']),
+    'ex_put_node_set_dist_fact': (_INT, [_INT, _INT64, _DOUBLE_P]),
+    'ex_put_one_attr': (_INT, [_INT, _INT, _INT64, _INT, _DOUBLE_P]),
+    'ex_put_partial_var': (_INT, [_INT, _INT, _INT, _INT, _INT64, _INT64, _INT64, _DOUBLE_P]),
+    'ex_put_prop': (_INT, [_INT, _INT, _INT64, _CHAR_P, _INT64]),
+    'ex_put_qa': (_INT, [_INT, _INT, _VOID_P]),
+    'ex_put_reduction_variable_name': (_INT, [_INT, _INT, _INT, _CHAR_P]),
+    'ex_put_reduction_variable_names': (_INT, [_INT, _INT, _INT, _VOID_P]),
+    'ex_put_reduction_variable_param': (_INT, [_INT, _INT, _INT]),
+    'ex_put_reduction_vars': (_INT, [_INT, _INT, _INT, _INT64, _INT64, _DOUBLE_P]),
+    'ex_put_set_param': (_INT, [_INT, _INT, _INT64, _INT64, _INT64]),
+    'ex_put_side_set': (_INT, [_INT, _INT64, 'bulk', 'bulk']),
+    'ex_put_side_set_dist_fact': (_INT, [_INT, _INT64, _DOUBLE_P]),
+    'ex_put_time': (_INT, [_INT, _INT, _DOUBLE_P]),
+    'ex_put_truth_table': (_INT, [_INT, _INT, _INT, _INT, ctypes.POINTER(_INT)]),
+    'ex_put_var': (_INT, [_INT, _INT, _INT, _INT, _INT64, _INT64, _DOUBLE_P]),
+    'ex_put_variable_name': (_INT, [_INT, _INT, _INT, _CHAR_P]),
+    'ex_put_variable_names': (_INT, [_INT, _INT, _INT, _VOID_P]),
+    'ex_put_variable_param': (_INT, [_INT, _INT, _INT]),
+    'ex_set_max_name_length': (_INT, [_INT, _INT]),
+    'ex_set_option': (_INT, [_INT, _INT, _INT]),
+    'ex_update': (_INT, [_INT]),
+}
+
+# Entry points only present in an exodus library built with MPI support
+# (PARALLEL_AWARE_EXODUS).  MPI_Comm and MPI_Info are an int or a pointer
+# depending on the MPI implementation, so 'comm' and 'info' are resolved
+# from the mpi4py handles by `exodus_parallel_prototypes`.
+EXODUS_PARALLEL_PROTOTYPES = {
+    'ex_create_par_int': (_INT, [_CHAR_P, _INT, ctypes.POINTER(_INT), ctypes.POINTER(_INT),
+                                 'comm', 'info', _INT]),
+    'ex_open_par_int': (_INT, [_CHAR_P, _INT, ctypes.POINTER(_INT), ctypes.POINTER(_INT),
+                               ctypes.POINTER(ctypes.c_float), 'comm', 'info', _INT]),
+}
+
+_INT64_API_FLAGS = {'bulk': EX_BULK_INT64_API, 'ids': EX_IDS_INT64_API,
+                    'maps': EX_MAPS_INT64_API, 'inq': EX_INQ_INT64_API}
+
+_PROTOTYPE_CACHE = {}
+
+
+class ExodusPrototypes:
+    """
+    Typed function pointers for every entry point in `EXODUS_PROTOTYPES`,
+    bound once for one combination of int64 API flags.  Arguments are
+    converted and checked by ctypes, so callers may pass plain Python
+    ints, and an integer array of the wrong width raises an error instead
+    of being silently misread.
+    """
+
+    def __init__(self, lib, int64_status):
+        self.int64_status = int64_status
+        self.__functions = {}
+        for name, (restype, argtypes) in EXODUS_PROTOTYPES.items():
+            argtypes = [self.int_pointer(arg) if isinstance(arg, str) else arg
+                        for arg in argtypes]
+            try:
+                function = ctypes.CFUNCTYPE(restype, *argtypes)((name, lib))
+            except AttributeError:
+                continue  # entry point not provided by this library version
+            self.__functions[name] = function
+            setattr(self, name, function)
+
+    def serialize(self, locked):
+        """
+        with `locked` true, rebind every entry point to a wrapper that
+        holds `EXODUS_LIB_LOCK` for the duration of the call; with it
+        false, restore the bare function pointers
+        """
+        for name, function in self.__functions.items():
+            setattr(self, name, _locked(function) if locked else function)
+
+    def int_type(self, kind):
+        """the ctypes integer type for 'bulk', 'ids', 'maps' or 'inq' data"""
+        if self.int64_status & _INT64_API_FLAGS[kind]:
+            return ctypes.c_longlong
+        return ctypes.c_int
+
+    def int_pointer(self, kind):
+        """pointer to `int_type(kind)`"""
+        return ctypes.POINTER(self.int_type(kind))
+
+
+def exodus_prototypes(int64_status=0):
+    """
+    Return the `ExodusPrototypes` for a file with the given
+    `ex_int64_status`; bindings are created once per combination of flags
+    and shared by all files using it.
+    """
+    key = int64_status & EX_ALL_INT64_API
+    if key not in _PROTOTYPE_CACHE:
+        prototypes = ExodusPrototypes(exodus_lib(), key)
+        with EXODUS_LIB_LOCK:
+            if _SERIALIZED_CALLS[0]:
+                prototypes.serialize(True)
+            _PROTOTYPE_CACHE[key] = prototypes
+    return _PROTOTYPE_CACHE[key]
+
+
+def _locked(function):
+    """`function`, called while holding `EXODUS_LIB_LOCK`"""
+    def call(*args):
+        with EXODUS_LIB_LOCK:
+            return function(*args)
+    return call
+
+
+# number of background readers currently running against a library that is
+# not thread-safe; while it is non-zero every libexodus call is serialized
+_SERIALIZED_CALLS = [0]
+
+
+def _serialize_library_calls(enable):
+    """
+    Start (`enable` true) or end serializing all libexodus calls, from
+    every handle and thread; calls stay serialized until every start has
+    been matched by an end.  Used for the lifetime of background readers
+    when the library is not thread-safe.
+    """
+    with EXODUS_LIB_LOCK:
+        _SERIALIZED_CALLS[0] += 1 if enable else -1
+        if _SERIALIZED_CALLS[0] == (1 if enable else 0):
+            for prototypes in _PROTOTYPE_CACHE.values():
+                if isinstance(prototypes, ExodusPrototypes):
+                    prototypes.serialize(enable)
+
+
+# position of the variable type argument of the libexodus calls that move
+# variable values; the variable index follows it
+_VARIABLE_CALLS = {'ex_get_var': 2, 'ex_put_var': 2, 'ex_get_partial_var': 2,
+                   'ex_put_partial_var': 2, 'ex_get_var_time': 1}
+
+
+class IOStats:
+    """
+    Call counts, wall time and bytes passed in array arguments of
+    libexodus calls, per entry point and per (object type, variable).
+    Filled by the handles opened with `exodus(..., profile_io=True)`; see
+    `exodus.io_stats` and `enable_io_stats`.  Calls may be recorded from
+    several threads, e.g. the reader of `exodus.iter_steps`.
+
+    >>> stats = IOStats()
+    >>> stats.record(stats.functions, 'ex_get_var', 0.002, 8000)
+    >>> print(stats.summary())
+    """
+
+    def __init__(self):
+        self.functions = {}
+        self.variables = {}
+        self.__lock = threading.Lock()
+
+    def record(self, table, key, seconds, nbytes):
+        """add one call taking `seconds` and passing `nbytes` to `table[key]`"""
+        with self.__lock:
+            entry = table.get(key)
+            if entry is None:
+                entry = table[key] = [0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += nbytes
+
+    def copy(self):
+        """a consistent snapshot of the counts as a new `IOStats`"""
+        stats = IOStats()
+        with self.__lock:
+            stats.functions = {key: list(values) for key, values in self.functions.items()}
+            stats.variables = {key: list(values) for key, values in self.variables.items()}
+        return stats
+
+    def merge(self, other):
+        """add the counts of another `IOStats` to these"""
+        other = other.copy()
+        with self.__lock:
+            for table, other_table in ((self.functions, other.functions),
+                                       (self.variables, other.variables)):
+                for key, (calls, seconds, nbytes) in other_table.items():
+                    entry = table.setdefault(key, [0, 0.0, 0])
+                    entry[0] += calls
+                    entry[1] += seconds
+                    entry[2] += nbytes
+
+    def as_dict(self):
+        """
+        the counts as plain dicts, suitable for `json.dump`: 'functions'
+        maps each entry point, and 'variables' each object type and then
+        variable, to a dict of 'calls', 'seconds' and 'bytes'; 'total' sums
+        all entry points
+        """
+        def entry(values):
+            return {'calls': values[0], 'seconds': values[1], 'bytes': values[2]}
+        stats = self.copy()
+        variables = {}
+        for (objType, name), values in sorted(stats.variables.items(), key=str):
+            variables.setdefault(objType, {})[str(name)] = entry(values)
+        total = [sum(values[i] for values in stats.functions.values()) for i in range(3)]
+        return {'functions': {name: entry(values)
+                              for name, values in sorted(stats.functions.items())},
+                'variables': variables,
+                'total': entry(total)}
+
+    def summary(self):
+        """a table of the entry points and variables, slowest first"""
+        lines = ["{:<40} {:>10} {:>12} {:>14}".format("libexodus call", "calls", "seconds",
+                                                      "bytes")]
+        stats = self.copy()
+        rows = sorted(stats.functions.items(), key=lambda item: -item[1][1])
+        rows += sorted((("  {} {}".format(*key), values)
+                        for key, values in stats.variables.items()), key=lambda item: -item[1][1])
+        for name, (calls, seconds, nbytes) in rows:
+            lines.append("{:<40} {:>10} {:>12.6f} {:>14}".format(name, calls, seconds, nbytes))
+        return "\n".join(lines)
+
+
+def _profiled(name, function, stats):
+    """`function`, recording each call in `stats` under `name`"""
+    variable_arg = _VARIABLE_CALLS.get(name)
+    perf_counter = time.perf_counter
+
+    def call(*args):
+        start = perf_counter()
+        result = function(*args)
+        seconds = perf_counter() - start
+        nbytes = sum(ctypes.sizeof(arg) for arg in args if isinstance(arg, ctypes.Array))
+        stats.record(stats.functions, name, seconds, nbytes)
+        if variable_arg is not None:
+            var_type, var_index = args[variable_arg:variable_arg + 2]
+            stats.record(stats.variables, (getattr(var_type, 'value', var_type),
+                                           getattr(var_index, 'value', var_index)),
+                         seconds, nbytes)
+        return result
+    return call
+
+
+class ProfiledPrototypes:
+    """
+    Stands in for an `ExodusPrototypes`, forwarding every libexodus call
+    to it and recording the call in an `IOStats`.  Only handles opened
+    with profiling enabled use one, so the others pay nothing.
+    """
+
+    def __init__(self, prototypes, stats):
+        self.prototypes = prototypes
+        self.stats = stats
+        self.int64_status = prototypes.int64_status
+
+    def __getattr__(self, name):
+        prototypes = self.prototypes
+        attribute = getattr(prototypes, name)
+        if not name.startswith('ex_'):
+            return attribute
+        # look the entry point up on each call: it is rebound while calls
+        # are serialized (see `ExodusPrototypes.serialize`)
+        attribute = _profiled(name, lambda *args: getattr(prototypes, name)(*args), self.stats)
+        setattr(self, name, attribute)
+        return attribute
+
+
+# totals of all profiled handles closed so far, and whether new handles are
+# profiled by default; see enable_io_stats
+_IO_STATS = IOStats()
+_IO_STATS_DEFAULT = [False]
+
+
+def io_stats():
+    """
+    the libexodus call counts, wall time and bytes of all handles opened
+    with profiling that have been closed so far, in the form returned by
+    `IOStats.as_dict`
+
+    >>> totals = exodus.io_stats()['total']
+    """
+    return _IO_STATS.as_dict()
+
+
+def enable_io_stats(output=None):
+    """
+    profile the libexodus calls of every handle opened from now on, as if
+    opened with `profile_io=True`, and report the totals at exit: as a
+    table on stderr if `output` is None, else as JSON written to the file
+    `output`.  Setting the environment variable EXODUS_PY_IO_STATS to 1
+    (stderr) or to a file name does the same when exodus is imported.
+
+    >>> exodus.enable_io_stats("io_stats.json")
+    """
+    if not _IO_STATS_DEFAULT[0]:
+        atexit.register(_report_io_stats, output)
+    _IO_STATS_DEFAULT[0] = True
+
+
+def _report_io_stats(output):
+    if output is None:
+        print(_IO_STATS.summary(), file=sys.stderr)
+    else:
+        with open(output, 'w') as stream:
+            json.dump(_IO_STATS.as_dict(), stream, indent=1)
+
+
+if os.getenv('EXODUS_PY_IO_STATS', '0') not in ('', '0'):
+    enable_io_stats(None if os.getenv('EXODUS_PY_IO_STATS') in ('1', 'stderr')
+                    else os.getenv('EXODUS_PY_IO_STATS'))
+
+
+def parallel_available():
+    """
+    True if the exodus library was built with MPI support, so files can
+    be opened with `exodus(..., comm=...)`.
+    """
+    lib = exodus_lib()
+    return all(hasattr(lib, name) for name in EXODUS_PARALLEL_PROTOTYPES)
+
+
+def mpi_handles(comm, info=None):
+    """
+    Return the MPI_Comm of an mpi4py communicator and the MPI_Info of an
+    mpi4py info object (MPI.INFO_NULL if None) as ctypes values of the
+    handle types of the MPI implementation mpi4py was built against.
+
+    >>> comm_handle, info_handle = mpi_handles(MPI.COMM_WORLD)
+    """
+    from mpi4py import MPI
+    if info is None:
+        info = MPI.INFO_NULL
+    handles = []
+    for handle in (comm, info):
+        if MPI._sizeof(handle) == ctypes.sizeof(ctypes.c_int):
+            c_type = ctypes.c_int
+        else:
+            c_type = ctypes.c_void_p
+        handles.append(c_type.from_address(MPI._addressof(handle)))
+    return tuple(handles)
+
+
+def exodus_parallel_prototypes(comm_handle, info_handle):
+    """
+    Return the `EXODUS_PARALLEL_PROTOTYPES` entry points, keyed by name,
+    bound for the handle types returned by `mpi_handles`.
+    """
+    handle_types = {'comm': type(comm_handle), 'info': type(info_handle)}
+    key = ('parallel', handle_types['comm'], handle_types['info'])
+    if key not in _PROTOTYPE_CACHE:
+        if not parallel_available():
+            raise Exception("ERROR: the exodus library was built without MPI support;"
+                            " a parallel open is not possible")
+        functions = {}
+        for name, (restype, argtypes) in EXODUS_PARALLEL_PROTOTYPES.items():
+            argtypes = [handle_types[arg] if isinstance(arg, str) else arg for arg in argtypes]
+            functions[name] = ctypes.CFUNCTYPE(restype, *argtypes)((name, exodus_lib()))
+        _PROTOTYPE_CACHE[key] = functions
+    return _PROTOTYPE_CACHE[key]
+
+
+def partition_range(num_entries, rank, num_ranks):
+    """
+    Return the 1-based start index and the count of the contiguous share
+    of `num_entries` owned by `rank` out of `num_ranks`; the first
+    `num_entries % num_ranks` ranks own one entry more than the others.
+    Suitable as the hyperslab of the partial variable APIs.
+
+    >>> start, count = partition_range(exo.num_nodes(), comm.rank, comm.size)
+    >>> exo.put_partial_node_variable_values(name, step, start, values[start - 1:start - 1 + count])
+    """
+    if num_ranks < 1 or not 0 <= rank < num_ranks:
+        raise Exception("ERROR: rank {} is not in a group of {} ranks".format(rank, num_ranks))
+    share, extra = divmod(num_entries, num_ranks)
+    start = rank * share + min(rank, extra)
+    return start + 1, share + (1 if rank < extra else 0)
+
+
+def write_profile_settings(profile):
+    """
+    Return the complete settings of a write profile: a name in
+    `WRITE_PROFILES`, or a dict overriding some of the settings of the
+    'fast' profile; None is returned unchanged.
+
+    >>> write_profile_settings({'format': EX_NETCDF4, 'compression': 2})
+    """
+    if profile is None:
+        return None
+    if isinstance(profile, str):
+        if profile not in WRITE_PROFILES:
+            raise Exception("ERROR: unknown write profile " + profile + "; expected one of " +
+                            ", ".join(sorted(WRITE_PROFILES)))
+        profile = WRITE_PROFILES[profile]
+    unknown = set(profile) - set(WRITE_PROFILES['fast'])
+    if unknown:
+        raise Exception("ERROR: unknown write profile settings " + ", ".join(sorted(unknown)))
+    settings = dict(WRITE_PROFILES['fast'], **profile)
+    if settings['compression'] and not settings['format'] & EX_NETCDF4:
+        raise Exception("ERROR: compression requires the netCDF-4 format (EX_NETCDF4)")
+    if not 0 <= settings['compression'] <= 9:
+        raise Exception("ERROR: compression level must be between 0 and 9")
+    return settings
+
+
+class SidecarCache:
+    """
+    A directory of `.npy` files holding arrays decoded from exodus files,
+    so that later opens of an unchanged file memory-map them with
+    `numpy.load(mmap_mode='r')` instead of reading them through the exodus
+    library again.
+
+    >>> cache = SidecarCache('/scratch/exodus-cache', budget_bytes=20 * 2**30)
+    >>> with exodus('results.e', array_type='numpy', sidecar=cache) as exo:
+    ...     x, y, z = exo.get_coords()
+
+    A `manifest.json` in the directory records, for each source file, its
+    path, size and modification time and the size and last use of each
+    cached array.  The arrays of a source are discarded when it is opened
+    again after its size or modification time changed.  After each store,
+    the least recently used arrays of all sources are removed until the
+    directory holds at most `budget_bytes`.  Changes are kept in memory
+    and merged into the manifest by `flush` (called when an exodus object
+    using the cache is closed) under an exclusive `fcntl.flock`, so
+    several processes may share one directory and its budget.
+
+    Parameters
+    ----------
+    directory : string
+        cache directory; created if it does not exist
+    budget_bytes : int, optional
+        disk budget of the cached arrays; unlimited if None
+    variables : list<string>, optional
+        names of the variables whose values are cached; all variables if
+        None.  Coordinates, connectivity and id maps are always cached.
+    """
+
+    MANIFEST = 'manifest.json'
+    LOCK = 'manifest.lock'
+
+    def __init__(self, directory, budget_bytes=None, variables=None):
+        import numpy as np
+        self.np = np
+        self.directory = os.path.abspath(str(directory))
+        self.budget_bytes = budget_bytes
+        self.variables = None if variables is None else set(variables)
+        self.__lock = threading.RLock()
+        # the manifest as of the last sync with the directory, with the
+        # arrays stored, evicted and used since then applied
+        self.__manifest = None
+        self.__nbytes = 0
+        self.__stored = {}
+        self.__evicted = set()
+        self.__used = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    @contextmanager
+    def __locked_manifest(self):
+        with self.__lock, open(os.path.join(self.directory, self.LOCK), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def __read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST)) as manifest:
+                return json.load(manifest)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_manifest(self):
+        path = os.path.join(self.directory, self.MANIFEST)
+        temp_path = "{}.{}.{}".format(path, os.getpid(), threading.get_ident())
+        with open(temp_path, 'w') as temp:
+            json.dump(self.__manifest, temp)
+        os.replace(temp_path, path)
+
+    def __set_manifest(self, manifest):
+        self.__manifest = manifest
+        self.__nbytes = sum(array['bytes'] for entry in manifest.values()
+                            for array in entry['arrays'].values())
+
+    def __loaded_manifest(self):
+        if self.__manifest is None:
+            with self.__locked_manifest():
+                self.__set_manifest(self.__read_manifest())
+        return self.__manifest
+
+    def __sync(self):
+        # merge the local changes into the manifest on disk, which other
+        # processes may have changed; the caller holds the manifest lock
+        # and writes the result
+        manifest = self.__read_manifest()
+        for source, key in self.__evicted:
+            manifest.get(source, {'arrays': {}})['arrays'].pop(key, None)
+        for (source, key), (stat, array) in self.__stored.items():
+            entry = manifest.setdefault(source, dict(stat, arrays={}))
+            if (entry['size'], entry['mtime_ns']) == (stat['size'], stat['mtime_ns']):
+                entry['arrays'][key] = array
+        self.__apply_used(manifest)
+        self.__stored.clear()
+        self.__evicted.clear()
+        self.__used.clear()
+        self.__set_manifest(manifest)
+        self.__evict()
+        self.__evicted.clear()
+
+    def __source_dir(self, source):
+        return os.path.join(self.directory, hashlib.sha1(source.encode()).hexdigest())
+
+    def __array_path(self, source, key):
+        return os.path.join(self.__source_dir(source),
+                            hashlib.sha1(key.encode()).hexdigest() + '.npy')
+
+    def __remove(self, source, keys=None):
+        entry = self.__manifest.get(source, {'arrays': {}})
+        for key in list(entry['arrays'] if keys is None else keys):
+            array = entry['arrays'].pop(key, None)
+            if array is not None:
+                self.__nbytes -= array['bytes']
+            self.__stored.pop((source, key), None)
+            self.__evicted.add((source, key))
+            try:
+                os.remove(self.__array_path(source, key))
+            except OSError:
+                pass
+
+    def attach(self, source):
+        """
+        register the file `source`, discarding its cached arrays if it
+        changed since they were stored
+
+        >>> cache.attach('results.e')
+        """
+        source = os.path.abspath(source)
+        stat = os.stat(source)
+        with self.__locked_manifest():
+            self.__sync()
+            entry = self.__manifest.get(source)
+            if entry is None or (entry['size'], entry['mtime_ns']) != \
+                    (stat.st_size, stat.st_mtime_ns):
+                if entry is not None:
+                    self.__remove(source)
+                    self.__evicted.clear()
+                self.__manifest[source] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                           'arrays': {}}
+            self.__write_manifest()
+
+    def caches_variable(self, name):
+        """True if the values of variable `name` are cached"""
+        return self.variables is None or name in self.variables
+
+    def lookup(self, source, key):
+        """
+        the cached array `key` of `source`, memory-mapped read-only, or
+        None if it is not cached
+
+        >>> coords = cache.lookup('results.e', 'coords')
+        """
+        source = os.path.abspath(source)
+        try:
+            values = self.np.load(self.__array_path(source, key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        with self.__lock:
+            self.__used[(source, key)] = time.time()
+        return values
+
+    def store(self, source, key, values):
+        """
+        cache the array `values` as `key` of `source`, then evict the
+        least recently used arrays over the budget; the manifest is
+        updated on the next `flush`
+
+        >>> cache.store('results.e', 'coords', coords)
+        """
+        source = os.path.abspath(source)
+        values = self.np.asarray(values)
+        if self.budget_bytes is not None and values.nbytes > self.budget_bytes:
+            return
+        path = self.__array_path(source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = "{}.{}.{}".format(path, os.getpid(), threading.get_ident())
+        with open(temp_path, 'wb') as temp:
+            self.np.save(temp, values)
+        os.replace(temp_path, path)
+        array = {'bytes': os.path.getsize(path), 'used': time.time()}
+        with self.__lock:
+            manifest = self.__loaded_manifest()
+            if source not in manifest:
+                stat = os.stat(source)
+                manifest[source] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                    'arrays': {}}
+            entry = manifest[source]
+            previous = entry['arrays'].get(key)
+            if previous is not None:
+                self.__nbytes -= previous['bytes']
+            entry['arrays'][key] = array
+            self.__nbytes += array['bytes']
+            self.__stored[(source, key)] = ({'size': entry['size'],
+                                             'mtime_ns': entry['mtime_ns']}, array)
+            self.__evicted.discard((source, key))
+            self.__evict()
+
+    def __apply_used(self, manifest):
+        for (source, key), used in self.__used.items():
+            array = manifest.get(source, {'arrays': {}})['arrays'].get(key)
+            if array is not None:
+                array['used'] = max(array['used'], used)
+
+    def __evict(self):
+        if self.budget_bytes is None or self.__nbytes <= self.budget_bytes:
+            return
+        self.__apply_used(self.__manifest)
+        arrays = sorted((array['used'], source, key)
+                        for source, entry in self.__manifest.items()
+                        for key, array in entry['arrays'].items())
+        for _, source, key in arrays:
+            if self.__nbytes <= self.budget_bytes:
+                break
+            self.__remove(source, [key])
+
+    def flush(self):
+        """
+        write the arrays stored and evicted since the previous flush, and
+        the last use of the arrays looked up, to the manifest, evicting
+        the least recently used arrays of all processes sharing the
+        directory that are over the budget
+
+        >>> cache.flush()
+        """
+        with self.__lock:
+            if not (self.__stored or self.__evicted or self.__used):
+                return
+            with self.__locked_manifest():
+                self.__sync()
+                self.__write_manifest()
+
+    def invalidate(self, source=None):
+        """
+        discard the cached arrays of `source`, or of every source if None
+
+        >>> cache.invalidate('results.e')
+        """
+        with self.__locked_manifest():
+            self.__sync()
+            sources = list(self.__manifest) if source is None else [os.path.abspath(source)]
+            for path in sources:
+                self.__remove(path)
+                self.__manifest.pop(path, None)
+            self.__evicted.clear()
+            self.__write_manifest()
+
+    def size(self):
+        """
+        the number of bytes of cached arrays recorded in the manifest,
+        after merging the local changes into it
+
+        >>> nbytes = cache.size()
+        """
+        with self.__locked_manifest():
+            self.__sync()
+            self.__write_manifest()
+            return self.__nbytes
+
+
+class ArrayCache:
+    """
+    Bounded cache of the arrays read by one exodus object, evicting the
+    least recently used arrays once they hold more than `budget_bytes`,
+    with counts of hits, misses and evictions.  Cached numpy arrays are
+    made read-only, since every later read returns the same array; ctypes
+    arrays cannot be, so a private copy is cached and every read returns
+    a fresh copy of it.
+
+    >>> exo = exodus('results.e', array_type='numpy', cache_bytes=2**30)
+    >>> exo.get_variable_values('EX_ELEM_BLOCK', 1, 'stress', 10)
+    >>> exo.cache_stats()
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def array_nbytes(value):
+        """bytes held by an array, or by the arrays in a tuple"""
+        if isinstance(value, tuple):
+            return sum(ArrayCache.array_nbytes(item) for item in value)
+        if isinstance(value, ctypes.Array):
+            return ctypes.sizeof(value)
+        return getattr(value, 'nbytes', 0)
+
+    @staticmethod
+    def copy_ctypes(value):
+        """`value` with its ctypes arrays copied; other items are shared"""
+        if isinstance(value, tuple):
+            return tuple(ArrayCache.copy_ctypes(item) for item in value)
+        if isinstance(value, ctypes.Array):
+            copy = type(value)()
+            ctypes.memmove(copy, value, ctypes.sizeof(value))
+            return copy
+        return value
+
+    def get(self, key):
+        """the array cached as `key`, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+        return self.copy_ctypes(entry[0])
+
+    def put(self, key, value):
+        """cache `value` as `key`, evicting the least recently used arrays over budget"""
+        nbytes = self.array_nbytes(value)
+        if nbytes > self.budget_bytes:
+            return
+        value = self.copy_ctypes(value)
+        for item in value if isinstance(value, tuple) else (value,):
+            if hasattr(item, 'flags'):
+                item.flags.writeable = False
+        with self.__lock:
+            self.__discard(key)
+            self.__entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes:
+                _key, (_value, size) = self.__entries.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+
+    def __discard(self, key):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def invalidate(self, *kinds, key=None):
+        """drop the array cached as `key` and all arrays whose key starts with one of `kinds`"""
+        with self.__lock:
+            if key is not None:
+                self.__discard(key)
+            for stale in [stale for stale in self.__entries if stale[0] in kinds]:
+                self.__discard(stale)
+
+    def clear(self):
+        """drop all cached arrays, keeping the statistics"""
+        with self.__lock:
+            self.__entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """hits, misses, evictions, number of entries, bytes held and the budget"""
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.__entries), 'bytes': self.nbytes,
+                    'budget_bytes': self.budget_bytes}
+
+
+class IdIndex:
+    """
+    Vectorized lookup between the *IDs* of a map and their 1-based
+    *INDICES*.  A map that is just 1..N is detected and needs no lookup
+    table; otherwise the IDs are sorted once and looked up with
+    `searchsorted`.  If an ID appears more than once, its first *INDEX*
+    is returned.  Lookups accept a single value or any sequence of
+    values and return an int or a numpy array accordingly.
+
+    >>> node_index = exo.id_index('EX_NODE_MAP')
+    >>> indices = node_index.indices(node_ids)
+    >>> node_ids = node_index.ids(indices)
+    """
+
+    def __init__(self, id_map, name='id map'):
+        import numpy as np
+        self.np = np
+        self.name = name
+        self.id_map = np.array(id_map, dtype=np.int64).reshape(-1)
+        self.id_map.flags.writeable = False
+        self.identity = bool(np.array_equal(self.id_map, np.arange(1, len(self.id_map) + 1)))
+        if not self.identity:
+            self.__order = np.argsort(self.id_map, kind='stable')
+            self.__sorted = self.id_map[self.__order]
+
+    def __len__(self):
+        return len(self.id_map)
+
+    def __contains__(self, object_id):
+        return bool(self.contains(object_id))
+
+    def __locate(self, ids):
+        np = self.np
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.identity:
+            found = (ids >= 1) & (ids <= len(self.id_map))
+            return ids, found
+        if len(self.__sorted) == 0:
+            return np.zeros(ids.shape, np.int64), np.zeros(ids.shape, bool)
+        positions = np.minimum(np.searchsorted(self.__sorted, ids), len(self.__sorted) - 1)
+        found = self.__sorted[positions] == ids
+        return np.where(found, self.__order[positions] + 1, 0), found
+
+    def contains(self, ids):
+        """True for each of `ids` that is in the map"""
+        found = self.__locate(ids)[1]
+        return bool(found) if found.ndim == 0 else found
+
+    def indices(self, ids):
+        """the 1-based *INDICES* of `ids`; raises if any of them is not in the map"""
+        indices, found = self.__locate(ids)
+        if not found.all():
+            missing = self.np.asarray(ids).reshape(-1)[~found.reshape(-1)][0]
+            raise Exception("ERROR: no entry with id {} in {}.".format(missing, self.name))
+        return int(indices) if indices.ndim == 0 else indices
+
+    def ids(self, indices):
+        """the *IDs* at the 1-based `indices`; raises if any of them is out of range"""
+        indices = self.np.asarray(indices, dtype=self.np.int64)
+        if indices.size and (indices.min() < 1 or indices.max() > len(self.id_map)):
+            raise Exception("ERROR: index out of range 1..{} of {}.".format(
+                len(self.id_map), self.name))
+        ids = self.id_map[indices - 1]
+        return int(ids) if ids.ndim == 0 else ids
+
 #
 # ----------------------------------------------------------------------
 #
@@ -598,7 +1635,9 @@ class exodus:
     def __init__(self, file, mode=None, array_type='ctype', title=None,
                  numDims=None, numNodes=None, numElems=None, numBlocks=None,
                  numNodeSets=None, numSideSets=None, numAssembly=None,
-                 numBlob=None, init_params=None, io_size=0):
+                 numBlob=None, init_params=None, io_size=0, sidecar=None,
+                 cache_bytes=0, write_profile=None, comm=None, info=None,
+                 profile_io=None):
         """
         Open exodus database for data insertion/extraction.
 
@@ -627,6 +1666,36 @@ class exodus:
 
         init_params : ex_init_params
            see `exodus.ex_init_params` for more info.
+        sidecar : SidecarCache or string, optional
+           cache of decoded arrays, or the directory of one, from which
+           coordinates, connectivity, id maps and variable values are
+           memory-mapped once they have been read ('r' mode and
+           array_type 'numpy' only; see `exodus.SidecarCache`)
+        cache_bytes : int
+           if non-zero, coordinates, connectivity and variable values are
+           kept in memory after they are read, up to this many bytes, and
+           later reads of the same array return it without calling the
+           library; see `exodus.cache_stats` and `exodus.ArrayCache`
+        write_profile : string or dict, optional
+           file format, compression and integer width of a new file
+           ('w'/'w+' mode only): 'fast', 'balanced' or 'small' (see
+           `exodus.WRITE_PROFILES`), or a dict with any of the keys
+           'format', 'compression', 'shuffle' and 'int64'
+        comm : mpi4py.MPI.Comm, optional
+           open or create the file collectively on all ranks of this
+           communicator through the parallel (MPI-IO) entry points of an
+           exodus library built with MPI support.  Every rank must make
+           the same calls that define or change the model; each rank may
+           then read and write its own part of the nodal and element
+           variables with the partial APIs (see `exodus.partition_range`).
+           New files are netCDF-4 unless the write profile asks for
+           EX_PNETCDF.
+        info : mpi4py.MPI.Info, optional
+           MPI-IO hints for a parallel open (default MPI.INFO_NULL)
+        profile_io : bool, optional
+           record the count, wall time and bytes moved of every libexodus
+           call of this handle (see `exodus.io_stats`); defaults to
+           whether `exodus.enable_io_stats` has been called
 
         Returns
         -------
@@ -644,9 +1713,15 @@ class exodus:
         >>> with exodus(file_name, mode=mode, title=title,\
         ...             array_type=array_type, init_params=ex_pars) as exo:
         ...     pass
+
+        >>> from mpi4py import MPI
+        >>> with exodus(file_name, mode='a', comm=MPI.COMM_WORLD) as exo:
+        ...     start, count = partition_range(exo.num_nodes(), MPI.COMM_WORLD.rank,
+        ...                                    MPI.COMM_WORLD.size)
+        ...     vals = exo.get_partial_node_variable_values(nvar_name, time_step, start, count)
         """
         global SHOW_BANNER
-        if SHOW_BANNER:
+        if VERBOSE and SHOW_BANNER:
             print(EXODUS_PY_COPYRIGHT)
             SHOW_BANNER = False
 
@@ -670,13 +1745,38 @@ class exodus:
         else:
             self.use_numpy = False
 
-        self.EXODUS_LIB = EXODUS_LIB
+        self.EXODUS_LIB = exodus_lib()
         self.fileName = str(file)
         self.basename = basename(file)
         self.modeChar = mode
         self.fileId = None
+        self.comm = comm
+        self.__mpi = None
+        if comm is not None:
+            if not parallel_available():
+                raise Exception("ERROR: opening " + self.fileName + " on a communicator requires"
+                                " an exodus library built with MPI support")
+            self.__mpi = mpi_handles(comm, info)
+        self.__metadata = {}
+        self.__write_profile = write_profile_settings(write_profile)
+        if write_profile is not None and mode.lower() not in ('w', 'w+'):
+            raise Exception("ERROR: a write profile requires mode 'w' or 'w+'")
+        self.__arrays = ArrayCache(cache_bytes) if cache_bytes else None
+        self.__time_window = None
+        if profile_io is None:
+            profile_io = _IO_STATS_DEFAULT[0]
+        self.__io_stats = IOStats() if profile_io else None
+        self.__io_names = {}
+        self.__sidecar = None
+        if sidecar is not None:
+            if mode != 'r' or not self.use_numpy:
+                raise Exception("ERROR: a sidecar cache requires mode 'r' and array_type 'numpy'")
+            if not isinstance(sidecar, SidecarCache):
+                sidecar = SidecarCache(sidecar)
+            sidecar.attach(self.fileName)
+            self.__sidecar = sidecar
         self.__open(io_size=io_size)
-        EXODUS_LIB.ex_set_max_name_length(self.fileId, MAX_NAME_LENGTH)
+        self.__lib.ex_set_max_name_length(self.fileId, MAX_NAME_LENGTH)
         if mode.lower() == 'w' or mode.lower() == 'w+':
             if init_params is not None:
                 self.init_params = init_params
@@ -819,7 +1919,8 @@ class exodus:
         self.numSideSets = ctypes.c_longlong(p.num_side_sets)
         self.numAssembly = ctypes.c_longlong(p.num_assembly)
 
-        EXODUS_LIB.ex_put_init_ext(self.fileId, ctypes.byref(p))
+        self.__lib.ex_put_init_ext(self.fileId, ctypes.byref(p))
+        self.__metadata.clear()
         return True
 
 
@@ -845,14 +1946,14 @@ class exodus:
         -------
         exo_copy : exodus object opened in append mode by default
         """
-        i64Status = EXODUS_LIB.ex_int64_status(self.fileId)
-        fileId = EXODUS_LIB.ex_create_int(fileName.encode('ascii'), EX_NOCLOBBER|i64Status,
+        i64Status = self.__int64_status()
+        fileId = self.__lib.ex_create_int(fileName.encode('ascii'), EX_NOCLOBBER|i64Status,
                                           ctypes.byref(self.comp_ws),
                                           ctypes.byref(self.io_ws),
                                           EX_API_VERSION_NODOT)
 
         self.copy_file(fileId, include_transient)
-        EXODUS_LIB.ex_close(fileId)
+        self.__lib.ex_close(fileId)
 
         return exodus(fileName, mode)
 
@@ -883,9 +1984,9 @@ class exodus:
         file_id: The file_id of the copied to file
         
         """
-        EXODUS_LIB.ex_copy(self.fileId, file_id)
+        self.__lib.ex_copy(self.fileId, file_id)
         if include_transient:
-            EXODUS_LIB.ex_copy_transient(self.fileId, file_id)
+            self.__lib.ex_copy_transient(self.fileId, file_id)
 
         return file_id;
 
@@ -1198,6 +2299,8 @@ class exodus:
         """
         self.__ex_put_time(step, value)
         self.numTimes = ctypes.c_int(self.__ex_inquire_int(ex_inquiry_map('EX_INQ_TIME')))
+        self.__invalidate('times')
+        self.__time_window = None
         return True
 
     #
@@ -1267,12 +2370,20 @@ class exodus:
 
     # --------------------------------------------------------------------
 
-    def get_coords(self):
+    def get_coords(self, out=None):
         """
         get model coordinates of all nodes; for each coordinate
         direction, a length exo.num_nodes() list is returned
 
         >>> x_coords, y_coords, z_coords = exo.get_coords()
+        >>> x_coords, y_coords, z_coords = exo.get_coords(out=(x_buf, y_buf, z_buf))
+
+        Parameters
+        ----------
+        out : tuple of three buffers, optional
+            preallocated, writable float64 buffers (e.g. numpy arrays) of
+            at least exo.num_nodes() values each; the coordinates are read
+            directly into them and the buffers themselves are returned
 
         Returns
         -------
@@ -1287,6 +2398,16 @@ class exodus:
               <np_array<double>>  y_coords  global y-direction coordinates
               <np_array<double>>  z_coords  global z-direction coordinates
         """
+        if out is not None:
+            self.__ex_get_coord(out)
+            return tuple(out)
+        self.coordsX, self.coordsY, self.coordsZ = self.__array_cached(('coords',),
+                                                                       self.__read_coords)
+        return self.coordsX, self.coordsY, self.coordsZ
+
+    def __read_coords(self):
+        if self.__sidecar is not None:
+            return tuple(self.__sidecar_read('coords', self.__read_coord_array))
         self.__ex_get_coord()
         if self.use_numpy:
             self.coordsX = ctype_to_numpy(self, self.coordsX)
@@ -1334,17 +2455,20 @@ class exodus:
     def put_coords(self, xCoords, yCoords, zCoords):
         """
         store model coordinates of all nodes; for each coordinate
-        direction, a length exo.num_nodes() list is input
+        direction, a length exo.num_nodes() list is input.  Any object
+        supporting the buffer protocol (numpy array, array.array, c-type
+        array) may be passed instead of a list; contiguous float64 buffers
+        are handed to the library without copying
 
         >>> status = exo.put_coords(x_coords, y_coords, z_coords)
 
         Parameters
         ----------
-        x_coord : <list<float>>
+        x_coord : <list<float>> or buffer
             global x-direction coordinates
-        y_coord : <list<float>>
+        y_coord : <list<float>> or buffer
             global y-direction coordinates
-        z_coord : <list<float>>
+        z_coord : <list<float>> or buffer
             global z-direction coordinates
 
         Returns
@@ -1492,7 +2616,7 @@ class exodus:
 
     # --------------------------------------------------------------------
 
-    def get_node_variable_values(self, name, step):
+    def get_node_variable_values(self, name, step, out=None):
         """
         get list of nodal variable values for a nodal variable name
         and time step
@@ -1503,6 +2627,10 @@ class exodus:
         ----------
             <string>  nvar_name  name of nodal variable
             <int>     time_step  1-based index of time step
+            <buffer>  out        (optional) preallocated, writable float64
+                                 buffer of at least exo.num_nodes() values;
+                                 the values are read directly into it and
+                                 `out` itself is returned
 
         Returns
         -------
@@ -1513,17 +2641,20 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  nvar_vals
         """
-        names = self.get_variable_names('EX_NODAL')
-        var_id = names.index(name) + 1
+        if out is None and (self.__arrays is not None or self.__sidecar is not None):
+            return self.get_variable_values('EX_NODAL', 0, name, step)
+        var_id = self.__variable_id('EX_NODAL', name)
         numVals = self.num_nodes()
-        values = self.__ex_get_var(step, 'EX_NODAL', var_id, 0, numVals)
+        values = self.__ex_get_var(step, 'EX_NODAL', var_id, 0, numVals, out)
+        if out is not None:
+            return out
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
         return values
 
     # --------------------------------------------------------------------
 
-    def get_partial_node_variable_values(self, name, step, start_index, num_nodes):
+    def get_partial_node_variable_values(self, name, step, start_index, num_nodes, out=None):
         """
         get partial list of nodal variable values for a nodal variable name
         and time step.  Start at node `node_index` (1-based) and return `num_nodes`
@@ -1537,6 +2668,10 @@ class exodus:
             <int>     time_step   1-based index of time step
             <int>     start_index 1-based index of node to start returning data
             <int>     num_nodes   number of nodes to return data for.
+            <buffer>  out         (optional) preallocated, writable float64
+                                  buffer of at least num_nodes values; the
+                                  values are read directly into it and `out`
+                                  itself is returned
 
         Returns
         -------
@@ -1547,9 +2682,11 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  nvar_vals
         """
-        names = self.get_variable_names('EX_NODAL')
-        var_id = names.index(name) + 1
-        values = self.__ex_get_partial_var(step, 'EX_NODAL', var_id, 0, start_index, num_nodes)
+        var_id = self.__variable_id('EX_NODAL', name)
+        values = self.__ex_get_partial_var(step, 'EX_NODAL', var_id, 0, start_index, num_nodes,
+                                           out)
+        if out is not None:
+            return out
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
         return values
@@ -1567,19 +2704,44 @@ class exodus:
         ----------
             <string>       nvar_name  name of nodal variable
             <int>          time_step  1-based index of time step
-            <list<float>>  nvar_vals
+            <list<float>>  nvar_vals  (or any buffer-protocol object)
 
         Returns
         -------
         status : bool
             True = successful execution
         """
-        names = self.get_variable_names('EX_NODAL')
-        var_id = names.index(name) + 1
+        var_id = self.__variable_id('EX_NODAL', name)
         numVals = self.num_nodes()
         self.__ex_put_var(step, 'EX_NODAL', var_id, 0, numVals, values)
         return True
 
+    # --------------------------------------------------------------------
+
+    def put_partial_node_variable_values(self, name, step, start_index, values):
+        """
+        store nodal variable values for a nodal variable name and time
+        step for `len(values)` consecutive nodes, starting at node
+        `start_index` (1-based)
+
+        >>> status = exo.put_partial_node_variable_values(nvar_name, time_step, 10, nvar_vals)
+
+        Parameters
+        ----------
+            <string>       nvar_name   name of nodal variable
+            <int>          time_step   1-based index of time step
+            <int>          start_index 1-based index of first node to store data for
+            <list<float>>  nvar_vals   (or any buffer-protocol object)
+
+        Returns
+        -------
+        status : bool
+            True = successful execution
+        """
+        var_id = self.__variable_id('EX_NODAL', name)
+        self.__ex_put_partial_var(step, 'EX_NODAL', var_id, 0, start_index, len(values), values)
+        return True
+
     #
     # elements
     #
@@ -1621,7 +2783,7 @@ class exodus:
             if array_type == 'numpy':
               <np_array<int>>  elem_id_map
         """
-        return self.__ex_get_id_map('EX_ELEM_MAP')
+        return self.__sidecar_read('elem_id_map', lambda: self.__ex_get_id_map('EX_ELEM_MAP'))
 
     # --------------------------------------------------------------------
 
@@ -1804,7 +2966,76 @@ class exodus:
             if array_type == 'numpy':
               <np_array<int>>  node_id_map
         """
-        return self.__ex_get_id_map('EX_NODE_MAP')
+        return self.__sidecar_read('node_id_map', lambda: self.__ex_get_id_map('EX_NODE_MAP'))
+
+    # --------------------------------------------------------------------
+
+    def id_index(self, objType):
+        """
+        get the `exodus.IdIndex` of an id map ('EX_NODE_MAP',
+        'EX_ELEM_MAP', 'EX_EDGE_MAP' or 'EX_FACE_MAP'), or of the
+        block/set *IDs* of a block or set type (e.g. 'EX_ELEM_BLOCK',
+        'EX_NODE_SET'), for vectorized *ID* <-> *INDEX* lookups; it is
+        built on first use and cached on this object
+
+        >>> elem_indices = exo.id_index('EX_ELEM_MAP').indices(elem_ids)
+        >>> set_index = exo.id_index('EX_SIDE_SET').indices(side_set_id)
+
+        Returns
+        -------
+        index : `exodus.IdIndex`
+        """
+        return self.__cached(('id_index', objType), self.__build_id_index, objType)
+
+    # --------------------------------------------------------------------
+
+    def block_id_index(self, obj_type, entity_id):
+        """
+        get the `exodus.IdIndex` of the *IDs* of the entries of one block
+        (see `exodus.get_block_id_map`), mapping them to 1-based *INDICES*
+        local to the block
+
+        >>> local = exo.block_id_index('EX_ELEM_BLOCK', 100).indices(elem_ids)
+
+        Returns
+        -------
+        index : `exodus.IdIndex`
+        """
+        return self.__cached(('id_index', obj_type, entity_id), self.__build_block_id_index,
+                             obj_type, entity_id)
+
+    # --------------------------------------------------------------------
+
+    def elem_ids_to_block_local(self, elem_ids):
+        """
+        get the element block and the 1-based *INDEX* within that block
+        of each of the element *IDs*
+
+        >>> blk_ids, local_indices = exo.elem_ids_to_block_local(elem_ids)
+
+        Parameters
+        ----------
+        elem_ids : int or <list<int>>
+            element *IDs* (not *INDICES*)
+
+        Returns
+        -------
+            <np_array<int>>  blk_ids        element block *ID* of each element
+            <np_array<int>>  local_indices  1-based *INDEX* within the block
+
+        for a single element *ID*, a pair of ints is returned instead
+        """
+        np = self.np if self.use_numpy else \
+            _import_numpy(required_by='exodus.elem_ids_to_block_local')
+        indices = np.asarray(self.id_index('EX_ELEM_MAP').indices(elem_ids))
+        block_ids = np.asarray(self.get_ids('EX_ELEM_BLOCK'), dtype=np.int64)
+        starts = np.zeros(len(block_ids) + 1, np.int64)
+        np.cumsum([self.num_elems_in_blk(block_id) for block_id in block_ids], out=starts[1:])
+        blocks = np.searchsorted(starts, indices - 1, side='right') - 1
+        local = indices - starts[blocks]
+        if indices.ndim == 0:
+            return int(block_ids[blocks]), int(local)
+        return block_ids[blocks], local
 
     # --------------------------------------------------------------------
 
@@ -2190,6 +3421,111 @@ class exodus:
 
     # --------------------------------------------------------------------
 
+    def put_variable_names(self, objType, names):
+        """
+        store the names of all variables of an object type with a single
+        library call; the number of variables must already be set
+
+        >>> exo.set_variable_number('EX_NODAL', len(nvar_names))
+        >>> status = exo.put_variable_names('EX_NODAL', nvar_names)
+
+        Parameters
+        ----------
+        objType : string
+            object type
+        names : <list<string>>
+            names of all variables, in index order
+
+        Returns
+        -------
+        status : bool
+            True = successful execution
+        """
+        if len(names) != self.get_variable_number(objType):
+            raise Exception("ERROR: number of variable names does not match the "
+                            "number of variables.")
+        self.__ex_put_variable_names(objType, names)
+        return True
+
+    # --------------------------------------------------------------------
+
+    def define_results(self, schema):
+        """
+        declare the result variables of the model -- their numbers, names
+        and truth tables -- in one pass; the variables and truth tables of
+        all object types are defined in a single define-mode transition
+        and the names of each object type are stored with one library call
+
+        >>> status = exo.define_results({
+        ...     'EX_GLOBAL': ['energy'],
+        ...     'EX_NODAL': ['temp', 'disp'],
+        ...     'EX_ELEM_BLOCK': (['stress', 'strain'], {10: ['stress', 'strain'],
+        ...                                              20: ['stress']}),
+        ...     'EX_SIDE_SET': ['pressure'],
+        ...     'reduction': {'EX_ASSEMBLY': ['mass']}})
+
+        Parameters
+        ----------
+        schema : dict
+            maps an object type ('EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK',
+            'EX_EDGE_BLOCK', 'EX_FACE_BLOCK', 'EX_NODE_SET', 'EX_EDGE_SET',
+            'EX_FACE_SET', 'EX_SIDE_SET' or 'EX_ELEM_SET') to the list of
+            its variable names, defined on every block or set, or to a
+            tuple (names, truth); truth is either a truth table as passed
+            to `exo.set_variable_truth_table` or a dict mapping block or
+            set *ID*s to the names defined on them.  The optional key
+            'reduction' maps object types to lists of reduction variable
+            names.
+
+        Returns
+        -------
+        status : bool
+            True = successful execution
+
+        Note:
+        -----
+        The blocks and sets must be defined first, and the variables of
+        an object type can only be declared once.
+        """
+        params = ex_var_params()
+        truth_tabs = []
+        names_by_type = []
+        for objType, spec in schema.items():
+            if objType == 'reduction':
+                continue
+            if objType not in EX_VAR_PARAMS_FIELDS:
+                raise Exception("ERROR: cannot define result variables of " + str(objType))
+            names, truth = spec if isinstance(spec, tuple) else (spec, None)
+            num_field, tab_field = EX_VAR_PARAMS_FIELDS[objType]
+            setattr(params, num_field, len(names))
+            names_by_type.append((objType, names))
+            if tab_field is None or not names:
+                continue
+            ids = list(self.get_ids(objType))
+            if truth is None:
+                table = [True] * (len(ids) * len(names))
+            elif isinstance(truth, dict):
+                table = [name in truth.get(entityId, ()) for entityId in ids for name in names]
+            else:
+                table = list(truth)
+            if len(table) != len(ids) * len(names):
+                raise Exception("ERROR: truth table for " + objType + " has " + str(len(table)) +
+                                " entries, expected " + str(len(ids) * len(names)))
+            truth_tab = (ctypes.c_int * len(table))(*[1 if val else 0 for val in table])
+            truth_tabs.append(truth_tab)
+            setattr(params, tab_field, ctypes.cast(truth_tab, ctypes.POINTER(ctypes.c_int)))
+        self.__ex_put_all_var_param_ext(params)
+        for objType, names in names_by_type:
+            if names:
+                self.__ex_put_variable_names(objType, names)
+        for objType, names in schema.get('reduction', {}).items():
+            self.__ex_put_reduction_variable_param(objType, len(names))
+            if names:
+                self.__ex_put_reduction_variable_names(objType, names)
+        return True
+
+    # --------------------------------------------------------------------
+
     def put_reduction_variable_name(self, objType, name, index):
         """
         add the name and index of a new reduction variable to the model;
@@ -2230,7 +3566,7 @@ class exodus:
         return True
 
     # --------------------------------------------------------------------
-    def get_variable_values(self, objType, entityId, name, step):
+    def get_variable_values(self, objType, entityId, name, step, out=None):
         """
         get list of `objType` variable values for a specified object id
         block, variable name, and time step
@@ -2248,6 +3584,10 @@ class exodus:
             name of variable
         time_step : int
             1-based index of time step
+        out : buffer, optional
+            preallocated, writable float64 buffer (e.g. a numpy array) large
+            enough for all values of the entity; the values are read
+            directly into it and `out` itself is returned
 
         Returns
         -------
@@ -2258,65 +3598,574 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  evar_vals
         """
-        names = self.get_variable_names(objType)
-        var_id = names.index(name) + 1
-        numVals = 0
+        if out is not None or (self.__arrays is None and self.__sidecar is None):
+            return self.__read_variable_values(objType, entityId, name, step, out)
         if objType == 'EX_NODAL':
-            numVals = self.num_nodes()
-        elif objType == 'EX_ELEM_BLOCK':
-            numVals = self.num_elems_in_blk(entityId)
-        elif objType == 'EX_NODE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_EDGE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_FACE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_SIDE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-
-        values = self.__ex_get_var(step, objType, var_id, entityId, numVals)
+            entityId = 0
+        key = ('var', objType, entityId, self.__variable_id(objType, name), step)
+        return self.__array_cached(key, lambda: self.__read_cached_variable_values(
+            objType, entityId, name, step))
+
+    def __read_cached_variable_values(self, objType, entityId, name, step):
+        if self.__sidecar is None or not self.__sidecar.caches_variable(name):
+            return self.__read_variable_values(objType, entityId, name, step)
+        key = "var/{}/{}/{}/{}".format(objType, entityId, name, step)
+        return self.__sidecar_read(key, lambda: self.__read_variable_values(
+            objType, entityId, name, step))
+
+    def __read_variable_values(self, objType, entityId, name, step, out=None):
+        var_id = self.__variable_id(objType, name)
+        numVals = self.__num_entries(objType, entityId)
+        values = self.__ex_get_var(step, objType, var_id, entityId, numVals, out)
+        if out is not None:
+            return out
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
         return values
 
-
     # --------------------------------------------------------------------
-    def put_variable_values(self, objType, entityId, name, step, values):
+
+    def get_variable_block(self, objType, entityId, names=None, steps=None):
         """
-        store a list of element variable values for a specified element
-        block, element variable name, and time step
+        get the values of several variables of one entity over several time
+        steps as a single array.  The library has no call reading a whole
+        entity over several steps, so each variable is read, for each run of
+        consecutive steps, either one step at a time directly into place or,
+        when the entity has fewer entries than the run has steps, as one
+        history per entry; this takes min(num_steps, num_entries) calls per
+        variable and run
 
-        >>> status = exo.put_variable_values('EX_ELEM_BLOCK', elem_blk_id,
-        ...             evar_name, time_step, evar_vals)
+        >>> vals = exo.get_variable_block('EX_ELEM_BLOCK', elem_blk_id,
+        ...                               ['stress', 'strain'], range(1, 11))
+        >>> vals[t, v, e]  # value of names[v] on element e at steps[t]
 
         Parameters
         ----------
-        entityId : int  entity *ID* (not *INDEX*)
-            <string>    name    name of variable
-            <int>          time_step    1-based index of time step
-            <list<float>>  values the variable values to be output
+        objType : ex_entity_type
+            type of object being queried, e.g. 'EX_NODAL', 'EX_ELEM_BLOCK'
+            or 'EX_SIDE_SET'
+        entityId : int
+            block or set *ID* (not *INDEX*); ignored for 'EX_NODAL'
+        names : <list<string>>, optional
+            names of the variables to read; defaults to all variables of
+            `objType`
+        steps : <list<int>>, optional
+            1-based indices of the time steps to read; defaults to all
+
+        Returns
+        -------
+        vals : <np_array<double>>
+            C-contiguous array of shape (num_steps, num_vars, num_entries);
+            variables the truth table marks as not defined on the entity
+            are not read and are filled with NaN
+        """
+        np = self.np if self.use_numpy else _import_numpy(required_by='exodus.get_variable_block')
+        if names is None:
+            names = self.get_variable_names(objType)
+        if steps is None:
+            steps = range(1, self.num_times() + 1)
+        steps = list(steps)
+        var_ids = [self.__variable_id(objType, name) for name in names]
+        numVals = self.__num_entries(objType, entityId)
+        values = np.full((len(steps), len(var_ids), numVals), np.nan)
+        if objType == 'EX_NODAL':
+            entityId = 0
+            defined = var_ids
+        else:
+            truth = self.__ex_get_object_truth_vector(objType, entityId)
+            defined = [var_id if truth[var_id - 1] else None for var_id in var_ids]
+        runs = []  # (first row, first step, last step) of each run of consecutive steps
+        for row, step in enumerate(steps):
+            if runs and step == runs[-1][2] + 1:
+                runs[-1][2] = step
+            else:
+                runs.append([row, step, step])
+        offset = None
+        for first, begin_step, end_step in runs:
+            num_steps = end_step - begin_step + 1
+            by_entry = numVals < num_steps
+            if by_entry and offset is None:
+                offset = 0 if objType == 'EX_NODAL' else self.__entry_offset(objType, entityId)[0]
+            history = np.empty(num_steps) if by_entry else None
+            for col, var_id in enumerate(defined):
+                if var_id is None:
+                    continue
+                if by_entry:
+                    for entry in range(numVals):
+                        self.__ex_get_var_time(objType, var_id, offset + entry + 1,
+                                               begin_step, end_step, history)
+                        values[first:first + num_steps, col, entry] = history
+                else:
+                    for row in range(first, first + num_steps):
+                        self.__ex_get_var(begin_step + row - first, objType, var_id, entityId,
+                                          numVals, values[row, col])
+        return values
 
-        Returns
-        -------
-        status : bool
-            True = successful execution
+    # --------------------------------------------------------------------
+
+    def get_variable_values_at_time(self, objType, entityId, name, time_val, method='linear'):
         """
-        names = self.get_variable_names(objType)
-        var_id = names.index(name) + 1
-        numVals = 0
-        if objType == 'EX_NODAL':
-            numVals = self.num_nodes()
-        elif objType == 'EX_ELEM_BLOCK':
-            numVals = self.num_elems_in_blk(entityId)
-        elif objType == 'EX_NODE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_EDGE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_FACE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
-        elif objType == 'EX_SIDE_SET':
-            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
+        get the values of a variable on one entity at an arbitrary time,
+        interpolated between the stored time steps
+
+        Only the two (linear) or up to four (cubic) steps around `time_val`
+        are read; they are kept in reused buffers, so consecutive calls at
+        nearby times on the same variable read no step twice.
+
+        >>> temp = exo.get_variable_values_at_time('EX_NODAL', 0, 'temp', 0.35)
+        >>> stress = exo.get_variable_values_at_time('EX_ELEM_BLOCK', elem_blk_id,
+        ...                                          'stress', 0.35, method='cubic')
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            type of object being queried, e.g. 'EX_NODAL', 'EX_ELEM_BLOCK'
+            or 'EX_SIDE_SET'
+        entityId : int
+            block or set *ID* (not *INDEX*); ignored for 'EX_NODAL'
+        name : string
+            name of variable
+        time_val : float
+            time to interpolate to; must lie between the first and the last
+            stored time
+        method : string, optional
+            'linear', or 'cubic' for the piecewise cubic used by exomerge's
+            interpolate_time, which extrapolates a linear ghost step past
+            the first and last stored steps
+
+        Returns
+        -------
+
+            if array_type == 'ctype':
+              <list<float>>  var_vals
+
+            if array_type == 'numpy':
+              <np_array<double>>  var_vals
+        """
+        values = self.resample(objType, entityId, [name], [time_val], method)[0, 0]
+        if self.use_numpy:
+            return values
+        return values.tolist()
+
+    # --------------------------------------------------------------------
+
+    def resample(self, objType, entityId, names=None, times=None, method='linear'):
+        """
+        get the values of several variables of one entity at a list of
+        arbitrary times, interpolated between the stored time steps
+
+        The times are visited in increasing order so that each stored step
+        is read at most once per variable, however many of the requested
+        times it contributes to.
+
+        >>> vals = exo.resample('EX_ELEM_BLOCK', elem_blk_id, ['stress', 'strain'],
+        ...                     np.linspace(0.0, 1.0, 101))
+        >>> vals[t, v, e]  # value of names[v] on element e at times[t]
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            type of object being queried, e.g. 'EX_NODAL', 'EX_ELEM_BLOCK'
+            or 'EX_SIDE_SET'
+        entityId : int
+            block or set *ID* (not *INDEX*); ignored for 'EX_NODAL'
+        names : <list<string>>, optional
+            names of the variables to read; defaults to all variables of
+            `objType`
+        times : <list<float>>
+            times to interpolate to, in any order; each must lie between
+            the first and the last stored time
+        method : string, optional
+            'linear' or 'cubic', see get_variable_values_at_time
+
+        Returns
+        -------
+        vals : <np_array<double>>
+            array of shape (num_times, num_vars, num_entries); variables the
+            truth table marks as not defined on the entity are filled with
+            NaN
+        """
+        np = self.np if self.use_numpy else _import_numpy(required_by='exodus.resample')
+        if names is None:
+            names = self.get_variable_names(objType)
+        elif isinstance(names, str):
+            names = [names]
+        if times is None:
+            raise Exception("ERROR: resample needs the times to interpolate to")
+        times = np.asarray(times, dtype=np.float64).ravel()
+        stored = self.__time_values()
+        formulas = [_interpolation_weights(stored, float(t), method) for t in times]
+        var_ids = [self.__variable_id(objType, name) for name in names]
+        if objType == 'EX_NODAL':
+            entityId = 0
+            defined = var_ids
+        else:
+            truth = self.__ex_get_object_truth_vector(objType, entityId)
+            defined = [var_id if truth[var_id - 1] else None for var_id in var_ids]
+        numVals = self.__num_entries(objType, entityId)
+        values = np.full((len(times), len(var_ids), numVals), np.nan)
+        for col, var_id in enumerate(defined):
+            if var_id is None:
+                continue
+            for row in np.argsort(times, kind='stable'):
+                steps, weights = formulas[row]
+                loaded = self.__time_window_values(objType, entityId, var_id, steps, numVals,
+                                                   np)
+                out = values[row, col]
+                np.multiply(loaded[0], weights[0], out=out)
+                for step_values, weight in zip(loaded[1:], weights[1:]):
+                    out += weight * step_values
+        return values
+
+    # --------------------------------------------------------------------
+
+    def iter_steps(self, variables=None, objTypes=None, steps=None, prefetch=2):
+        """
+        iterate over time steps, yielding the values of the requested
+        variables at each step while the following steps are read on a
+        background thread
+
+        >>> for step, values in exo.iter_steps(['temp', 'stress']):
+        ...     temp = values[('EX_NODAL', None, 'temp')]
+        ...     stress = values[('EX_ELEM_BLOCK', elem_blk_id, 'stress')]
+
+        Parameters
+        ----------
+        variables : <list<string>>, optional
+            names of the variables to read; defaults to all variables of
+            the requested object types
+        objTypes : <list<ex_entity_type>>, optional
+            object types to read, e.g. 'EX_GLOBAL', 'EX_NODAL',
+            'EX_ELEM_BLOCK' or 'EX_SIDE_SET'; defaults to
+            ['EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK']
+        steps : <list<int>>, optional
+            1-based indices of the time steps to visit; defaults to all
+        prefetch : int, optional
+            number of steps read ahead of the one being processed; 0 reads
+            each step in the calling thread
+
+        Returns
+        -------
+        generator of (step, values) tuples, where values maps
+        (objType, entityId, name) to a <np_array<double>> of the variable on
+        that block or set (entityId is None for 'EX_NODAL'), or to a float
+        for 'EX_GLOBAL'; variables the truth table marks absent on an entity
+        are left out
+
+        Note:
+        -----
+        The arrays are preallocated and reused for later steps, so copy any
+        array that must outlive the current iteration.  If the library is
+        not thread-safe, every libexodus call made while the prefetch
+        thread is running, from any handle or thread, holds
+        `EXODUS_LIB_LOCK`.  The thread runs until it has read the last step
+        or the generator is closed, so when leaving the loop early call
+        `close()` on the generator (or iterate over
+        `contextlib.closing(exo.iter_steps(...))`) to stop it.
+        """
+        np = self.np if self.use_numpy else _import_numpy(required_by='exodus.iter_steps')
+        if objTypes is None:
+            objTypes = ['EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK']
+        if steps is None:
+            steps = range(1, self.num_times() + 1)
+        steps = list(steps)
+
+        global_names = []
+        reads = []
+        for objType in objTypes:
+            names = self.get_variable_names(objType)
+            if variables is not None:
+                names = [name for name in names if name in variables]
+            if objType == 'EX_GLOBAL':
+                global_names = names
+            elif objType == 'EX_NODAL':
+                for name in names:
+                    reads.append(((objType, None, name), objType, self.__variable_id(objType, name),
+                                  0, self.num_nodes()))
+            else:
+                for entityId in self.__ex_get_ids(objType):
+                    truth = self.__ex_get_object_truth_vector(objType, entityId)
+                    numVals = self.__num_entries(objType, entityId)
+                    for name in names:
+                        var_id = self.__variable_id(objType, name)
+                        if truth[var_id - 1]:
+                            reads.append(((objType, entityId, name), objType, var_id,
+                                          entityId, numVals))
+        numGlobal = self.get_variable_number('EX_GLOBAL') if global_names else 0
+        global_ids = [self.__variable_id('EX_GLOBAL', name) - 1 for name in global_names]
+
+        def allocate():
+            return (np.empty(numGlobal),
+                    [np.empty(numVals) for _key, _type, _id, _ent, numVals in reads])
+
+        def read_step(step, buffers):
+            if numGlobal > 0:
+                self.__ex_get_var(step, 'EX_GLOBAL', 0, 1, numGlobal, buffers[0])
+            for (_key, objType, var_id, entityId, numVals), buf in zip(reads, buffers[1]):
+                self.__ex_get_var(step, objType, var_id, entityId, numVals, buf)
+
+        def as_values(buffers):
+            values = {read[0]: buf for read, buf in zip(reads, buffers[1])}
+            for name, index in zip(global_names, global_ids):
+                values[('EX_GLOBAL', None, name)] = float(buffers[0][index])
+            return values
+
+        if prefetch < 1:
+            buffers = allocate()
+            for step in steps:
+                read_step(step, buffers)
+                yield step, as_values(buffers)
+            return
+
+        serialized = not self.__library_threadsafe()
+        free = queue.Queue()
+        ready = queue.Queue()
+        stop = threading.Event()
+        for _ in range(prefetch + 1):
+            free.put(allocate())
+
+        def reader():
+            try:
+                for step in steps:
+                    buffers = free.get()
+                    if buffers is None or stop.is_set():
+                        return
+                    read_step(step, buffers)
+                    ready.put((step, buffers))
+                ready.put((None, None))
+            except BaseException as err:  # handed to the consuming thread
+                ready.put((None, err))
+            finally:
+                if serialized:
+                    _serialize_library_calls(False)
+
+        # library calls are serialized from here until the reader returns
+        if serialized:
+            _serialize_library_calls(True)
+        thread = threading.Thread(target=reader, name="exodus-prefetch", daemon=True)
+        try:
+            thread.start()
+        except BaseException:
+            if serialized:
+                _serialize_library_calls(False)
+            raise
+        try:
+            while True:
+                step, buffers = ready.get()
+                if step is None:
+                    if buffers is not None:
+                        raise buffers
+                    return
+                yield step, as_values(buffers)
+                free.put(buffers)
+        finally:
+            stop.set()
+            free.put(None)
+            thread.join()
+
+    # --------------------------------------------------------------------
+
+    def get_variable_time_series(self, objType, entityId, name, entity_index=None,
+                                 begin_step=1, end_step=None):
+        """
+        get the history of a variable over a range of time steps for one or
+        more entries (nodes, elements, set members) of an entity; each
+        history is read with a single library call instead of one full
+        read per time step
+
+        >>> temp_hist = exo.get_variable_time_series('EX_NODAL', None, 'temp', node_index)
+        >>> stress_hist = exo.get_variable_time_series('EX_ELEM_BLOCK', elem_blk_id,
+        ...                                            'stress', [1, 5, 9], 10, 20)
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            type of object being queried, e.g. 'EX_NODAL', 'EX_ELEM_BLOCK',
+            'EX_NODE_SET' or 'EX_GLOBAL'
+        entityId : int
+            block or set *ID* (not *INDEX*); ignored for 'EX_NODAL' and
+            'EX_GLOBAL'
+        name : string
+            name of variable
+        entity_index : int or <list<int>>
+            1-based index of the entry within the block or set (the node
+            *INDEX* for 'EX_NODAL'); ignored for 'EX_GLOBAL'
+        begin_step : int, optional
+            1-based index of the first time step; defaults to 1
+        end_step : int, optional
+            1-based index of the last time step (inclusive); defaults to
+            exo.num_times()
+
+        Returns
+        -------
+
+            if entity_index is an int, or objType is 'EX_GLOBAL':
+              if array_type == 'ctype':
+                <list<ctypes.c_double>>  var_vals  one value per time step
+              if array_type == 'numpy':
+                <np_array<double>>  var_vals  shape (num_steps,)
+
+            if entity_index is a list:
+              if array_type == 'ctype':
+                <list<list<ctypes.c_double>>>  var_vals  one history per entry
+              if array_type == 'numpy':
+                <np_array<double>>  var_vals  C-contiguous, shape
+                                              (num_entries, num_steps);
+                                              one history per row
+        """
+        if end_step is None:
+            end_step = self.num_times()
+        if begin_step < 1 or end_step < begin_step or end_step > self.num_times():
+            raise Exception("ERROR: invalid time step range [{}, {}] for {} time steps."
+                            .format(begin_step, end_step, self.num_times()))
+        var_id = self.__variable_id(objType, name)
+        if objType == 'EX_GLOBAL':
+            values = self.__ex_get_var_time(objType, var_id, 1, begin_step, end_step)
+            if self.use_numpy:
+                values = ctype_to_numpy(self, values)
+            return values
+
+        if objType == 'EX_NODAL':
+            offset, numEntries = 0, self.num_nodes()
+        else:
+            offset, numEntries = self.__entry_offset(objType, entityId)
+        single = not hasattr(entity_index, '__len__')
+        indices = [entity_index] if single else entity_index
+        for index in indices:
+            if index < 1 or index > numEntries:
+                raise Exception("ERROR: entity index {} out of range [1, {}]."
+                                .format(index, numEntries))
+
+        num_steps = end_step - begin_step + 1
+        if self.use_numpy:
+            values = self.np.empty((len(indices), num_steps))
+            for row, index in zip(values, indices):
+                self.__ex_get_var_time(objType, var_id, offset + int(index),
+                                       begin_step, end_step, row)
+        else:
+            values = [self.__ex_get_var_time(objType, var_id, offset + int(index),
+                                             begin_step, end_step)
+                      for index in indices]
+        if single:
+            return values[0]
+        return values
+
+    # --------------------------------------------------------------------
+
+    def get_probe_values(self, objType, probe_ids, names, steps=None, max_gap=4096):
+        """
+        get the values of one or more nodal or element variables at an
+        arbitrary set of nodes or elements over many time steps
+
+        The probes are mapped from *ID* to *INDEX* through the node or
+        element id map, sorted, and grouped into contiguous index ranges;
+        probes separated by at most `max_gap` unused entries share a range.
+        Each range is read with one partial read per variable and time
+        step, so a few scattered probes do not require reading every node
+        or element of the model.
+
+        >>> vals = exo.get_probe_values('EX_NODAL', node_ids, ['temp', 'pres'])
+        >>> vals = exo.get_probe_values('EX_ELEM_BLOCK', elem_ids, ['stress'],
+        ...                             steps=range(1, 11), max_gap=256)
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            'EX_NODAL' for node probes or 'EX_ELEM_BLOCK' for element probes
+        probe_ids : <list<int>>
+            node or element *IDs* (not *INDICES*), in the desired output
+            order; duplicates are allowed
+        names : string or <list<string>>
+            names of the variables to read
+        steps : <list<int>>, optional
+            1-based indices of the time steps to read; defaults to all
+        max_gap : int, optional
+            largest number of unrequested entries read in order to join two
+            probes into the same range; the default trades one extra library
+            call against reading 32 KiB of unneeded values
+
+        Returns
+        -------
+        vals : <np_array<double>>
+            array of shape (num_steps, num_probes, num_vars); element
+            variables that the truth table marks as absent on a probe's
+            block are returned as NaN
+        """
+        np = self.np if self.use_numpy else _import_numpy(required_by='exodus.get_probe_values')
+        if isinstance(names, str):
+            names = [names]
+        if steps is None:
+            steps = range(1, self.num_times() + 1)
+        steps = list(steps)
+        var_ids = [self.__variable_id(objType, name) for name in names]
+        result = np.full((len(steps), len(probe_ids), len(var_ids)), np.nan)
+        if len(steps) == 0 or len(probe_ids) == 0 or len(var_ids) == 0:
+            return result
+
+        if objType == 'EX_NODAL':
+            indices = self.id_index('EX_NODE_MAP').indices(probe_ids)
+            groups = [(0, 0, np.arange(len(indices)), indices)]
+        elif objType == 'EX_ELEM_BLOCK':
+            indices = self.id_index('EX_ELEM_MAP').indices(probe_ids)
+            groups = []
+            offset = 0
+            for blkId in self.__ex_get_ids(objType):
+                numElem = self.__ex_get_block(objType, blkId)[1].value
+                in_block = np.nonzero((indices > offset) & (indices <= offset + numElem))[0]
+                if len(in_block) > 0:
+                    groups.append((blkId, offset, in_block, indices[in_block] - offset))
+                offset += numElem
+        else:
+            raise Exception("ERROR: probes are only supported for 'EX_NODAL' and "
+                            "'EX_ELEM_BLOCK', not {}.".format(objType))
+
+        reads = []
+        for blkId, _offset, positions, local in groups:
+            if objType == 'EX_ELEM_BLOCK':
+                truth = self.__ex_get_object_truth_vector(objType, blkId)
+                columns = [col for col, var_id in enumerate(var_ids) if truth[var_id - 1]]
+            else:
+                columns = list(range(len(var_ids)))
+            for start, stop in _coalesce_ranges(local, max_gap):
+                selected = np.nonzero((local >= start) & (local < stop))[0]
+                reads.append((blkId, start, stop - start, positions[selected],
+                              local[selected] - start, columns))
+        buf = np.empty(max(read[2] for read in reads))
+
+        for row, step in enumerate(steps):
+            for blkId, start, count, positions, offsets, columns in reads:
+                for col in columns:
+                    self.__ex_get_partial_var(step, objType, var_ids[col], blkId,
+                                              start, count, buf)
+                    result[row, positions, col] = buf[offsets]
+        return result
+
+    # --------------------------------------------------------------------
+
+    def put_variable_values(self, objType, entityId, name, step, values):
+        """
+        store a list of element variable values for a specified element
+        block, element variable name, and time step
+
+        >>> status = exo.put_variable_values('EX_ELEM_BLOCK', elem_blk_id,
+        ...             evar_name, time_step, evar_vals)
 
+        Parameters
+        ----------
+        entityId : int  entity *ID* (not *INDEX*)
+            <string>    name    name of variable
+            <int>          time_step    1-based index of time step
+            <list<float>>  values the variable values to be output; a
+                           float64 numpy array or other buffer is passed
+                           to the library without a per-value copy
+
+        Returns
+        -------
+        status : bool
+            True = successful execution
+        """
+        var_id = self.__variable_id(objType, name)
+        numVals = self.__num_entries(objType, entityId)
         self.__ex_put_var(step, objType, var_id, entityId, numVals, values)
         return True
 
@@ -2675,6 +4524,14 @@ class exodus:
             <int>  num_blk_elems    number of elements in the block
             <int>  num_elem_nodes   number of nodes per element
         """
+        return self.__array_cached(('connect', object_id),
+                                   lambda: self.__read_connectivity(object_id))
+
+    def __read_connectivity(self, object_id):
+        if self.__sidecar is not None:
+            connectivity = self.__sidecar_read("connect/{}".format(object_id),
+                                               lambda: self.__read_connectivity_array(object_id))
+            return connectivity.reshape(-1), connectivity.shape[0], connectivity.shape[1]
         (elem_block_connectivity, num_elem_this_blk,
          num_nodes_per_elem) = self.__ex_get_elem_conn(object_id)
         if self.use_numpy:
@@ -2682,6 +4539,10 @@ class exodus:
                 self, elem_block_connectivity)
         return elem_block_connectivity, num_elem_this_blk.value, num_nodes_per_elem.value
 
+    def __read_connectivity_array(self, object_id):
+        connectivity, num_elems, nodes_per_elem = self.__ex_get_elem_conn(object_id)
+        return ctype_to_numpy(self, connectivity).reshape(num_elems.value, nodes_per_elem.value)
+
     # --------------------------------------------------------------------
 
     def put_elem_connectivity(self, object_id, connectivity):
@@ -2702,7 +4563,9 @@ class exodus:
               then all nodes of the second element,
               etc.
               (see `exodus.get_id_map` for explanation
-              of node *INDEX* versus node *ID*)
+              of node *INDEX* versus node *ID*); a flat
+              integer numpy array or array.array of the
+              file's integer width is used without copying
         """
         _d1, numBlkElems, numNodesPerElem, _d2 = self.elem_blk_info(object_id)
         assert len(connectivity) == (numBlkElems * numNodesPerElem)
@@ -2710,6 +4573,88 @@ class exodus:
 
     # --------------------------------------------------------------------
 
+    def get_elem_node_adjacency(self):
+        """
+        get the nodes of every element of the model, blocks in the order
+        of `exodus.get_ids`, as a compressed sparse row (CSR) structure:
+        the nodes of element `e` are `indices[offsets[e]:offsets[e + 1]]`.
+
+        All adjacency structures use 0-based element and node *INDICES*,
+        are built with numpy once per exodus object and cached on it.
+
+        >>> offsets, indices = exo.get_elem_node_adjacency()
+
+        Returns
+        -------
+            <np_array<int64>>  offsets  length num_elems() + 1
+            <np_array<int64>>  indices  0-based node *INDICES*
+        """
+        return self.__cached(('adjacency', 'elem_node'), self.__build_elem_node_adjacency)
+
+    # --------------------------------------------------------------------
+
+    def get_node_elem_adjacency(self):
+        """
+        get the elements connected to each node as a CSR structure (see
+        `exodus.get_elem_node_adjacency`); each row is sorted
+
+        >>> offsets, elems = exo.get_node_elem_adjacency()
+        >>> elems_of_node = elems[offsets[node]:offsets[node + 1]]
+
+        Returns
+        -------
+            <np_array<int64>>  offsets  length num_nodes() + 1
+            <np_array<int64>>  indices  0-based element *INDICES*
+        """
+        return self.__cached(('adjacency', 'node_elem'), self.__build_node_elem_adjacency)
+
+    # --------------------------------------------------------------------
+
+    def get_elem_elem_adjacency(self, shared='node'):
+        """
+        get the neighbours of each element as a CSR structure (see
+        `exodus.get_elem_node_adjacency`); an element is not its own
+        neighbour and each row is sorted
+
+        >>> offsets, neighbours = exo.get_elem_elem_adjacency(shared='face')
+
+        Parameters
+        ----------
+        shared : string
+            'node' : elements sharing at least one node are neighbours
+            'face' : elements sharing a face (3D), an edge (2D) or an end
+                     node (1D) are neighbours; faces are matched on their
+                     corner nodes
+
+        Returns
+        -------
+            <np_array<int64>>  offsets  length num_elems() + 1
+            <np_array<int64>>  indices  0-based element *INDICES*
+        """
+        if shared not in ('node', 'face'):
+            raise Exception("ERROR: shared must be 'node' or 'face', not " + str(shared))
+        return self.__cached(('adjacency', 'elem_elem', shared),
+                             self.__build_elem_elem_adjacency, shared)
+
+    # --------------------------------------------------------------------
+
+    def get_node_node_adjacency(self):
+        """
+        get the nodes sharing an element with each node as a CSR structure
+        (see `exodus.get_elem_node_adjacency`); a node is not its own
+        neighbour and each row is sorted
+
+        >>> offsets, neighbours = exo.get_node_node_adjacency()
+
+        Returns
+        -------
+            <np_array<int64>>  offsets  length num_nodes() + 1
+            <np_array<int64>>  indices  0-based node *INDICES*
+        """
+        return self.__cached(('adjacency', 'node_node'), self.__build_node_node_adjacency)
+
+    # --------------------------------------------------------------------
+
     def get_elem_attr(self, elem_blk_id):
         """
         get all attributes for each element in a block
@@ -2945,7 +4890,8 @@ class exodus:
 
     # --------------------------------------------------------------------
 
-    def get_partial_element_variable_values(self, blockId, name, step, start_index, num_elements):
+    def get_partial_element_variable_values(self, blockId, name, step, start_index, num_elements,
+                                            out=None):
         """
         get list of element variable values for a specified element
         block, element variable name, and time step
@@ -2965,6 +4911,10 @@ class exodus:
             1-based index of element in block to start returning data
         num_elements: int
             number of elements to return data for.
+        out : buffer, optional
+            preallocated, writable float64 buffer of at least num_elements
+            values; the values are read directly into it and `out` itself
+            is returned
 
         Returns
         -------
@@ -2975,9 +4925,11 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  evar_vals
         """
-        names = self.get_variable_names('EX_ELEM_BLOCK')
-        var_id = names.index(name) + 1
-        values = self.__ex_get_partial_var(step, 'EX_ELEM_BLOCK', var_id, blockId, start_index, num_elements)
+        var_id = self.__variable_id('EX_ELEM_BLOCK', name)
+        values = self.__ex_get_partial_var(step, 'EX_ELEM_BLOCK', var_id, blockId, start_index,
+                                           num_elements, out)
+        if out is not None:
+            return out
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
         return values
@@ -3010,6 +4962,40 @@ class exodus:
 
     # --------------------------------------------------------------------
 
+    def put_partial_element_variable_values(self, blockId, name, step, start_index, values):
+        """
+        store element variable values for a specified element block,
+        element variable name, and time step for `len(values)` consecutive
+        elements of the block, starting at element `start_index` (1-based)
+
+        >>> status = exo.put_partial_element_variable_values(elem_blk_id,
+        ...             evar_name, time_step, 10, evar_vals)
+
+        Parameters
+        ----------
+        elem_blk_id : int
+            element block *ID* (not *INDEX*)
+        evar_name : string
+            name of element variable
+        time_step : int
+            1-based index of time step
+        start_index: int
+            1-based index of first element in block to store data for
+        evar_vals : list<float>
+            (or any buffer-protocol object)
+
+        Returns
+        -------
+        status : bool
+            True = successful execution
+        """
+        var_id = self.__variable_id('EX_ELEM_BLOCK', name)
+        self.__ex_put_partial_var(step, 'EX_ELEM_BLOCK', var_id, blockId, start_index,
+                                  len(values), values)
+        return True
+
+    # --------------------------------------------------------------------
+
     def get_element_variable_number(self):
         """
         get the number of element variables in the model
@@ -3588,8 +5574,7 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  nsvar_vals
         """
-        names = self.get_variable_names('EX_NODE_SET')
-        var_id = names.index(name) + 1
+        var_id = self.__variable_id('EX_NODE_SET', name)
         values = self.__ex_get_partial_var(step, 'EX_NODE_SET', var_id, object_id, start_index, num_nodes)
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
@@ -4288,8 +6273,7 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  ssvar_vals
         """
-        names = self.get_variable_names('EX_SIDE_SET')
-        var_id = names.index(name) + 1
+        var_id = self.__variable_id('EX_SIDE_SET', name)
         values = self.__ex_get_partial_var(step, 'EX_SIDE_SET', var_id, object_id, start_index, num_sides)
         if self.use_numpy:
             values = ctype_to_numpy(self, values)
@@ -4491,8 +6475,7 @@ class exodus:
         -------
             <float>  gvar_val
         """
-        names = self.get_variable_names('EX_GLOBAL')
-        var_id = names.index(name)
+        var_id = self.__variable_id('EX_GLOBAL', name) - 1
         num = self.__ex_get_variable_param('EX_GLOBAL')
         gvalues = self.__ex_get_var(step, 'EX_GLOBAL', 0, 1, num.value)
         return gvalues[var_id]
@@ -4559,9 +6542,9 @@ class exodus:
                 self.get_global_variable_value(
                     names[i], step))
         # adjust one of them
-        values[names.index(name)] = ctypes.c_double(value)
+        values[self.__variable_id('EX_GLOBAL', name) - 1] = ctypes.c_double(value)
         # write them all
-        EXODUS_LIB.ex_put_glob_vars(self.fileId,
+        self.__lib.ex_put_glob_vars(self.fileId,
                                     ctypes.c_int(step),
                                     ctypes.c_int(numVals),
                                     values)
@@ -4588,10 +6571,8 @@ class exodus:
             True = successful execution
         """
         numVals = self.get_variable_number('EX_GLOBAL')
-        gvalues = (ctypes.c_double * numVals)()
-        for i in range(numVals):
-            gvalues[i] = ctypes.c_double(values[i])
-        EXODUS_LIB.ex_put_glob_vars(self.fileId,
+        gvalues = as_ctype_array(values, ctypes.c_double, numVals)
+        self.__lib.ex_put_glob_vars(self.fileId,
                                     ctypes.c_int(step),
                                     ctypes.c_int(numVals),
                                     gvalues)
@@ -4619,16 +6600,11 @@ class exodus:
             if array_type == 'numpy':
               <np_array<double>>  gvar_vals
         """
-        names = self.get_variable_names('EX_GLOBAL')
-        var_id = names.index(name)
-        num = self.__ex_get_variable_param('EX_GLOBAL')
-        values = []
-        for i in range(self.numTimes.value):
-            gvalues = self.__ex_get_var(i + 1, 'EX_GLOBAL', 0, 1, num.value)
-            values.append(gvalues[var_id])
+        var_id = self.__variable_id('EX_GLOBAL', name)
+        values = self.__ex_get_var_time('EX_GLOBAL', var_id, 1, 1, self.num_times())
         if self.use_numpy:
-            values = self.np.array(values)
-        return values
+            return ctype_to_numpy(self, values)
+        return list(values)
 
     # --------------------------------------------------------------------
 
@@ -4656,7 +6632,7 @@ class exodus:
         """
 
         ebType = ctypes.c_int(get_entity_type('EX_ELEM_BLOCK'))
-        EXODUS_LIB.ex_put_block(self.fileId, ebType, ctypes.c_longlong(blkID),
+        self.__lib.ex_put_block(self.fileId, ebType, ctypes.c_longlong(blkID),
                                 ctypes.create_string_buffer(b"NFACED"),
                                 ctypes.c_longlong(num_elems_this_blk),
                                 ctypes.c_longlong(0),
@@ -4690,7 +6666,7 @@ class exodus:
             True = successful execution
         """
         fbType = ctypes.c_int(get_entity_type('EX_FACE_BLOCK'))
-        EXODUS_LIB.ex_put_block(self.fileId, fbType, ctypes.c_longlong(blkID),
+        self.__lib.ex_put_block(self.fileId, fbType, ctypes.c_longlong(blkID),
                                 ctypes.create_string_buffer(b"NSIDED"),
                                 ctypes.c_longlong(num_faces_this_blk),
                                 ctypes.c_longlong(num_nodes),
@@ -4723,9 +6699,8 @@ class exodus:
             True = successful execution
         """
         ebType = ctypes.c_int(get_entity_type('EX_ELEM_BLOCK'))
-        entity_counts = (ctypes.c_int * len(entityCounts))()
-        entity_counts[:] = entityCounts
-        EXODUS_LIB.ex_put_entity_count_per_polyhedra(
+        entity_counts = as_ctype_array(entityCounts, ctypes.c_int)
+        self.__lib.ex_put_entity_count_per_polyhedra(
             self.fileId, ebType, ctypes.c_longlong(blkID), entity_counts)
         return True
 
@@ -4753,9 +6728,8 @@ class exodus:
             True = successful execution
         """
         ebType = ctypes.c_int(get_entity_type('EX_FACE_BLOCK'))
-        entity_counts = (ctypes.c_int * len(entityCounts))()
-        entity_counts[:] = entityCounts
-        EXODUS_LIB.ex_put_entity_count_per_polyhedra(
+        entity_counts = as_ctype_array(entityCounts, ctypes.c_int)
+        self.__lib.ex_put_entity_count_per_polyhedra(
             self.fileId, ebType, ctypes.c_longlong(blkID), entity_counts)
         return True
 
@@ -4783,9 +6757,8 @@ class exodus:
             True = successful execution
         """
         ebType = ctypes.c_int(get_entity_type('EX_ELEM_BLOCK'))
-        elem_face_conn = (ctypes.c_int * len(elemFaceConn))()
-        elem_face_conn[:] = elemFaceConn
-        EXODUS_LIB.ex_put_conn(self.fileId, ebType, ctypes.c_longlong(blkId),
+        elem_face_conn = as_ctype_array(elemFaceConn, self.__bulk_int_type())
+        self.__lib.ex_put_conn(self.fileId, ebType, ctypes.c_longlong(blkId),
                                None, None, elem_face_conn)
         return True
 
@@ -4813,9 +6786,8 @@ class exodus:
             True = successful execution
         """
         ebType = ctypes.c_int(get_entity_type('EX_FACE_BLOCK'))
-        node_conn = (ctypes.c_int * len(faceNodeConn))()
-        node_conn[:] = faceNodeConn
-        EXODUS_LIB.ex_put_conn(self.fileId, ebType, ctypes.c_longlong(blkId),
+        node_conn = as_ctype_array(faceNodeConn, self.__bulk_int_type())
+        self.__lib.ex_put_conn(self.fileId, ebType, ctypes.c_longlong(blkId),
                                node_conn, None, None)
         return True
 
@@ -4832,13 +6804,154 @@ class exodus:
         Can only be called once for an exodus object, and once called
         all methods for that object become inoperable
         """
-        print(("Closing exodus file: " + self.fileName))
-        errorInt = EXODUS_LIB.ex_close(self.fileId)
+        if VERBOSE:
+            print(("Closing exodus file: " + self.fileName))
+        self.__metadata.clear()
+        if self.__arrays is not None:
+            self.__arrays.clear()
+        if self.__sidecar is not None:
+            self.__sidecar.flush()
+        if self.__io_stats is not None:
+            self.__io_variable_names()
+        errorInt = self.__lib.ex_close(self.fileId)
         if errorInt != 0:
             raise Exception(
                 "ERROR: Closing file " +
                 self.fileName +
                 " had problems.")
+        if self.__io_stats is not None:
+            _IO_STATS.merge(self.__named_io_stats())
+
+    # --------------------------------------------------------------------
+
+    def io_stats(self):
+        """
+        get the count, wall time and bytes moved of the libexodus calls
+        made by this handle, per entry point and per (object type,
+        variable); the handle must be opened with `profile_io=True`, or
+        after `exodus.enable_io_stats()`
+
+        The time is that of the library calls, including the ctypes
+        conversion of their arguments; the rest of a method's time is
+        spent in Python.  Bytes count the array arguments passed to each
+        call, in either direction.
+
+        >>> exo = exodus("results.e", array_type='numpy', profile_io=True)
+        >>> stress = exo.get_variable_values('EX_ELEM_BLOCK', 1, 'stress', 10)
+        >>> stats = exo.io_stats()
+        >>> stats['functions']['ex_get_var']
+        {'calls': 1, 'seconds': 0.0004, 'bytes': 80000}
+        >>> stats['variables']['EX_ELEM_BLOCK']['stress']['bytes']
+
+        Returns
+        -------
+        stats : dict
+            'functions', 'variables' and 'total', see `exodus.IOStats.as_dict`;
+            the values of all global variables are read and written
+            together, under the name '(all)'
+        """
+        if self.__io_stats is None:
+            raise Exception("ERROR: " + self.fileName + " was not opened with profile_io=True")
+        return self.__named_io_stats().as_dict()
+
+    def __named_io_stats(self):
+        # the recorded counts, with the variables by name rather than by index
+        recorded = self.__io_stats.copy()
+        names = self.__io_variable_names(recorded)
+        stats = IOStats()
+        stats.functions = recorded.functions
+        for key, values in recorded.variables.items():
+            entry = stats.variables.setdefault(names[key], [0, 0.0, 0])
+            for position, value in enumerate(values):
+                entry[position] += value
+        return stats
+
+    def __io_variable_names(self, recorded=None):
+        # resolve the recorded (variable type, index) pairs through an unprofiled
+        # library so that looking up the names does not count as I/O
+        if recorded is None:
+            recorded = self.__io_stats.copy()
+        missing = [key for key in recorded.variables if key not in self.__io_names]
+        if missing and isinstance(self.__lib, ProfiledPrototypes):
+            profiled, self.__lib = self.__lib, self.__lib.prototypes
+            try:
+                for var_type, var_index in missing:
+                    objType = ex_entity_type(var_type).name
+                    if objType == 'EX_GLOBAL':
+                        name = '(all)'
+                    else:
+                        names = self.get_variable_names(objType)
+                        name = names[var_index - 1] if 0 < var_index <= len(names) else \
+                            "#{}".format(var_index)
+                    self.__io_names[(var_type, var_index)] = (objType, name)
+            finally:
+                self.__lib = profiled
+        return {key: self.__io_names.get(key, (key[0], "#{}".format(key[1])))
+                for key in recorded.variables}
+
+    # --------------------------------------------------------------------
+
+    def cache_stats(self):
+        """
+        get the hit, miss and eviction counts and the size of the
+        in-memory array cache enabled by the `cache_bytes` argument
+
+        >>> stats = exo.cache_stats()
+        >>> print(stats['hits'], stats['misses'], stats['bytes'])
+
+        Returns
+        -------
+        stats : dict or None
+            'hits', 'misses', 'evictions', 'entries', 'bytes' and
+            'budget_bytes'; None if the array cache is not enabled
+        """
+        if self.__arrays is None:
+            return None
+        return self.__arrays.stats()
+
+    # --------------------------------------------------------------------
+
+    def __array_cached(self, key, read):
+        if self.__arrays is None:
+            return read()
+        values = self.__arrays.get(key)
+        if values is None:
+            values = read()
+            self.__arrays.put(key, values)
+        return values
+
+    def __sidecar_read(self, key, read):
+        if self.__sidecar is None:
+            return read()
+        values = self.__sidecar.lookup(self.fileName, key)
+        if values is None:
+            values = read()
+            self.__sidecar.store(self.fileName, key, values)
+        return values
+
+    def __read_coord_array(self):
+        self.__ex_get_coord()
+        return self.np.array([ctype_to_numpy(self, coords)
+                              for coords in (self.coordsX, self.coordsY, self.coordsZ)])
+
+    # --------------------------------------------------------------------
+
+    def clear_metadata_cache(self):
+        """
+        discard the cached variable names, block and set sizes, truth
+        tables, ids and id maps of this exodus object, and the arrays
+        held by its array cache (see `cache_bytes`)
+
+        Metadata is read from the file once and reused by subsequent
+        calls; the cache is kept current by the `put_*` and `set_*`
+        methods of this object, so this only needs to be called if the
+        file is modified by some other means while it is open.
+
+        >>> exo.clear_metadata_cache()
+        """
+        self.__metadata.clear()
+        if self.__arrays is not None:
+            self.__arrays.clear()
 
     # --------------------------------------------------------------------
     #
@@ -4846,21 +6959,212 @@ class exodus:
     #
     # --------------------------------------------------------------------
 
+    def __cached(self, key, fetch, *args):
+        try:
+            return self.__metadata[key]
+        except KeyError:
+            value = fetch(*args)
+            self.__metadata[key] = value
+            return value
+
+    # --------------------------------------------------------------------
+
+    def __invalidate(self, *kinds):
+        for key in [key for key in self.__metadata if key[0] in kinds]:
+            del self.__metadata[key]
+        if 'var_param' in kinds and self.__arrays is not None:
+            self.__arrays.invalidate('var')
+
+    # --------------------------------------------------------------------
+
+    def __int64_status(self):
+        # read before the handle's prototypes exist, since they depend on it
+        prototypes = self.__profiled(exodus_prototypes())
+        return self.__cached(('int64',), prototypes.ex_int64_status, self.fileId)
+
+    # --------------------------------------------------------------------
+
+    def __variable_id(self, objType, name):
+        var_ids = self.__cached(('var_ids', objType), self.__build_variable_ids, objType)
+        try:
+            return var_ids[name]
+        except KeyError:
+            raise ValueError("{!r} is not a {} variable".format(name, objType))
+
+    # --------------------------------------------------------------------
+
+    def __time_values(self):
+        return self.__cached(('times',), self.__build_time_values)
+
+    def __build_time_values(self):
+        if self.numTimes.value == 0:
+            return []
+        self.__ex_get_all_times()
+        times = list(self.times)
+        if any(b <= a for a, b in zip(times, times[1:])):
+            raise Exception("ERROR: the stored times of " + self.fileName +
+                            " are not increasing, so they cannot be interpolated")
+        return times
+
+    # --------------------------------------------------------------------
+
+    def __time_window_values(self, objType, entityId, var_id, steps, numVals, np):
+        """
+        the values of one variable at the given 1-based steps, read into
+        buffers that are kept for the next call on the same variable;
+        buffers of steps no longer needed are reused for the new steps
+        """
+        key = (objType, entityId, var_id)
+        if self.__time_window is None or self.__time_window[0] != key:
+            self.__time_window = (key, {})
+        loaded = self.__time_window[1]
+        spare = [loaded.pop(step) for step in list(loaded) if step not in steps]
+        for step in steps:
+            if step not in loaded:
+                buf = spare.pop() if spare else np.empty(numVals)
+                self.__ex_get_var(step, objType, var_id, entityId, numVals, buf)
+                loaded[step] = buf
+        return [loaded[step] for step in steps]
+
+    # --------------------------------------------------------------------
+
+    def __build_id_index(self, objType):
+        if objType.endswith('_MAP'):
+            id_map = self.__cached(('id_map', objType), self.__read_id_map, objType)
+        else:
+            id_map = self.__cached(('ids', objType), self.__read_ids, objType)
+        return IdIndex(id_map, objType)
+
+    # --------------------------------------------------------------------
+
+    def __build_block_id_index(self, obj_type, entity_id):
+        return IdIndex(self.__ex_get_block_id_map(obj_type, entity_id),
+                       "{} {}".format(obj_type, entity_id))
+
+    # --------------------------------------------------------------------
+
+    def __library_threadsafe(self):
+        return self.__cached(('threadsafe',), self.__ex_inquire_int,
+                             ex_inquiry_map('EX_INQ_THREADSAFE')) == 1
+
+    # --------------------------------------------------------------------
+
+    def __num_entries(self, objType, entityId):
+        numVals = 0
+        if objType == 'EX_NODAL':
+            numVals = self.num_nodes()
+        elif objType == 'EX_ELEM_BLOCK':
+            numVals = self.num_elems_in_blk(entityId)
+        elif objType in ('EX_NODE_SET', 'EX_EDGE_SET', 'EX_FACE_SET', 'EX_SIDE_SET'):
+            (numVals, _numDistFactInSet) = self.__ex_get_set_param(objType, entityId)
+        return numVals
+
+    # --------------------------------------------------------------------
+
+    def __build_elem_node_adjacency(self):
+        import numpy as np
+        counts = [np.zeros(0, np.int64)]
+        indices = [np.zeros(0, np.int64)]
+        for block_id in self.get_ids('EX_ELEM_BLOCK'):
+            connectivity, num_elems, nodes_per_elem = self.__read_connectivity(block_id)
+            if not self.use_numpy and num_elems * nodes_per_elem:
+                connectivity = np.ctypeslib.as_array(connectivity)
+            counts.append(np.full(num_elems, nodes_per_elem, np.int64))
+            indices.append(np.asarray(connectivity, np.int64).reshape(-1) - 1)
+        offsets = np.zeros(sum(len(c) for c in counts) + 1, np.int64)
+        np.cumsum(np.concatenate(counts), out=offsets[1:])
+        return offsets, np.concatenate(indices)
+
+    # --------------------------------------------------------------------
+
+    def __build_node_elem_adjacency(self):
+        import numpy as np
+        offsets, nodes = self.get_elem_node_adjacency()
+        elems = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        return _csr_from_pairs(nodes, elems, self.num_nodes(), len(offsets) - 1)
+
+    # --------------------------------------------------------------------
+
+    def __build_elem_elem_adjacency(self, shared):
+        import numpy as np
+        elem_offsets, elem_nodes = self.get_elem_node_adjacency()
+        num_elems = len(elem_offsets) - 1
+        if shared == 'node':
+            return _csr_compose(elem_offsets, elem_nodes, *self.get_node_elem_adjacency(),
+                                num_elems)
+        # one row per face: its corner nodes, sorted and padded with -1
+        int_type = np.int32 if self.num_nodes() < np.iinfo(np.int32).max else np.int64
+        faces = [np.zeros((0, 4), int_type)]
+        owners = [np.zeros(0, np.int64)]
+        first = 0
+        for block_id in self.get_ids('EX_ELEM_BLOCK'):
+            elem_type, num_blk_elems, nodes_per_elem, _ = self.elem_blk_info(block_id)
+            start = elem_offsets[first]
+            block = elem_nodes[start:start + num_blk_elems * nodes_per_elem]
+            block = block.reshape(num_blk_elems, nodes_per_elem).astype(int_type)
+            for corners in _face_corners(elem_type, nodes_per_elem):
+                face = np.full((num_blk_elems, 4), -1, int_type)
+                face[:, 4 - len(corners):] = np.sort(block[:, corners], axis=1)
+                faces.append(face)
+                owners.append(np.arange(first, first + num_blk_elems))
+            first += num_blk_elems
+        faces = np.concatenate(faces)
+        owners = np.concatenate(owners)
+        order = np.lexsort(faces.T[::-1])
+        faces = faces[order]
+        owners = owners[order]
+        group = np.concatenate([[0], np.cumsum(np.any(faces[1:] != faces[:-1], axis=1))])
+        rows = [np.zeros(0, np.int64)]
+        cols = [np.zeros(0, np.int64)]
+        step = 1
+        while step < len(group):
+            same = group[:-step] == group[step:]
+            if not same.any():
+                break
+            rows += [owners[:-step][same], owners[step:][same]]
+            cols += [owners[step:][same], owners[:-step][same]]
+            step += 1
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        keep = rows != cols
+        return _csr_from_pairs(rows[keep], cols[keep], num_elems, num_elems)
+
+    # --------------------------------------------------------------------
+
+    def __build_node_node_adjacency(self):
+        return _csr_compose(*self.get_node_elem_adjacency(), *self.get_elem_node_adjacency(),
+                            self.num_nodes())
+
+    # --------------------------------------------------------------------
+
+    def __build_variable_ids(self, objType):
+        var_ids = {}
+        for index, var_name in enumerate(self.get_variable_names(objType)):
+            var_ids.setdefault(var_name, index + 1)
+        return var_ids
+
+    # --------------------------------------------------------------------
+
     def __open(self, io_size=0):
-        print(("Opening exodus file: " + self.fileName))
+        if VERBOSE:
+            print(("Opening exodus file: " + self.fileName))
         self.mode = EX_READ
         if self.modeChar.lower() == "a":
             self.mode = EX_WRITE
         if self.modeChar.lower() == "w+":
             self.mode = EX_CLOBBER
 
+        exists = os.path.isfile(self.fileName)
+        if self.comm is not None:
+            # one rank decides, so that a collective create cannot race the check
+            exists = self.comm.bcast(exists, root=0)
         if self.modeChar.lower() in [
-                "a", "r"] and not os.path.isfile(self.fileName):
+                "a", "r"] and not exists:
             raise Exception(
                 "ERROR: Cannot open " +
                 self.fileName +
                 " for read. Does not exist.")
-        elif self.modeChar.lower() == "w" and os.path.isfile(self.fileName):
+        elif self.modeChar.lower() == "w" and exists:
             raise Exception("ERROR: Cowardly not opening " + self.fileName +
                             " for write. File already exists.")
         elif self.modeChar.lower() not in ["a", "r", "w", "w+"]:
@@ -4872,8 +7176,16 @@ class exodus:
         self.comp_ws = ctypes.c_int(8)
         self.io_ws = ctypes.c_int(io_size)
         self.version = ctypes.c_float(0.0)
-        if self.modeChar.lower() in ["a", "r"]:  # open existing file
-            self.fileId = EXODUS_LIB.ex_open_int(self.fileName.encode('ascii'), self.mode,
+        if self.modeChar.lower() in ["a", "r"] and self.__mpi is not None:
+            open_par = self.__profiled(exodus_parallel_prototypes(*self.__mpi))['ex_open_par_int']
+            self.fileId = open_par(self.fileName.encode('ascii'), self.mode,
+                                   ctypes.byref(self.comp_ws), ctypes.byref(self.io_ws),
+                                   ctypes.byref(self.version), *self.__mpi,
+                                   EX_API_VERSION_NODOT)
+        elif self.modeChar.lower() in ["a", "r"]:  # open existing file
+            prototypes = self.__profiled(exodus_prototypes())
+            self.fileId = prototypes.ex_open_int(self.fileName.encode('ascii'),
+                                                 self.mode,
                                                  ctypes.byref(self.comp_ws),
                                                  ctypes.byref(self.io_ws),
                                                  ctypes.byref(self.version),
@@ -4883,20 +7195,58 @@ class exodus:
                 io_size = 8
                 self.io_ws = ctypes.c_int(io_size)
             self.__create()
+        self.__lib = self.__profiled(exodus_prototypes(self.__int64_status()))
+
+    def __profiled(self, prototypes):
+        """`prototypes`, or a dict of them, recording each call if this handle is profiled"""
+        if self.__io_stats is None:
+            return prototypes
+        if isinstance(prototypes, dict):
+            return {name: _profiled(name, function, self.__io_stats)
+                    for name, function in prototypes.items()}
+        return ProfiledPrototypes(prototypes, self.__io_stats)
 
     # --------------------------------------------------------------------
 
     def __create(self):
-        self.fileId = EXODUS_LIB.ex_create_int(self.fileName.encode('ascii'), self.mode,
-                                               ctypes.byref(self.comp_ws),
-                                               ctypes.byref(self.io_ws),
-                                               EX_API_VERSION_NODOT)
+        profile = self.__write_profile
+        if profile is not None:
+            self.mode |= profile['format']
+            if profile['int64']:
+                self.mode |= EX_ALL_INT64_DB
+        prototypes = self.__profiled(exodus_prototypes())
+        if self.__mpi is not None:
+            if not self.mode & (EX_NETCDF4 | EX_PNETCDF | EX_MPIIO):
+                self.mode |= EX_MPIIO
+            create_par = self.__profiled(exodus_parallel_prototypes(*self.__mpi))['ex_create_par_int']
+            self.fileId = create_par(self.fileName.encode('ascii'), self.mode,
+                                     ctypes.byref(self.comp_ws), ctypes.byref(self.io_ws),
+                                     *self.__mpi, EX_API_VERSION_NODOT)
+        else:
+            self.fileId = prototypes.ex_create_int(self.fileName.encode('ascii'),
+                                                   self.mode,
+                                                   ctypes.byref(self.comp_ws),
+                                                   ctypes.byref(self.io_ws),
+                                                   EX_API_VERSION_NODOT)
+        if profile is not None and profile['compression']:
+            for option, value in [('EX_OPT_COMPRESSION_LEVEL', profile['compression']),
+                                  ('EX_OPT_COMPRESSION_SHUFFLE', int(profile['shuffle']))]:
+                if prototypes.ex_set_option(self.fileId, ex_option_type[option].value, value) != 0:
+                    raise Exception("ERROR: setting " + option + " on " + self.fileName +
+                                    " had problems.")
+
+    # --------------------------------------------------------------------
+
+    def __bulk_int_type(self):
+        if self.__int64_status() & EX_BULK_INT64_API:
+            return ctypes.c_longlong
+        return ctypes.c_int
 
     # --------------------------------------------------------------------
 
     def __ex_get_info(self):
         self.Title = ctypes.create_string_buffer(MAX_LINE_LENGTH + 1)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             self.numDim = ctypes.c_longlong(0)
             self.numNodes = ctypes.c_longlong(0)
             self.numElem = ctypes.c_longlong(0)
@@ -4914,7 +7264,7 @@ class exodus:
             self.numSideSets = ctypes.c_int(0)
             self.numAssembly = ctypes.c_int(0)
             self.numBlob = ctypes.c_int(0)
-        EXODUS_LIB.ex_get_init(
+        self.__lib.ex_get_init(
             self.fileId, self.Title,
             ctypes.byref(self.numDim),
             ctypes.byref(self.numNodes),
@@ -4933,7 +7283,8 @@ class exodus:
         self.numElemBlk = ctypes.c_longlong(info[4])
         self.numNodeSets = ctypes.c_longlong(info[5])
         self.numSideSets = ctypes.c_longlong(info[6])
-        EXODUS_LIB.ex_put_init(
+        self.__metadata.clear()
+        self.__lib.ex_put_init(
             self.fileId,
             self.Title,
             self.numDim,
@@ -4948,7 +7299,7 @@ class exodus:
 
     def __ex_put_concat_elem_blk(self, elemBlkIDs, elemType, numElemThisBlk,
                                  numNodesPerElem, numAttr, defineMaps):
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
+        if self.__int64_status() & EX_IDS_INT64_API:
             elem_blk_ids = (ctypes.c_longlong * len(elemBlkIDs))()
             elem_blk_ids[:] = elemBlkIDs
             num_elem_this_blk = (ctypes.c_longlong
@@ -4970,7 +7321,9 @@ class exodus:
         elem_type = (ctypes.c_char_p * len(elemBlkIDs))()
         elem_type[:] = elemType
         define_maps = ctypes.c_int(defineMaps)
-        EXODUS_LIB.ex_put_concat_elem_block(
+        self.__invalidate('block', 'ids', 'truth_table', 'truth_vector', 'adjacency',
+                          'id_index')
+        self.__lib.ex_put_concat_elem_block(
             self.fileId,
             elem_blk_ids,
             elem_type,
@@ -4989,7 +7342,7 @@ class exodus:
                 qa_rec_ptrs[i][j] = ctypes.pointer(
                     ctypes.create_string_buffer(MAX_STR_LENGTH + 1))
         if num_qa_recs.value:
-            EXODUS_LIB.ex_get_qa(self.fileId, ctypes.byref(qa_rec_ptrs))
+            self.__lib.ex_get_qa(self.fileId, ctypes.byref(qa_rec_ptrs))
         qa_recs = []
         for qara in qa_rec_ptrs:
             qa_rec_list = []
@@ -5009,7 +7362,7 @@ class exodus:
             for j in range(4):
                 qa_rec_ptrs[i][j] = ctypes.pointer(ctypes.create_string_buffer(
                     str(qaRecs[i][j]).encode('ascii'), MAX_STR_LENGTH + 1))
-        EXODUS_LIB.ex_put_qa(self.fileId, num_qa_recs, ctypes.byref(qa_rec_ptrs))
+        self.__lib.ex_put_qa(self.fileId, num_qa_recs, ctypes.byref(qa_rec_ptrs))
         return True
 
     # --------------------------------------------------------------------
@@ -5020,7 +7373,7 @@ class exodus:
         for i in range(num_infos.value):
             info_ptrs[i] = ctypes.pointer(ctypes.create_string_buffer(MAX_LINE_LENGTH + 1))
         if num_infos.value:
-            EXODUS_LIB.ex_get_info(self.fileId, ctypes.byref(info_ptrs))
+            self.__lib.ex_get_info(self.fileId, ctypes.byref(info_ptrs))
         info_recs = []
         for irp in info_ptrs:
             info_recs.append(irp.contents.value.decode("utf8"))
@@ -5033,7 +7386,7 @@ class exodus:
         info_ptrs = (ctypes.POINTER(ctypes.c_char * (MAX_LINE_LENGTH + 1)) * num_infos.value)()
         for i in range(num_infos.value):
             info_ptrs[i] = ctypes.pointer(ctypes.create_string_buffer(MAX_LINE_LENGTH + 1))
-        EXODUS_LIB.ex_get_info(self.fileId, ctypes.byref(info_ptrs))
+        self.__lib.ex_get_info(self.fileId, ctypes.byref(info_ptrs))
         info_recs = []
         for irp in info_ptrs:
             info_recs.append(irp.contents.value.decode("utf8"))
@@ -5052,7 +7405,7 @@ class exodus:
         for i in range(num_infos.value):
             info_ptrs[i] = ctypes.pointer(ctypes.create_string_buffer(
                 str(infoRecs[i]).encode('ascii'), MAX_LINE_LENGTH + 1))
-        EXODUS_LIB.ex_put_info(self.fileId, num_infos, ctypes.byref(info_ptrs))
+        self.__lib.ex_put_info(self.fileId, num_infos, ctypes.byref(info_ptrs))
         return True
 
     # --------------------------------------------------------------------
@@ -5060,11 +7413,11 @@ class exodus:
     def __ex_inquire_float(self, inq_id):
         dummy_char = ctypes.create_string_buffer(MAX_LINE_LENGTH + 1)
         ret_float = ctypes.c_float(0.0)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_INQ_INT64_API:
+        if self.__int64_status() & EX_INQ_INT64_API:
             dummy_int = ctypes.c_longlong(0)
         else:
             dummy_int = ctypes.c_int(0)
-        val = EXODUS_LIB.ex_inquire(
+        val = self.__lib.ex_inquire(
             self.fileId,
             inq_id,
             ctypes.byref(dummy_int),
@@ -5081,7 +7434,7 @@ class exodus:
     # --------------------------------------------------------------------
 
     def __ex_inquire_int(self, inq_id):
-        val = EXODUS_LIB.ex_inquire_int(self.fileId, inq_id)
+        val = self.__lib.ex_inquire_int(self.fileId, inq_id)
         if val < 0:
             raise Exception(
                 "ERROR: ex_inquire_int(" +
@@ -5099,7 +7452,7 @@ class exodus:
             coord_name_ptrs[i] = ctypes.pointer(
                 ctypes.create_string_buffer(
                     MAX_NAME_LENGTH + 1))
-        EXODUS_LIB.ex_get_coord_names(self.fileId, ctypes.byref(coord_name_ptrs))
+        self.__lib.ex_get_coord_names(self.fileId, ctypes.byref(coord_name_ptrs))
         coord_names = []
         for cnp in coord_name_ptrs:
             coord_names.append(cnp.contents.value.decode('utf8'))
@@ -5115,20 +7468,20 @@ class exodus:
             coord_name_ptrs[i] = ctypes.pointer(
                 ctypes.create_string_buffer(
                     names[i].encode('ascii'), MAX_NAME_LENGTH + 1))
-        EXODUS_LIB.ex_put_coord_names(self.fileId, ctypes.byref(coord_name_ptrs))
+        self.__lib.ex_put_coord_names(self.fileId, ctypes.byref(coord_name_ptrs))
 
     # --------------------------------------------------------------------
 
     def __ex_get_all_times(self):
         self.times = (ctypes.c_double * self.numTimes.value)()
-        EXODUS_LIB.ex_get_all_times(self.fileId, ctypes.byref(self.times))
+        self.__lib.ex_get_all_times(self.fileId, self.times)
 
     # --------------------------------------------------------------------
 
     def __ex_get_time(self, timeStep):
         time_step = ctypes.c_int(timeStep)
         time_val = ctypes.c_double(0.0)
-        EXODUS_LIB.ex_get_time(self.fileId, time_step, ctypes.byref(time_val))
+        self.__lib.ex_get_time(self.fileId, time_step, ctypes.byref(time_val))
         return time_val.value()
 
     # --------------------------------------------------------------------
@@ -5136,7 +7489,7 @@ class exodus:
     def __ex_put_time(self, timeStep, timeVal):
         time_step = ctypes.c_int(timeStep)
         time_val = ctypes.c_double(timeVal)
-        EXODUS_LIB.ex_put_time(self.fileId, time_step, ctypes.byref(time_val))
+        self.__lib.ex_put_time(self.fileId, time_step, ctypes.byref(time_val))
         return True
 
     # --------------------------------------------------------------------
@@ -5145,7 +7498,7 @@ class exodus:
         obj_type = ctypes.c_int(get_entity_type(objType))
         obj_id = ctypes.c_longlong(objId)
         obj_name = ctypes.create_string_buffer(MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_get_name(self.fileId, obj_type, obj_id, ctypes.byref(obj_name))
+        self.__lib.ex_get_name(self.fileId, obj_type, obj_id, obj_name)
         return obj_name.value.decode('utf8')
 
     # --------------------------------------------------------------------
@@ -5154,7 +7507,7 @@ class exodus:
         obj_type = ctypes.c_int(get_entity_type(objType))
         obj_id = ctypes.c_longlong(objId)
         obj_name = ctypes.create_string_buffer(objName.encode('ascii'), MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_put_name(self.fileId, obj_type, obj_id, obj_name)
+        self.__lib.ex_put_name(self.fileId, obj_type, obj_id, obj_name)
 
     # --------------------------------------------------------------------
 
@@ -5168,7 +7521,7 @@ class exodus:
                     ctypes.create_string_buffer(
                             MAX_NAME_LENGTH + 1))
 
-        EXODUS_LIB.ex_get_names(self.fileId, obj_type, ctypes.byref(obj_name_ptrs))
+        self.__lib.ex_get_names(self.fileId, obj_type, ctypes.byref(obj_name_ptrs))
         obj_names = []
         for onp in obj_name_ptrs:
             obj_names.append(onp.contents.value.decode('utf8'))
@@ -5186,57 +7539,64 @@ class exodus:
             obj_name_ptrs[i] = ctypes.pointer(
                 ctypes.create_string_buffer(
                     objNames[i].encode('ascii'), MAX_NAME_LENGTH + 1))
-        EXODUS_LIB.ex_put_names(self.fileId, obj_type, ctypes.byref(obj_name_ptrs))
+        self.__lib.ex_put_names(self.fileId, obj_type, ctypes.byref(obj_name_ptrs))
 
     # --------------------------------------------------------------------
 
     def __ex_get_ids(self, objType):
+        ids = self.__cached(('ids', objType), self.__read_ids, objType)
+        return type(ids).from_buffer_copy(ids)
+
+    # --------------------------------------------------------------------
+
+    def __read_ids(self, objType):
         inqType = ex_inquiry_map(ex_obj_to_inq(objType))
         numObjs = ctypes.c_int(self.__ex_inquire_int(inqType)).value
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
+        if self.__int64_status() & EX_IDS_INT64_API:
             ids = (ctypes.c_longlong * numObjs)()
         else:
             ids = (ctypes.c_int * numObjs)()
         if numObjs > 0:
             obj_type = ctypes.c_int(get_entity_type(objType))
-            EXODUS_LIB.ex_get_ids(self.fileId, obj_type, ctypes.byref(ids))
+            self.__lib.ex_get_ids(self.fileId, obj_type, ids)
         return ids
 
     # --------------------------------------------------------------------
 
     def __ex_get_assembly(self, assem_struct):
-        EXODUS_LIB.ex_get_assembly(self.fileId, ctypes.byref(assem_struct))
+        self.__lib.ex_get_assembly(self.fileId, ctypes.byref(assem_struct))
         ptr = ctypes.create_string_buffer(MAX_NAME_LENGTH+1)
         assem_struct.name = ctypes.cast(ptr, ctypes.c_char_p)
         eptr = (ctypes.c_longlong * assem_struct.entity_count)()
         assem_struct.entity_list = eptr
-        EXODUS_LIB.ex_get_assembly(self.fileId, ctypes.byref(assem_struct))
+        self.__lib.ex_get_assembly(self.fileId, ctypes.byref(assem_struct))
 
     # --------------------------------------------------------------------
 
     def __ex_get_assemblies(self, assem_list):
-        EXODUS_LIB.ex_get_assemblies(self.fileId, assem_list)
+        self.__lib.ex_get_assemblies(self.fileId, assem_list)
         for assem_struct in assem_list:
             ptr = ctypes.create_string_buffer(MAX_NAME_LENGTH + 1)
             assem_struct.name = ctypes.cast(ptr, ctypes.c_char_p)
             eptr = (ctypes.c_longlong * assem_struct.entity_count)()
             assem_struct.entity_list = eptr
-        EXODUS_LIB.ex_get_assemblies(self.fileId, assem_list)
+        self.__lib.ex_get_assemblies(self.fileId, assem_list)
 
     # --------------------------------------------------------------------
 
     def __ex_get_blob(self, blob_struct):
-        EXODUS_LIB.ex_get_blob(self.fileId, ctypes.byref(blob_struct))
+        self.__lib.ex_get_blob(self.fileId, ctypes.byref(blob_struct))
         ptr = ctypes.create_string_buffer(MAX_NAME_LENGTH+1)
         blob_struct.name = ctypes.cast(ptr, ctypes.c_char_p)
-        EXODUS_LIB.ex_get_blob(self.fileId, ctypes.byref(blob_struct))
+        self.__lib.ex_get_blob(self.fileId, ctypes.byref(blob_struct))
 
 
     # --------------------------------------------------------------------
 
     def __ex_put_assembly(self, assembly):
         assem = setup_ex_assembly(assembly)
-        EXODUS_LIB.ex_put_assembly(self.fileId, assem)
+        self.__invalidate('ids', 'id_index')
+        self.__lib.ex_put_assembly(self.fileId, assem)
 
     # --------------------------------------------------------------------
 
@@ -5247,7 +7607,8 @@ class exodus:
             assembly_list.append(assem)
         assems = (ex_assembly * len(assemblies))(*assembly_list)
 
-        EXODUS_LIB.ex_put_assemblies(self.fileId, len(assembly_list), assems)
+        self.__invalidate('ids', 'id_index')
+        self.__lib.ex_put_assemblies(self.fileId, len(assembly_list), assems)
 
 
     # --------------------------------------------------------------------
@@ -5256,14 +7617,14 @@ class exodus:
         # Get attribute count...
         obj_type = ctypes.c_int(get_entity_type(objType))
         obj_id = ctypes.c_longlong(objId)
-        att_count = EXODUS_LIB.ex_get_attribute_count(self.fileId, obj_type, obj_id)
+        att_count = self.__lib.ex_get_attribute_count(self.fileId, obj_type, obj_id)
 
         attributes = dict()
         if att_count > 0:
             att = (ex_attribute * att_count)()
-            EXODUS_LIB.ex_get_attribute_param(self.fileId, obj_type, obj_id, ctypes.byref(att))
+            self.__lib.ex_get_attribute_param(self.fileId, obj_type, obj_id, ctypes.byref(att))
             for i in range(att_count):
-                EXODUS_LIB.ex_get_attribute(self.fileId, ctypes.byref(att[i]))
+                self.__lib.ex_get_attribute(self.fileId, ctypes.byref(att[i]))
                 tmp_att = attribute(att[i].name.decode('utf8'), ex_obj_to_name(att[i].entity_type), att[i].entity_id)
 
                 if (att[i].type == 2):
@@ -5316,7 +7677,7 @@ class exodus:
             att.values = ctypes.cast(eptr, ctypes.c_void_p)
             att.type = 2
 
-        EXODUS_LIB.ex_put_attribute(self.fileId, att)
+        self.__lib.ex_put_attribute(self.fileId, att)
 
     # --------------------------------------------------------------------
 
@@ -5325,26 +7686,19 @@ class exodus:
         num_node_set_nodes = self.__ex_get_set_param('EX_NODE_SET', nodeSetId)[0]
         if num_node_set_nodes == 0:
             return []
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             set_nodes = (ctypes.c_longlong * num_node_set_nodes)()
         else:
             set_nodes = (ctypes.c_int * num_node_set_nodes)()
-        EXODUS_LIB.ex_get_node_set(self.fileId, node_set_id, ctypes.byref(set_nodes))
+        self.__lib.ex_get_node_set(self.fileId, node_set_id, set_nodes)
         return set_nodes
 
     # --------------------------------------------------------------------
 
     def __ex_put_node_set(self, nodeSetId, nodeSetNodes):
         node_set_id = ctypes.c_longlong(nodeSetId)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
-            node_set_nodes = (ctypes.c_longlong * len(nodeSetNodes))()
-            for i, node_set_node in enumerate(nodeSetNodes):
-                node_set_nodes[i] = ctypes.c_longlong(node_set_node)
-        else:
-            node_set_nodes = (ctypes.c_int * len(nodeSetNodes))()
-            for i, node_set_node in enumerate(nodeSetNodes):
-                node_set_nodes[i] = ctypes.c_int(node_set_node)
-        EXODUS_LIB.ex_put_node_set(self.fileId, node_set_id, node_set_nodes)
+        node_set_nodes = as_ctype_array(nodeSetNodes, self.__bulk_int_type())
+        self.__lib.ex_put_node_set(self.fileId, node_set_id, node_set_nodes)
 
     # --------------------------------------------------------------------
 
@@ -5352,31 +7706,35 @@ class exodus:
         node_set_id = ctypes.c_longlong(nodeSetId)
         num_node_set_nodes = self.__ex_get_set_param('EX_NODE_SET', nodeSetId)[0]
         set_dfs = (ctypes.c_double * num_node_set_nodes)()
-        EXODUS_LIB.ex_get_node_set_dist_fact(
-            self.fileId, node_set_id, ctypes.byref(set_dfs))
+        self.__lib.ex_get_node_set_dist_fact(
+            self.fileId, node_set_id, set_dfs)
         return set_dfs
 
     # --------------------------------------------------------------------
 
     def __ex_put_node_set_dist_fact(self, nodeSetId, nodeSetDistFact):
         node_set_id = ctypes.c_longlong(nodeSetId)
-        node_set_dist_fact = (ctypes.c_double * len(nodeSetDistFact))()
-        for i, dist_fact in enumerate(nodeSetDistFact):
-            node_set_dist_fact[i] = ctypes.c_double(dist_fact)
-        EXODUS_LIB.ex_put_node_set_dist_fact(
+        node_set_dist_fact = as_ctype_array(nodeSetDistFact, ctypes.c_double)
+        self.__lib.ex_put_node_set_dist_fact(
             self.fileId, node_set_id, node_set_dist_fact)
 
     # --------------------------------------------------------------------
 
     def __ex_get_object_truth_vector(self, objType, entId):
+        return list(self.__cached(('truth_vector', objType, entId),
+                                  self.__read_object_truth_vector, objType, entId))
+
+    # --------------------------------------------------------------------
+
+    def __read_object_truth_vector(self, objType, entId):
         obj_type = ctypes.c_int(get_entity_type(objType))
         entity_id = ctypes.c_longlong(entId)
         variable_count = self.__ex_get_variable_param(objType)
         truth_table = (ctypes.c_int * (variable_count.value))()
 
-        EXODUS_LIB.ex_get_object_truth_vector(self.fileId, obj_type,
+        self.__lib.ex_get_object_truth_vector(self.fileId, obj_type,
                                               entity_id, variable_count,
-                                              ctypes.byref(truth_table))
+                                              truth_table)
         truthTab = []
         for val in truth_table:
             if val:
@@ -5388,6 +7746,12 @@ class exodus:
     # --------------------------------------------------------------------
 
     def __ex_get_truth_table(self, objType):
+        return list(self.__cached(('truth_table', objType),
+                                  self.__read_truth_table, objType))
+
+    # --------------------------------------------------------------------
+
+    def __read_truth_table(self, objType):
         inqType = ex_inquiry_map(ex_obj_to_inq(objType))
         num_objs = ctypes.c_int(self.__ex_inquire_int(inqType)).value
 
@@ -5395,9 +7759,9 @@ class exodus:
         variable_count = self.__ex_get_variable_param(objType)
 
         truth_table = (ctypes.c_int * (num_objs * variable_count.value))()
-        EXODUS_LIB.ex_get_truth_table(self.fileId, obj_type,
+        self.__lib.ex_get_truth_table(self.fileId, obj_type,
                                       num_objs, variable_count,
-                                      ctypes.byref(truth_table))
+                                      truth_table)
         truthTab = []
         for val in truth_table:
             if val:
@@ -5424,37 +7788,40 @@ class exodus:
             else:
                 truth_tab[i] = ctypes.c_int(0)
 
-        EXODUS_LIB.ex_put_truth_table(
+        self.__invalidate('truth_table', 'truth_vector')
+        self.__lib.ex_put_truth_table(
             self.fileId, obj_type, num_objs, num_vars, truth_tab)
         return True
 
     # --------------------------------------------------------------------
 
-    def __ex_get_coord(self):
-        self.coordsX = (ctypes.c_double * self.numNodes.value)()
-        self.coordsY = (ctypes.c_double * self.numNodes.value)()
-        self.coordsZ = (ctypes.c_double * self.numNodes.value)()
-        EXODUS_LIB.ex_get_coord(
-            self.fileId,
-            ctypes.byref(self.coordsX),
-            ctypes.byref(self.coordsY),
-            ctypes.byref(self.coordsZ))
+    def __ex_get_coord(self, out=None):
+        if out is None:
+            self.coordsX = (ctypes.c_double * self.numNodes.value)()
+            self.coordsY = (ctypes.c_double * self.numNodes.value)()
+            self.coordsZ = (ctypes.c_double * self.numNodes.value)()
+            coords = (self.coordsX, self.coordsY, self.coordsZ)
+        else:
+            # the caller's buffers are not kept on the object
+            if len(out) != 3:
+                raise Exception("ERROR: 'out' must hold one buffer per coordinate direction")
+            coords = tuple(_out_ctype_array(buf, ctypes.c_double, self.numNodes.value)
+                           for buf in out)
+        self.__lib.ex_get_coord(self.fileId, *coords)
 
     # --------------------------------------------------------------------
 
     def __ex_put_coord(self, xCoords, yCoords, zCoords):
-        self.coordsX = (ctypes.c_double * self.numNodes.value)()
-        self.coordsY = (ctypes.c_double * self.numNodes.value)()
-        self.coordsZ = (ctypes.c_double * self.numNodes.value)()
-        for i in range(self.numNodes.value):
-            self.coordsX[i] = float(xCoords[i])
-            self.coordsY[i] = float(yCoords[i])
-            self.coordsZ[i] = float(zCoords[i])
-        EXODUS_LIB.ex_put_coord(
+        if self.__arrays is not None:
+            self.__arrays.invalidate('coords')
+        self.coordsX = as_ctype_array(xCoords, ctypes.c_double, self.numNodes.value)
+        self.coordsY = as_ctype_array(yCoords, ctypes.c_double, self.numNodes.value)
+        self.coordsZ = as_ctype_array(zCoords, ctypes.c_double, self.numNodes.value)
+        self.__lib.ex_put_coord(
             self.fileId,
-            ctypes.byref(self.coordsX),
-            ctypes.byref(self.coordsY),
-            ctypes.byref(self.coordsZ))
+            self.coordsX,
+            self.coordsY,
+            self.coordsZ)
 
     # --------------------------------------------------------------------
 
@@ -5464,34 +7831,37 @@ class exodus:
         coordsX = (ctypes.c_double * numNodes)()
         coordsY = (ctypes.c_double * numNodes)()
         coordsZ = (ctypes.c_double * numNodes)()
-        EXODUS_LIB.ex_get_partial_coord(
+        self.__lib.ex_get_partial_coord(
             self.fileId,
             start_node_num,
             num_nodes,
-            ctypes.byref(coordsX),
-            ctypes.byref(coordsY),
-            ctypes.byref(coordsZ))
+            coordsX,
+            coordsY,
+            coordsZ)
         return list(coordsX), list(coordsY), list(coordsZ)
 
     # --------------------------------------------------------------------
 
     def __ex_get_id_map(self, objType):
+        idMap = list(self.__cached(('id_map', objType), self.__read_id_map, objType))
+        if self.use_numpy:
+            idMap = self.np.array(idMap)
+        return idMap
+
+    # --------------------------------------------------------------------
+
+    def __read_id_map(self, objType):
         inqType = ex_obj_to_inq(objType)
         obj_type = ctypes.c_int(get_entity_type(objType))
         inq_type = ctypes.c_int(ex_inquiry_map(inqType))
         num_objs = ctypes.c_int(self.__ex_inquire_int(inq_type))
         numObjs = num_objs.value
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
+        if self.__int64_status() & EX_MAPS_INT64_API:
             id_map = (ctypes.c_longlong * numObjs)()
         else:
             id_map = (ctypes.c_int * numObjs)()
-        EXODUS_LIB.ex_get_id_map(self.fileId, obj_type, ctypes.byref(id_map))
-        idMap = []
-        for i in range(numObjs):
-            idMap.append(id_map[i])
-        if self.use_numpy:
-            idMap = self.np.array(idMap)
-        return idMap
+        self.__lib.ex_get_id_map(self.fileId, obj_type, id_map)
+        return id_map[:]
 
     # --------------------------------------------------------------------
 
@@ -5499,11 +7869,11 @@ class exodus:
         obj_type = ctypes.c_int(get_entity_type(obj_type))
         entity_id = ctypes.c_longlong(id)
         _, numObjs,_,_ = self.__ex_get_block('EX_ELEM_BLOCK', id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
+        if self.__int64_status() & EX_MAPS_INT64_API:
             id_map = (ctypes.c_longlong * numObjs.value)()
         else:
             id_map = (ctypes.c_int * numObjs.value)()
-        EXODUS_LIB.ex_get_block_id_map(self.fileId, obj_type, entity_id, id_map)
+        self.__lib.ex_get_block_id_map(self.fileId, obj_type, entity_id, id_map)
         if self.use_numpy:
             id_map = ctype_to_numpy(self, id_map)
         return id_map
@@ -5517,54 +7887,60 @@ class exodus:
         num_objs = ctypes.c_int(self.__ex_inquire_int(inq_type))
         numObjs = num_objs.value
         assert numObjs == len(idMap)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
-            id_map = (ctypes.c_longlong * numObjs)()
-            for i in range(numObjs):
-                id_map[i] = ctypes.c_longlong(idMap[i])
+        if self.__int64_status() & EX_MAPS_INT64_API:
+            id_map = as_ctype_array(idMap, ctypes.c_longlong, numObjs)
         else:
-            id_map = (ctypes.c_int * numObjs)()
-            for i in range(numObjs):
-                id_map[i] = ctypes.c_int(idMap[i])
-        EXODUS_LIB.ex_put_id_map(self.fileId, obj_type, ctypes.byref(id_map))
+            id_map = as_ctype_array(idMap, ctypes.c_int, numObjs)
+        self.__invalidate('id_map', 'id_index')
+        self.__lib.ex_put_id_map(self.fileId, obj_type, id_map)
         return True
 
     # --------------------------------------------------------------------
 
     def __ex_get_elem_num_map(self):
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_MAPS_INT64_API:
+        if self.__int64_status() & EX_MAPS_INT64_API:
             elemNumMap = (ctypes.c_longlong * self.numElem.value)()
         else:
             elemNumMap = (ctypes.c_int * self.numElem.value)()
-        EXODUS_LIB.ex_get_elem_num_map(self.fileId, ctypes.byref(elemNumMap))
+        self.__lib.ex_get_elem_num_map(self.fileId, elemNumMap)
         return elemNumMap
 
     # --------------------------------------------------------------------
 
     def __ex_get_node_num_map(self):
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_MAPS_INT64_API:
+        if self.__int64_status() & EX_MAPS_INT64_API:
             nodeNumMap = (ctypes.c_longlong * self.numNodes.value)()
         else:
             nodeNumMap = (ctypes.c_int * self.numNodes.value)()
-        EXODUS_LIB.ex_get_node_num_map(self.fileId, ctypes.byref(nodeNumMap))
+        self.__lib.ex_get_node_num_map(self.fileId, nodeNumMap)
         return nodeNumMap
 
     # --------------------------------------------------------------------
 
     def __ex_get_elem_order_map(self):
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_MAPS_INT64_API:
+        if self.__int64_status() & EX_MAPS_INT64_API:
             elemOrderMap = (ctypes.c_longlong * self.numElem.value)()
         else:
             elemOrderMap = (ctypes.c_int * self.numElem.value)()
-        EXODUS_LIB.ex_get_map(self.fileId, ctypes.byref(elemOrderMap))
+        self.__lib.ex_get_map(self.fileId, elemOrderMap)
         return elemOrderMap
 
     # --------------------------------------------------------------------
 
     def __ex_get_block(self, object_type, object_id):
+        (blkType, numElem, nodesPerElem, numAttr) = self.__cached(
+            ('block', object_type, object_id), self.__read_block, object_type, object_id)
+        int_type = self.__bulk_int_type()
+        return (ctypes.create_string_buffer(blkType, MAX_STR_LENGTH + 1),
+                int_type(numElem), int_type(nodesPerElem), int_type(numAttr))
+
+    # --------------------------------------------------------------------
+
+    def __read_block(self, object_type, object_id):
         obj_type = ctypes.c_int(get_entity_type(object_type))
         block_id = ctypes.c_longlong(object_id)
         blk_type = ctypes.create_string_buffer(MAX_STR_LENGTH + 1)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             num_elem_this_blk = ctypes.c_longlong(0)
             num_nodes_per_elem = ctypes.c_longlong(0)
             num_edges_per_elem = ctypes.c_longlong(0)
@@ -5576,7 +7952,7 @@ class exodus:
             num_edges_per_elem = ctypes.c_int(0)
             num_faces_per_elem = ctypes.c_int(0)
             num_attr = ctypes.c_int(0)
-        EXODUS_LIB.ex_get_block(
+        self.__lib.ex_get_block(
             self.fileId,
             obj_type,
             block_id,
@@ -5586,7 +7962,8 @@ class exodus:
             ctypes.byref(num_edges_per_elem),
             ctypes.byref(num_faces_per_elem),
             ctypes.byref(num_attr))
-        return blk_type, num_elem_this_blk, num_nodes_per_elem, num_attr
+        return (blk_type.value, num_elem_this_blk.value, num_nodes_per_elem.value,
+                num_attr.value)
 
     # --------------------------------------------------------------------
 
@@ -5608,7 +7985,9 @@ class exodus:
         num_edges_per_elem = ctypes.c_longlong(0)
         num_faces_per_elem = ctypes.c_longlong(0)
         num_attr = ctypes.c_longlong(numAttrsPerElem)
-        EXODUS_LIB.ex_put_block(self.fileId, obj_type, block_id, elem_type,
+        self.__invalidate('block', 'ids', 'truth_table', 'truth_vector', 'adjacency',
+                          'id_index')
+        self.__lib.ex_put_block(self.fileId, obj_type, block_id, elem_type,
                                 num_elem_this_blk, num_nodes_per_elem,
                                 num_edges_per_elem, num_faces_per_elem, num_attr)
 
@@ -5618,35 +7997,31 @@ class exodus:
         (_elem_type, num_elem_this_blk, num_nodes_per_elem,
          _num_attr) = self.__ex_get_block('EX_ELEM_BLOCK', object_id)
         elem_block_id = ctypes.c_longlong(object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             elem_block_connectivity = (
                 ctypes.c_longlong * (num_elem_this_blk.value * num_nodes_per_elem.value))()
         else:
             elem_block_connectivity = (
                 ctypes.c_int * (num_elem_this_blk.value * num_nodes_per_elem.value))()
-        EXODUS_LIB.ex_get_elem_conn(
+        self.__lib.ex_get_elem_conn(
             self.fileId,
             elem_block_id,
-            ctypes.byref(elem_block_connectivity))
+            elem_block_connectivity)
         return elem_block_connectivity, num_elem_this_blk, num_nodes_per_elem
 
     # --------------------------------------------------------------------
 
     def __ex_put_elem_conn(self, object_id, connectivity):
+        if self.__arrays is not None:
+            self.__arrays.invalidate(key=('connect', object_id))
+        self.__invalidate('adjacency')
         (_elem_type, num_elem_this_blk, num_nodes_per_elem,
          _num_attr) = self.__ex_get_block('EX_ELEM_BLOCK', object_id)
         elem_block_id = ctypes.c_longlong(object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
-            elem_block_connectivity = (
-                ctypes.c_longlong * (num_elem_this_blk.value * num_nodes_per_elem.value))()
-            for i in range(num_elem_this_blk.value * num_nodes_per_elem.value):
-                elem_block_connectivity[i] = ctypes.c_longlong(connectivity[i])
-        else:
-            elem_block_connectivity = (
-                ctypes.c_int * (num_elem_this_blk.value * num_nodes_per_elem.value))()
-            for i in range(num_elem_this_blk.value * num_nodes_per_elem.value):
-                elem_block_connectivity[i] = ctypes.c_int(connectivity[i])
-        EXODUS_LIB.ex_put_elem_conn(
+        elem_block_connectivity = as_ctype_array(
+            connectivity, self.__bulk_int_type(),
+            num_elem_this_blk.value * num_nodes_per_elem.value)
+        self.__lib.ex_put_elem_conn(
             self.fileId,
             elem_block_id,
             elem_block_connectivity)
@@ -5657,10 +8032,8 @@ class exodus:
         elem_blk_id = ctypes.c_longlong(elemBlkID)
         obj_type = ctypes.c_int(objType)
         attr_index = ctypes.c_longlong(attrIndx)
-        attrib = (ctypes.c_double * len(Attr))()
-        for i, attr in enumerate(Attr):
-            attrib[i] = float(attr)
-        EXODUS_LIB.ex_put_one_attr(
+        attrib = as_ctype_array(Attr, ctypes.c_double)
+        self.__lib.ex_put_one_attr(
             self.fileId,
             obj_type,
             elem_blk_id,
@@ -5676,22 +8049,20 @@ class exodus:
         inqType = ex_inquiry_map(ex_obj_to_inq(objType))
         num_objs = ctypes.c_int(self.__ex_inquire_int(inqType)).value
         attrib = (ctypes.c_double * num_objs)()
-        EXODUS_LIB.ex_get_one_attr(
+        self.__lib.ex_get_one_attr(
             self.fileId,
             obj_type,
             elem_blk_id,
             attr_index,
-            ctypes.byref(attrib))
+            attrib)
         return attrib
 
     # --------------------------------------------------------------------
 
     def __ex_put_elem_attr(self, elemBlkID, Attr):
         elem_blk_id = ctypes.c_longlong(elemBlkID)
-        attrib = (ctypes.c_double * len(Attr))()
-        for i, attr in enumerate(Attr):
-            attrib[i] = ctypes.c_double(attr)
-        EXODUS_LIB.ex_put_attr(
+        attrib = as_ctype_array(Attr, ctypes.c_double)
+        self.__lib.ex_put_attr(
             self.fileId,
             ctypes.c_int(get_entity_type('EX_ELEM_BLOCK')),
             elem_blk_id,
@@ -5705,25 +8076,37 @@ class exodus:
         numElemsThisBlk = self.num_elems_in_blk(elemBlkID)
         totalAttr = numAttrThisBlk * numElemsThisBlk
         attrib = (ctypes.c_double * totalAttr)()
-        EXODUS_LIB.ex_get_attr(
+        self.__lib.ex_get_attr(
             self.fileId,
             ctypes.c_int(get_entity_type('EX_ELEM_BLOCK')),
             elem_blk_id,
-            ctypes.byref(attrib))
+            attrib)
         return attrib
 
     # --------------------------------------------------------------------
 
     def __ex_get_variable_param(self, varType):
+        return ctypes.c_int(self.__cached(('var_param', varType),
+                                          self.__read_variable_param, varType))
+
+    # --------------------------------------------------------------------
+
+    def __read_variable_param(self, varType):
         var_type = ctypes.c_int(get_entity_type(varType))
         num_vars = ctypes.c_int()
-        EXODUS_LIB.ex_get_variable_param(
+        self.__lib.ex_get_variable_param(
             self.fileId, var_type, ctypes.byref(num_vars))
-        return num_vars
+        return num_vars.value
 
     # --------------------------------------------------------------------
 
     def __ex_get_variable_names(self, varType):
+        return list(self.__cached(('var_names', varType),
+                                  self.__read_variable_names, varType))
+
+    # --------------------------------------------------------------------
+
+    def __read_variable_names(self, varType):
         num_vars = self.__ex_get_variable_param(varType)
         var_name_ptrs = (
             ctypes.POINTER(ctypes.c_char * (MAX_NAME_LENGTH + 1)) * num_vars.value)()
@@ -5734,7 +8117,7 @@ class exodus:
                     MAX_NAME_LENGTH + 1))
 
         var_type = ctypes.c_int(get_entity_type(varType))
-        EXODUS_LIB.ex_get_variable_names(
+        self.__lib.ex_get_variable_names(
             self.fileId,
             var_type,
             num_vars,
@@ -5746,14 +8129,17 @@ class exodus:
 
     # --------------------------------------------------------------------
 
-    def __ex_get_var(self, timeStep, varType, varId, blkId, numValues):
+    def __ex_get_var(self, timeStep, varType, varId, blkId, numValues, out=None):
         step = ctypes.c_int(timeStep)
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         block_id = ctypes.c_longlong(blkId)
         num_values = ctypes.c_longlong(numValues)
-        var_vals = (ctypes.c_double * num_values.value)()
-        EXODUS_LIB.ex_get_var(
+        if out is None:
+            var_vals = (ctypes.c_double * num_values.value)()
+        else:
+            var_vals = _out_ctype_array(out, ctypes.c_double, num_values.value)
+        self.__lib.ex_get_var(
             self.fileId,
             step,
             var_type,
@@ -5765,15 +8151,61 @@ class exodus:
 
     # --------------------------------------------------------------------
 
-    def __ex_get_partial_var(self, timeStep, varType, varId, blkId, startIndex, numValues):
+    def __ex_get_var_time(self, varType, varId, entryNum, begStep, endStep, out=None):
+        var_type = ctypes.c_int(get_entity_type(varType))
+        var_id = ctypes.c_int(varId)
+        entry_num = ctypes.c_longlong(entryNum)
+        beg_step = ctypes.c_int(begStep)
+        end_step = ctypes.c_int(endStep)
+        num_steps = max(endStep - begStep + 1, 0)
+        if out is None:
+            var_vals = (ctypes.c_double * num_steps)()
+        else:
+            var_vals = _out_ctype_array(out, ctypes.c_double, num_steps)
+        if num_steps == 0:
+            return var_vals
+        errorInt = self.__lib.ex_get_var_time(
+            self.fileId,
+            var_type,
+            var_id,
+            entry_num,
+            beg_step,
+            end_step,
+            var_vals)
+        if errorInt < 0:
+            raise Exception("ERROR: ex_get_var_time failed for {} variable {}."
+                            .format(varType, varId))
+        return var_vals
+
+    # --------------------------------------------------------------------
+
+    def __entry_offset(self, objType, entityId):
+        offset = 0
+        for object_id in self.__ex_get_ids(objType):
+            if objType in ('EX_EDGE_BLOCK', 'EX_FACE_BLOCK', 'EX_ELEM_BLOCK'):
+                numEntries = self.__ex_get_block(objType, object_id)[1].value
+            else:
+                numEntries = self.__ex_get_set_param(objType, object_id)[0]
+            if object_id == entityId:
+                return offset, numEntries
+            offset += numEntries
+        raise Exception("ERROR: {} with id {} not found.".format(objType, entityId))
+
+    # --------------------------------------------------------------------
+
+    def __ex_get_partial_var(self, timeStep, varType, varId, blkId, startIndex, numValues,
+                             out=None):
         step = ctypes.c_int(timeStep)
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         block_id = ctypes.c_longlong(blkId)
         start_index = ctypes.c_longlong(startIndex)
         num_values = ctypes.c_longlong(numValues)
-        var_vals = (ctypes.c_double * num_values.value)()
-        EXODUS_LIB.ex_get_var(
+        if out is None:
+            var_vals = (ctypes.c_double * num_values.value)()
+        else:
+            var_vals = _out_ctype_array(out, ctypes.c_double, num_values.value)
+        self.__lib.ex_get_partial_var(
             self.fileId,
             step,
             var_type,
@@ -5787,15 +8219,17 @@ class exodus:
     # --------------------------------------------------------------------
 
     def __ex_put_var(self, timeStep, varType, varId, blkId, numValues, values):
+        self.__time_window = None
+        if self.__arrays is not None:
+            self.__arrays.invalidate(key=('var', varType, 0 if varType == 'EX_NODAL' else blkId,
+                                          varId, timeStep))
         step = ctypes.c_int(timeStep)
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         block_id = ctypes.c_longlong(blkId)
         num_values = ctypes.c_longlong(numValues)
-        var_vals = (ctypes.c_double * num_values.value)()
-        for i in range(num_values.value):
-            var_vals[i] = float(values[i])
-        EXODUS_LIB.ex_put_var(
+        var_vals = as_ctype_array(values, ctypes.c_double, num_values.value)
+        self.__lib.ex_put_var(
             self.fileId,
             step,
             var_type,
@@ -5807,6 +8241,22 @@ class exodus:
 
     # --------------------------------------------------------------------
 
+    def __ex_put_partial_var(self, timeStep, varType, varId, blkId, startIndex, numValues,
+                             values):
+        self.__time_window = None
+        if self.__arrays is not None:
+            self.__arrays.invalidate(key=('var', varType, 0 if varType == 'EX_NODAL' else blkId,
+                                          varId, timeStep))
+        var_vals = as_ctype_array(values, ctypes.c_double, numValues)
+        errorInt = self.__lib.ex_put_partial_var(self.fileId, timeStep, get_entity_type(varType),
+                                                 varId, blkId, startIndex, numValues, var_vals)
+        if errorInt != 0:
+            raise Exception("ERROR: ex_put_partial_var had problems writing {} values of {}"
+                            " starting at {}.".format(numValues, varType, startIndex))
+        return True
+
+    # --------------------------------------------------------------------
+
     def __ex_put_reduction_variable_param(self, varType, numVars):
         num_vars = ctypes.c_int(numVars)
         current_num = self.__ex_get_reduction_variable_param(varType)
@@ -5815,7 +8265,7 @@ class exodus:
             return True
 
         var_type = ctypes.c_int(get_entity_type(varType))
-        errorInt = EXODUS_LIB.ex_put_reduction_variable_param(
+        errorInt = self.__lib.ex_put_reduction_variable_param(
             self.fileId, var_type, num_vars)
         if errorInt != 0:
             print(("ERROR code =", errorInt))
@@ -5829,7 +8279,7 @@ class exodus:
     def __ex_get_reduction_variable_param(self, varType):
         var_type = ctypes.c_int(get_entity_type(varType))
         num_vars = ctypes.c_int()
-        EXODUS_LIB.ex_get_reduction_variable_param(
+        self.__lib.ex_get_reduction_variable_param(
             self.fileId, var_type, ctypes.byref(num_vars))
         return num_vars
 
@@ -5839,7 +8289,7 @@ class exodus:
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         name = ctypes.create_string_buffer(MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_get_reduction_variable_name(self.fileId, var_type, var_id, name)
+        self.__lib.ex_get_reduction_variable_name(self.fileId, var_type, var_id, name)
         return name.value.decode("utf8")
 
     # --------------------------------------------------------------------
@@ -5848,7 +8298,21 @@ class exodus:
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         name = ctypes.create_string_buffer(varName.encode('ascii'), MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_put_reduction_variable_name(self.fileId, var_type, var_id, name)
+        self.__lib.ex_put_reduction_variable_name(self.fileId, var_type, var_id, name)
+        return True
+
+    # --------------------------------------------------------------------
+
+    def __ex_put_reduction_variable_names(self, varType, varNames):
+        var_type = ctypes.c_int(get_entity_type(varType))
+        num_vars = ctypes.c_int(len(varNames))
+        var_name_ptrs = (ctypes.POINTER(ctypes.c_char * (MAX_NAME_LENGTH + 1)) * len(varNames))()
+        for i, varName in enumerate(varNames):
+            var_name_ptrs[i] = ctypes.pointer(
+                ctypes.create_string_buffer(
+                    varName.encode('ascii'), MAX_NAME_LENGTH + 1))
+        self.__lib.ex_put_reduction_variable_names(self.fileId, var_type, num_vars,
+                                                   ctypes.byref(var_name_ptrs))
         return True
 
     # --------------------------------------------------------------------
@@ -5864,7 +8328,7 @@ class exodus:
                     MAX_NAME_LENGTH + 1))
 
         var_type = ctypes.c_int(get_entity_type(varType))
-        EXODUS_LIB.ex_get_reduction_variable_names(
+        self.__lib.ex_get_reduction_variable_names(
             self.fileId,
             var_type,
             num_vars,
@@ -5882,7 +8346,7 @@ class exodus:
         block_id = ctypes.c_longlong(blkId)
         num_values = ctypes.c_longlong(numValues)
         var_vals = (ctypes.c_double * num_values.value)()
-        EXODUS_LIB.ex_get_reduction_vars(
+        self.__lib.ex_get_reduction_vars(
             self.fileId,
             step,
             var_type,
@@ -5898,10 +8362,8 @@ class exodus:
         var_type = ctypes.c_int(get_entity_type(varType))
         block_id = ctypes.c_longlong(blkId)
         num_values = ctypes.c_longlong(numValues)
-        var_vals = (ctypes.c_double * num_values.value)()
-        for i in range(num_values.value):
-            var_vals[i] = float(values[i])
-        EXODUS_LIB.ex_put_reduction_vars(
+        var_vals = as_ctype_array(values, ctypes.c_double, num_values.value)
+        self.__lib.ex_put_reduction_vars(
             self.fileId,
             step,
             var_type,
@@ -5914,26 +8376,32 @@ class exodus:
 
     def __ex_get_side_set_node_list_len(self, object_id):
         side_set_id = ctypes.c_longlong(object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             side_set_node_list_len = ctypes.c_longlong(0)
         else:
             side_set_node_list_len = ctypes.c_int(0)
-        EXODUS_LIB.ex_get_side_set_node_list_len(
+        self.__lib.ex_get_side_set_node_list_len(
             self.fileId, side_set_id, ctypes.byref(side_set_node_list_len))
         return side_set_node_list_len
 
     # --------------------------------------------------------------------
 
     def __ex_get_set_param(self, objType, object_id):
+        return self.__cached(('set_param', objType, object_id),
+                             self.__read_set_param, objType, object_id)
+
+    # --------------------------------------------------------------------
+
+    def __read_set_param(self, objType, object_id):
         object_type = ctypes.c_int(get_entity_type(objType))
         side_set_id = ctypes.c_longlong(object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             num_side_in_set = ctypes.c_longlong(0)
             num_dist_fact_in_set = ctypes.c_longlong(0)
         else:
             num_side_in_set = ctypes.c_int(0)
             num_dist_fact_in_set = ctypes.c_int(0)
-        EXODUS_LIB.ex_get_set_param(
+        self.__lib.ex_get_set_param(
             self.fileId,
             object_type,
             side_set_id,
@@ -5948,7 +8416,8 @@ class exodus:
         side_set_id = ctypes.c_longlong(object_id)
         num_side_in_set = ctypes.c_longlong(numSides)
         num_dist_fact_in_set = ctypes.c_longlong(numDistFacts)
-        EXODUS_LIB.ex_put_set_param(
+        self.__invalidate('set_param', 'ids', 'truth_table', 'truth_vector', 'id_index')
+        self.__lib.ex_put_set_param(
             self.fileId,
             object_type,
             side_set_id,
@@ -5963,34 +8432,25 @@ class exodus:
         (num_side_in_set, _num_dist_fact_in_set) = self.__ex_get_set_param('EX_SIDE_SET', sideSetId)
         if num_side_in_set == 0:
             return [], []
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             side_set_elem_list = (ctypes.c_longlong * num_side_in_set)()
             side_set_side_list = (ctypes.c_longlong * num_side_in_set)()
         else:
             side_set_elem_list = (ctypes.c_int * num_side_in_set)()
             side_set_side_list = (ctypes.c_int * num_side_in_set)()
-        EXODUS_LIB.ex_get_side_set(self.fileId, side_set_id,
-                                   ctypes.byref(side_set_elem_list),
-                                   ctypes.byref(side_set_side_list))
+        self.__lib.ex_get_side_set(self.fileId, side_set_id,
+                                   side_set_elem_list,
+                                   side_set_side_list)
         return side_set_elem_list, side_set_side_list
 
     # --------------------------------------------------------------------
 
     def __ex_put_side_set(self, object_id, sideSetElements, sideSetSides):
         side_set_id = ctypes.c_longlong(object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
-            side_set_elem_list = (ctypes.c_longlong * len(sideSetElements))()
-            side_set_side_list = (ctypes.c_longlong * len(sideSetSides))()
-            for i, sse in enumerate(sideSetElements):
-                side_set_elem_list[i] = ctypes.c_longlong(sse)
-                side_set_side_list[i] = ctypes.c_longlong(sideSetSides[i])
-        else:
-            side_set_elem_list = (ctypes.c_int * len(sideSetElements))()
-            side_set_side_list = (ctypes.c_int * len(sideSetSides))()
-            for i, sse in enumerate(sideSetElements):
-                side_set_elem_list[i] = ctypes.c_int(sse)
-                side_set_side_list[i] = ctypes.c_int(sideSetSides[i])
-        EXODUS_LIB.ex_put_side_set(
+        int_type = self.__bulk_int_type()
+        side_set_elem_list = as_ctype_array(sideSetElements, int_type)
+        side_set_side_list = as_ctype_array(sideSetSides, int_type)
+        self.__lib.ex_put_side_set(
             self.fileId,
             side_set_id,
             side_set_elem_list,
@@ -6004,18 +8464,16 @@ class exodus:
         side_set_node_list_len = self.__ex_get_side_set_node_list_len(
             sideSetId)
         set_dfs = (ctypes.c_double * side_set_node_list_len.value)()
-        EXODUS_LIB.ex_get_side_set_dist_fact(
-            self.fileId, side_set_id, ctypes.byref(set_dfs))
+        self.__lib.ex_get_side_set_dist_fact(
+            self.fileId, side_set_id, set_dfs)
         return set_dfs
 
     # --------------------------------------------------------------------
 
     def __ex_put_side_set_dist_fact(self, sideSetId, sideSetDistFact):
         side_set_id = ctypes.c_longlong(sideSetId)
-        side_set_dist_fact = (ctypes.c_double * len(sideSetDistFact))()
-        for i, df in enumerate(sideSetDistFact):
-            side_set_dist_fact[i] = ctypes.c_double(df)
-        EXODUS_LIB.ex_put_side_set_dist_fact(
+        side_set_dist_fact = as_ctype_array(sideSetDistFact, ctypes.c_double)
+        self.__lib.ex_put_side_set_dist_fact(
             self.fileId, side_set_id, side_set_dist_fact)
 
     # --------------------------------------------------------------------
@@ -6024,15 +8482,15 @@ class exodus:
         side_set_id = ctypes.c_longlong(object_id)
         side_set_node_list_len = self.__ex_get_side_set_node_list_len(object_id)
         (num_side_in_set, _num_dist_fact_in_set) = self.__ex_get_set_param('EX_SIDE_SET', object_id)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_BULK_INT64_API:
+        if self.__int64_status() & EX_BULK_INT64_API:
             side_set_node_cnt_list = (ctypes.c_longlong * num_side_in_set)()
             side_set_node_list = (ctypes.c_longlong * side_set_node_list_len.value)()
         else:
             side_set_node_cnt_list = (ctypes.c_int * num_side_in_set)()
             side_set_node_list = (ctypes.c_int * side_set_node_list_len.value)()
-        EXODUS_LIB.ex_get_side_set_node_list(self.fileId, side_set_id,
-                                             ctypes.byref(side_set_node_cnt_list),
-                                             ctypes.byref(side_set_node_list))
+        self.__lib.ex_get_side_set_node_list(self.fileId, side_set_id,
+                                             side_set_node_cnt_list,
+                                             side_set_node_list)
         return side_set_node_cnt_list, side_set_node_list
 
     # --------------------------------------------------------------------
@@ -6045,7 +8503,8 @@ class exodus:
             return True
 
         var_type = ctypes.c_int(get_entity_type(varType))
-        errorInt = EXODUS_LIB.ex_put_variable_param(
+        self.__invalidate('var_param', 'var_names', 'var_ids', 'truth_table', 'truth_vector')
+        errorInt = self.__lib.ex_put_variable_param(
             self.fileId, var_type, num_vars)
         if errorInt != 0:
             print(("ERROR code =", errorInt))
@@ -6060,7 +8519,7 @@ class exodus:
         var_type = ctypes.c_int(varType)
         var_id = ctypes.c_int(varId)
         name = ctypes.create_string_buffer(MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_get_variable_name(self.fileId, var_type, var_id, name)
+        self.__lib.ex_get_variable_name(self.fileId, var_type, var_id, name)
         return name.decode('utf8')
 
     # --------------------------------------------------------------------
@@ -6069,7 +8528,35 @@ class exodus:
         var_type = ctypes.c_int(get_entity_type(varType))
         var_id = ctypes.c_int(varId)
         name = ctypes.create_string_buffer(varName.encode('ascii'), MAX_NAME_LENGTH + 1)
-        EXODUS_LIB.ex_put_variable_name(self.fileId, var_type, var_id, name)
+        self.__invalidate('var_names', 'var_ids')
+        self.__lib.ex_put_variable_name(self.fileId, var_type, var_id, name)
+        return True
+
+    # --------------------------------------------------------------------
+
+    def __ex_put_all_var_param_ext(self, params):
+        self.__invalidate('var_param', 'var_names', 'var_ids', 'truth_table', 'truth_vector')
+        errorInt = self.__lib.ex_put_all_var_param_ext(self.fileId, ctypes.byref(params))
+        if errorInt != 0:
+            print(("ERROR code =", errorInt))
+            raise Exception(
+                "ERROR: ex_put_all_var_param_ext had problems."
+                " Variables can only be defined once per varType.")
+        return True
+
+    # --------------------------------------------------------------------
+
+    def __ex_put_variable_names(self, varType, varNames):
+        var_type = ctypes.c_int(get_entity_type(varType))
+        num_vars = ctypes.c_int(len(varNames))
+        var_name_ptrs = (ctypes.POINTER(ctypes.c_char * (MAX_NAME_LENGTH + 1)) * len(varNames))()
+        for i, varName in enumerate(varNames):
+            var_name_ptrs[i] = ctypes.pointer(
+                ctypes.create_string_buffer(
+                    varName.encode('ascii'), MAX_NAME_LENGTH + 1))
+        self.__invalidate('var_names', 'var_ids')
+        self.__lib.ex_put_variable_names(self.fileId, var_type, num_vars,
+                                         ctypes.byref(var_name_ptrs))
         return True
 
     # --------------------------------------------------------------------
@@ -6081,7 +8568,7 @@ class exodus:
         attr_name_ptrs = (ctypes.POINTER(ctypes.c_char * (len_name + 1)) * num_attr.value)()
         for i in range(num_attr.value):
             attr_name_ptrs[i] = ctypes.pointer(ctypes.create_string_buffer(len_name + 1))
-        EXODUS_LIB.ex_get_elem_attr_names(
+        self.__lib.ex_get_elem_attr_names(
             self.fileId, object_id, ctypes.byref(attr_name_ptrs))
         attr_names = []
         for cnp in attr_name_ptrs:
@@ -6100,7 +8587,7 @@ class exodus:
             attr_name_ptrs[i] = ctypes.pointer(
                 ctypes.create_string_buffer(
                     varNames[i].encode('ascii'), len_name + 1))
-        EXODUS_LIB.ex_put_elem_attr_names(
+        self.__lib.ex_put_elem_attr_names(
             self.fileId, object_id, ctypes.byref(attr_name_ptrs))
         return True
 
@@ -6115,7 +8602,7 @@ class exodus:
             prop_name_ptrs[i] = ctypes.pointer(
                 ctypes.create_string_buffer(
                     MAX_STR_LENGTH + 1))
-        EXODUS_LIB.ex_get_prop_names(
+        self.__lib.ex_get_prop_names(
             self.fileId, var_type, ctypes.byref(prop_name_ptrs))
         prop_names = []
         for cnp in prop_name_ptrs:
@@ -6128,15 +8615,15 @@ class exodus:
         obj_type = ctypes.c_int(get_entity_type(objType))
         obj_id = ctypes.c_longlong(objId)
         prop_name = ctypes.create_string_buffer(propName.encode('ascii'), MAX_STR_LENGTH + 1)
-        if EXODUS_LIB.ex_int64_status(self.fileId) & EX_IDS_INT64_API:
+        if self.__int64_status() & EX_IDS_INT64_API:
             prop_val = ctypes.c_longlong(0)
         else:
             prop_val = ctypes.c_int(0)
-        EXODUS_LIB.ex_get_prop(
+        self.__lib.ex_get_prop(
             self.fileId,
             obj_type,
             obj_id,
-            ctypes.byref(prop_name),
+            prop_name,
             ctypes.byref(prop_val))
         return prop_val.value
 
@@ -6147,18 +8634,18 @@ class exodus:
         obj_id = ctypes.c_longlong(objId)
         prop_name = ctypes.create_string_buffer(propName.encode('ascii'), MAX_STR_LENGTH + 1)
         prop_val = ctypes.c_longlong(propVal)
-        EXODUS_LIB.ex_put_prop(
+        self.__lib.ex_put_prop(
             self.fileId,
             obj_type,
             obj_id,
-            ctypes.byref(prop_name),
+            prop_name,
             prop_val)
         return True
 
     # --------------------------------------------------------------------
 
     def __ex_update(self):
-        EXODUS_LIB.ex_update(self.fileId)
+        self.__lib.ex_update(self.fileId)
         return True
 
 # --------------------------------------------------------------------
@@ -6169,6 +8656,8 @@ class exodus:
 def collectElemConnectivity(exodusHandle, connectivity):
     """
       This function generates a list of lists that represent the element connectivity.
+      It is a list form of `exodus.get_elem_node_adjacency`, with 1-based node
+      *INDICES*.
 
     Usage:
     ------
@@ -6184,14 +8673,20 @@ def collectElemConnectivity(exodusHandle, connectivity):
         raise Exception(
             "ERROR: connectivity is not empty in call to collectElemConnectivity().")
 
-    blockIds = exodusHandle.get_ids('EX_ELEM_BLOCK')
-    for blId in blockIds:
-        (elem_block_conn, num_elem, num_nodes) = exodusHandle.get_elem_connectivity(blId)
-        for k in range(num_elem):
-            i = k * num_nodes
-            j = i + num_nodes
-            local_elem_conn = elem_block_conn[i:j]
-            connectivity.append(local_elem_conn)
+    if _import_numpy() is None:
+        for blId in exodusHandle.get_ids('EX_ELEM_BLOCK'):
+            (elem_block_conn, num_elem, num_nodes) = exodusHandle.get_elem_connectivity(blId)
+            for k in range(num_elem):
+                i = k * num_nodes
+                connectivity.append(elem_block_conn[i:i + num_nodes])
+        return
+
+    offsets, nodes = exodusHandle.get_elem_node_adjacency()
+    if exodusHandle.use_numpy:
+        connectivity.extend(exodusHandle.np.split(nodes + 1, offsets[1:-1]) if len(offsets) > 1
+                            else [])
+    else:
+        connectivity.extend(_csr_rows(offsets, nodes + 1))
 
 # --------------------------------------------------------------------
 
@@ -6202,7 +8697,8 @@ def collectLocalNodeToLocalElems(
         localNodeToLocalElems):
     """
       This function generates a list of lists to go from local node id
-      to local elem id.
+      to local elem id; a list form of `exodus.get_node_elem_adjacency`,
+      built from `connectivity`.
 
     Usage:
     ------
@@ -6225,15 +8721,21 @@ def collectLocalNodeToLocalElems(
     if not connectivity:
         collectElemConnectivity(exodusHandle, connectivity)
 
+    # node *INDICES* are 1-based, so the list for index 0 stays empty
     numNodes = exodusHandle.num_nodes()
-    for _i in range(numNodes + 1):
-        localNodeToLocalElems.append([])
+    np = _import_numpy()
+    if np is None:
+        for _i in range(numNodes + 1):
+            localNodeToLocalElems.append([])
+        for localElemId, local_elem_conn in enumerate(connectivity):
+            for n in local_elem_conn:
+                localNodeToLocalElems[n].append(localElemId)
+        return
 
-    localElemId = 0
-    for local_elem_conn in connectivity:
-        for n in local_elem_conn:
-            localNodeToLocalElems[n].append(localElemId)
-        localElemId = localElemId + 1
+    offsets, nodes = _csr_from_lists(np, connectivity)
+    elems = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    localNodeToLocalElems.extend(
+        _csr_rows(*_csr_from_pairs(nodes, elems, numNodes + 1, len(offsets) - 1)))
 
 # --------------------------------------------------------------------
 
@@ -6245,7 +8747,9 @@ def collectLocalElemToLocalElems(
         localElemToLocalElems):
     """
       This function generates a list of lists to go from local elem id
-      to connected local elem ids.
+      to connected local elem ids, itself included; a list form of
+      `exodus.get_elem_elem_adjacency`, built from `connectivity` and
+      `localNodeToLocalElems`.
 
     Usage:
     ------
@@ -6276,16 +8780,23 @@ def collectLocalElemToLocalElems(
         collectLocalNodeToLocalElems(
             exodusHandle, connectivity, localNodeToLocalElems)
 
-    numElems = exodusHandle.num_elems()
-    for _i in range(numElems):
-        localElemToLocalElems.append([])
-    for localElemId in range(numElems):
-        nodeList = list(connectivity[localElemId])
-        newConnectedElems = []
-        for n in nodeList:
-            for elem in localNodeToLocalElems[n]:
-                newConnectedElems.append(elem)
-        localElemToLocalElems[localElemId] = list(set(newConnectedElems))
+    # every element is listed as connected to itself
+    numElems = len(connectivity)
+    np = _import_numpy()
+    if np is None:
+        for local_elem_conn in connectivity:
+            connectedElems = set()
+            for n in local_elem_conn:
+                connectedElems.update(localNodeToLocalElems[n])
+            localElemToLocalElems.append(sorted(connectedElems))
+        return
+
+    elem_offsets, elem_nodes = _csr_from_lists(np, connectivity)
+    node_offsets, node_elems = _csr_from_lists(np, localNodeToLocalElems)
+    offsets, elems = _csr_compose(elem_offsets, elem_nodes, node_offsets, node_elems, numElems)
+    rows = np.concatenate([np.repeat(np.arange(numElems), np.diff(offsets)), np.arange(numElems)])
+    cols = np.concatenate([elems, np.arange(numElems)])
+    localElemToLocalElems.extend(_csr_rows(*_csr_from_pairs(rows, cols, numElems, numElems)))
 
 # --------------------------------------------------------------------
 
@@ -6571,55 +9082,43 @@ def transfer_variables(
     for step in range(nSteps):
         exo_to.put_time(step + 1, timeVals[step])
 
+    # all variables are declared with a single call to define_results()
+    schema = {}
+
     if debugPrint:
         print("Add Global Variables")
-    nNewGlobalVars = len(additionalGlobalVariables)
-    nGlobalVars = exoFrom.get_variable_number('EX_GLOBAL') + nNewGlobalVars
-    defaultNewVarVals = []
-    for _i in range(nNewGlobalVars):
-        defaultNewVarVals.append(0.0)
-    if nGlobalVars > 0:
-        exo_to.set_variable_number('EX_GLOBAL', nGlobalVars)
-        gVarNames = exoFrom.get_variable_names('EX_GLOBAL')
-        gVarNames.extend(additionalGlobalVariables)
-        for nameIndex in range(nGlobalVars):
-            globalVarName = gVarNames[nameIndex]
-            exo_to.put_variable_name('EX_GLOBAL', globalVarName, nameIndex + 1)
-        for step in range(nSteps):
-            gValues = exoFrom.get_all_global_variable_values(step + 1)
-            if array_type == 'numpy':
-                gValues = exo_to.np.append(gValues, defaultNewVarVals)
-            else:
-                gValues.extend(defaultNewVarVals)
-            exo_to.put_all_global_variable_values(step + 1, gValues)
+    gVarNames = exoFrom.get_variable_names('EX_GLOBAL')
+    gVarNames.extend(additionalGlobalVariables)
+    if gVarNames:
+        schema['EX_GLOBAL'] = gVarNames
 
     if debugPrint:
         print("Add Nodal Variables")
-    nNewNodalVars = len(additionalNodalVariables)
-    nOrigNodalVars = exoFrom.get_variable_number('EX_NODAL')
-    nNodalVars = nOrigNodalVars + nNewNodalVars
-    if nNodalVars > 0:
-        exo_to.set_variable_number('EX_NODAL', nNodalVars)
-        nVarNames = exoFrom.get_variable_names('EX_NODAL')
-        nVarNames.extend(additionalNodalVariables)
-        for nameIndex in range(nNodalVars):
-            nodalVarName = nVarNames[nameIndex]
-            exo_to.put_variable_name('EX_NODAL', nodalVarName, nameIndex + 1)
-            if nameIndex < nOrigNodalVars:
-                for step in range(nSteps):
-                    nValues = exoFrom.get_node_variable_values(
-                        nodalVarName, step + 1)
-                    exo_to.put_node_variable_values(
-                        nodalVarName, step + 1, nValues)
-
-    internal_transfer_variables(exoFrom, exo_to, 'EX_ELEM_BLOCK', additionalElementVariables, debugPrint)
-    internal_transfer_variables(exoFrom, exo_to, 'EX_NODE_SET', additionalNodeSetVariables, debugPrint)
-    internal_transfer_variables(exoFrom, exo_to, 'EX_SIDE_SET', additionalSideSetVariables, debugPrint)
+    nVarNames = exoFrom.get_variable_names('EX_NODAL')
+    nVarNames.extend(additionalNodalVariables)
+    if nVarNames:
+        schema['EX_NODAL'] = nVarNames
+
+    internal_transfer_variables(exoFrom, schema, 'EX_ELEM_BLOCK', additionalElementVariables, debugPrint)
+    internal_transfer_variables(exoFrom, schema, 'EX_NODE_SET', additionalNodeSetVariables, debugPrint)
+    internal_transfer_variables(exoFrom, schema, 'EX_SIDE_SET', additionalSideSetVariables, debugPrint)
+    exo_to.define_results(schema)
+
+    if debugPrint:
+        print("Transfer Variable Values")
+    stats = transfer_variable_values(exoFrom, exo_to)
+    if debugPrint or VERBOSE:
+        print("Transferred {:.1f} MB of variable values in {:.3f} s ({:.1f} MB/s)".format(
+            stats['bytes'] / 1.0e6, stats['seconds'], stats['MB/s']))
     return exo_to
 
 
-def internal_transfer_variables(exoFrom, exo_to, obj_type, additionalVariables, debugPrint):
-    """ Internal support function for `exodus.transfer_variables` """
+def internal_transfer_variables(exoFrom, schema, obj_type, additionalVariables, debugPrint):
+    """
+    Internal support function for `exodus.transfer_variables`; adds the
+    names and truth table of `obj_type` to the `exodus.define_results`
+    schema
+    """
     if debugPrint:
         print("Construct Truth Table for additionalVariables")
     blkIds = exoFrom.get_ids(obj_type)
@@ -6642,14 +9141,12 @@ def internal_transfer_variables(exoFrom, exo_to, obj_type, additionalVariables,
                    item, " is not right type to add."))
             print("should be a string or tuple, skipping")
 
-    nSteps = exoFrom.num_times()
     if debugPrint:
         print("Add Variables")
     nNewVars = len(newVariableNames)
     nOrigVars = exoFrom.get_variable_number(obj_type)
     nVars = nOrigVars + nNewVars
     if nVars > 0:
-        exo_to.set_variable_number(obj_type, nVars)
         origVarNames = exoFrom.get_variable_names(obj_type)
         origVarNames.extend(newVariableNames)
         truthTable = []
@@ -6668,21 +9165,159 @@ def internal_transfer_variables(exoFrom, exo_to, obj_type, additionalVariables,
                     else:
                         newTruth.append(False)
             truthTable = newTruth
-        exo_to.set_variable_truth_table(obj_type, truthTable)
-        for nameIndex in range(nVars):
-            varName = origVarNames[nameIndex]
-            exo_to.put_variable_name(obj_type, varName, nameIndex + 1)
-        truthIndex = 0
-        for blkId in blkIds:
-            for origVarName in origVarNames:
-                if truthTable[truthIndex]:
-                    for step in range(nSteps):
-                        eValues = exoFrom.get_variable_values(obj_type, blkId,
-                                                              origVarName, step + 1)
-                        exo_to.put_variable_values(obj_type, blkId,
-                                                   origVarName, step + 1, eValues)
-                truthIndex = truthIndex + 1
-            truthIndex = truthIndex + nNewVars
+        schema[obj_type] = (origVarNames, truthTable)
+
+
+def transfer_variable_values(exoFrom, exo_to, objTypes=None, steps=None, prefetch=2):
+    """
+    Copies the values of every variable that `exoFrom` and `exo_to` both
+    define, matched by name, one (block, variable) time history at a time
+    through a small pool of reused buffers.  With a thread-safe library,
+    values are read on a background thread while the previously read ones
+    are written.
+
+    >>> stats = transfer_variable_values(exoFrom, exo_to)
+    >>> print("{:.1f} MB/s".format(stats['MB/s']))
+
+    Parameters
+    ----------
+    exoFrom : exodus database object
+        exodus object to transfer from
+    exo_to : exodus database object
+        exodus object to transfer to; its time values, variable names and
+        truth tables must already be defined
+    objTypes : <list<ex_entity_type>>, optional
+        object types to transfer; defaults to 'EX_GLOBAL', 'EX_NODAL',
+        'EX_ELEM_BLOCK', 'EX_NODE_SET' and 'EX_SIDE_SET'
+    steps : <list<int>>, optional
+        1-based indices of the time steps to transfer; defaults to all
+    prefetch : int, optional
+        number of values read ahead of the ones being written; 0, or a
+        library that is not thread-safe, reads and writes in the calling
+        thread
+
+    Returns
+    -------
+    stats : dict
+        number of 'bytes' of variable values transferred, elapsed
+        'seconds', and the achieved throughput in 'MB/s'
+
+    Note:
+    -----
+    Global variables of `exo_to` that `exoFrom` does not define are set to
+    0.0.
+    """
+    if objTypes is None:
+        objTypes = ['EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK', 'EX_NODE_SET', 'EX_SIDE_SET']
+    if steps is None:
+        steps = range(1, exoFrom.num_times() + 1)
+    steps = list(steps)
+
+    # (objType, entityId, name, numVals) of each time history to copy; all
+    # global variables are copied together, name being None, using the
+    # (from index, to index) pairs of the global variables both define
+    copies = []
+    global_pairs = []
+    for objType in objTypes:
+        fromNames = exoFrom.get_variable_names(objType)
+        toNames = exo_to.get_variable_names(objType)
+        names = [name for name in fromNames if name in toNames]
+        if objType == 'EX_GLOBAL':
+            if toNames:
+                global_pairs = [(fromNames.index(name), toNames.index(name)) for name in names]
+                copies.append((objType, None, None, len(toNames)))
+        elif not names:
+            continue
+        elif objType == 'EX_NODAL':
+            for name in names:
+                copies.append((objType, 0, name, exoFrom.num_nodes()))
+        else:
+            fromTruth = exoFrom.get_variable_truth_table(objType)
+            toTruth = exo_to.get_variable_truth_table(objType)
+            toIds = list(exo_to.get_ids(objType))
+            for fromIndex, entityId in enumerate(exoFrom.get_ids(objType)):
+                if entityId not in toIds:
+                    continue
+                toIndex = toIds.index(entityId)
+                if objType == 'EX_ELEM_BLOCK':
+                    numVals = exoFrom.num_elems_in_blk(entityId)
+                else:
+                    numVals = exoFrom.get_set_params(objType, entityId)[0]
+                for name in names:
+                    if fromTruth[fromIndex * len(fromNames) + fromNames.index(name)] and \
+                       toTruth[toIndex * len(toNames) + toNames.index(name)]:
+                        copies.append((objType, entityId, name, numVals))
+
+    work = [(copy, step) for copy in copies for step in steps]
+    maxVals = max([copy[3] for copy in copies] + [0])
+
+    def read(copy, step, buf):
+        objType, entityId, name, numVals = copy
+        if objType == 'EX_GLOBAL':
+            values = exoFrom.get_all_global_variable_values(step)
+            ctypes.memset(buf, 0, ctypes.sizeof(ctypes.c_double) * numVals)
+            for fromIndex, toIndex in global_pairs:
+                buf[toIndex] = values[fromIndex]
+        else:
+            exoFrom.get_variable_values(objType, entityId, name, step, out=buf)
+
+    def write(copy, step, buf):
+        objType, entityId, name, _numVals = copy
+        if objType == 'EX_GLOBAL':
+            exo_to.put_all_global_variable_values(step, buf)
+        else:
+            exo_to.put_variable_values(objType, entityId, name, step, buf)
+
+    # a library that is not thread-safe allows one call at a time, so a
+    # reading thread could not overlap with the writes
+    if exoFrom.inquire('EX_INQ_THREADSAFE') != 1:
+        prefetch = 0
+
+    start = time.perf_counter()
+    if prefetch < 1 or not work:
+        buf = (ctypes.c_double * maxVals)()
+        for copy, step in work:
+            read(copy, step, buf)
+            write(copy, step, buf)
+    else:
+        free = queue.Queue()
+        ready = queue.Queue()
+        stop = threading.Event()
+        for _ in range(prefetch + 1):
+            free.put((ctypes.c_double * maxVals)())
+
+        def reader():
+            try:
+                for copy, step in work:
+                    buf = free.get()
+                    if buf is None or stop.is_set():
+                        return
+                    read(copy, step, buf)
+                    ready.put(((copy, step), buf))
+                ready.put((None, None))
+            except BaseException as err:  # handed to the writing thread
+                ready.put((None, err))
+
+        thread = threading.Thread(target=reader, name="exodus-transfer", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, buf = ready.get()
+                if item is None:
+                    if buf is not None:
+                        raise buf
+                    break
+                write(item[0], item[1], buf)
+                free.put(buf)
+        finally:
+            stop.set()
+            free.put(None)
+            thread.join()
+    seconds = time.perf_counter() - start
+
+    numBytes = ctypes.sizeof(ctypes.c_double) * sum(copy[3] for copy, _step in work)
+    return {'bytes': numBytes, 'seconds': seconds,
+            'MB/s': numBytes / 1.0e6 / seconds if seconds > 0 else 0.0}
 
 
 def add_variables(exo, global_vars=[], nodal_vars=[], element_vars=[], node_set_vars=[], side_set_vars=[]):
@@ -6947,3 +9582,300 @@ def ctype_to_numpy(exo, c_array):
         exo.warnings.simplefilter('ignore')
         np_array = exo.np.ctypeslib.as_array(c_array)
     return np_array
+
+
+def _coalesce_ranges(indices, max_gap):
+    """
+    group integer indices, given in any order, into half-open [start, stop)
+    ranges, joining neighbours that are at most `max_gap` entries apart
+    """
+    ranges = []
+    for index in sorted(set(int(i) for i in indices)):
+        if ranges and index - ranges[-1][1] <= max_gap:
+            ranges[-1][1] = index + 1
+        else:
+            ranges.append([index, index + 1])
+    return [tuple(r) for r in ranges]
+
+
+def _cubic_weights(x, x0, x1, x2, x3):
+    """
+    the weights of y0, y1, y2 and y3 in the cubic through the four points
+    at x0 < x1 <= x <= x2 < x3, the same formula as exomerge's
+    _cubic_interpolation
+    """
+    return [((x - x1) * (x - x2)**2) / ((x0 - x2) * (x1 - x2)**2),
+            -(((x - x2) *
+               (-(x * x1 * (x1 + 3 * x2)) - x1 * (x1**2 - 4 * x1 * x2 + x2**2) +
+                x**2 * (x1 + x2 - 2 * x3) + x2 * (-3 * x1 + x2) * x3 +
+                x * (3 * x1 + x2) * x3)) / ((x1 - x2)**3 * (x1 - x3))),
+            ((x - x1) *
+             (x0 * x1 * (x1 - 3 * x2) + x**2 * (-2 * x0 + x1 + x2) -
+              x2 * (x1**2 - 4 * x1 * x2 + x2**2) +
+              x * (-(x2 * (3 * x1 + x2)) + x0 * (x1 + 3 * x2)))) / ((x0 - x2) * (-x1 + x2)**3),
+            ((x - x1)**2 * (x - x2)) / ((x1 - x2)**2 * (x3 - x1))]
+
+
+def _interpolation_weights(times, time_val, method):
+    """
+    the 1-based steps and the weights whose weighted sum interpolates a
+    variable to `time_val`, given the increasing list of stored `times`;
+    a time that matches a stored time exactly uses that step alone
+    """
+    if method not in ('linear', 'cubic'):
+        raise Exception("ERROR: unknown interpolation method {!r}; use 'linear' or "
+                        "'cubic'".format(method))
+    if len(times) == 0 or not times[0] <= time_val <= times[-1]:
+        raise Exception("ERROR: time {} lies outside the stored times {}".format(
+            time_val, "[{}, {}]".format(times[0], times[-1]) if times else "(none)"))
+    upper = bisect.bisect_left(times, time_val)
+    if times[upper] == time_val:
+        return [upper + 1], [1.0]
+    lower = upper - 1
+    x1, x2 = times[lower], times[upper]
+    if method == 'linear':
+        phi = (time_val - x1) / (x2 - x1)
+        return [lower + 1, upper + 1], [1.0 - phi, phi]
+    # past either end, a ghost step continues the first or last segment linearly
+    x0 = times[lower - 1] if lower > 0 else 2 * x1 - x2
+    x3 = times[upper + 1] if upper + 1 < len(times) else 2 * x2 - x1
+    w0, w1, w2, w3 = _cubic_weights(time_val, x0, x1, x2, x3)
+    steps, weights = [lower + 1, upper + 1], [w1, w2]
+    if lower > 0:
+        steps.append(lower)
+        weights.append(w0)
+    else:
+        weights[0] += 2 * w0
+        weights[1] -= w0
+    if upper + 1 < len(times):
+        steps.append(upper + 2)
+        weights.append(w3)
+    else:
+        weights[0] -= w3
+        weights[1] += 2 * w3
+    return steps, weights
+
+
+# Corner nodes (0-based, in the exodus side numbering) of the faces of 3D
+# elements, the edges of 2D elements and the ends of 1D elements, keyed
+# by element type without its node count; higher-order elements share
+# the faces of their linear counterpart.
+_FACE_CORNERS = {
+    'HEX': [(0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (0, 4, 7, 3), (0, 3, 2, 1), (4, 5, 6, 7)],
+    'TETRA': [(0, 1, 3), (1, 2, 3), (0, 3, 2), (0, 2, 1)],
+    'WEDGE': [(0, 1, 4, 3), (1, 2, 5, 4), (0, 3, 5, 2), (0, 2, 1), (3, 4, 5)],
+    'PYRAMID': [(0, 1, 4), (1, 2, 4), (2, 3, 4), (3, 0, 4), (0, 3, 2, 1)],
+    'QUAD': [(0, 1), (1, 2), (2, 3), (3, 0)],
+    'TRI': [(0, 1), (1, 2), (2, 0)],
+    'BAR': [(0,), (1,)],
+    'SPHERE': [],
+}
+_FACE_CORNERS['TET'] = _FACE_CORNERS['TETRA']
+_FACE_CORNERS['SHELL'] = _FACE_CORNERS['QUAD']
+_FACE_CORNERS['TRIANGLE'] = _FACE_CORNERS['TRISHELL'] = _FACE_CORNERS['TRI']
+_FACE_CORNERS['BEAM'] = _FACE_CORNERS['TRUSS'] = _FACE_CORNERS['EDGE'] = _FACE_CORNERS['BAR']
+_FACE_CORNERS['CIRCLE'] = _FACE_CORNERS['POINT'] = _FACE_CORNERS['SPHERE']
+
+# number of rows expanded at once by the adjacency builders
+_ADJACENCY_CHUNK = 1 << 16
+
+
+def _face_corners(elem_type, nodes_per_elem):
+    if isinstance(elem_type, bytes):
+        elem_type = elem_type.decode('ascii')
+    family = elem_type.upper().rstrip('0123456789')
+    if family == 'SHELL' and nodes_per_elem == 3:
+        family = 'TRI'
+    if family not in _FACE_CORNERS:
+        raise Exception("ERROR: face adjacency is not defined for element type " + elem_type)
+    return _FACE_CORNERS[family]
+
+
+def _csr_gather(offsets, indices, rows):
+    """
+    the entries of the given CSR `rows`, concatenated, and for each entry
+    the position in `rows` of the row it came from
+    """
+    import numpy as np
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    owners = np.repeat(np.arange(len(rows)), counts)
+    positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, indices[np.repeat(starts, counts) + positions]
+
+
+def _sorted_unique(keys):
+    """sorted unique values of an integer array (faster than np.unique for large arrays)"""
+    import numpy as np
+    keys = np.sort(keys)
+    if len(keys):
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    return keys
+
+
+def _csr_from_keys(keys, num_rows, num_cols):
+    """CSR offsets and indices of sorted, unique `row * num_cols + col` keys"""
+    import numpy as np
+    num_cols = max(num_cols, 1)
+    offsets = np.zeros(num_rows + 1, np.int64)
+    np.cumsum(np.bincount(keys // num_cols, minlength=num_rows), out=offsets[1:])
+    return offsets, keys % num_cols
+
+
+def _csr_from_pairs(rows, cols, num_rows, num_cols):
+    """
+    CSR offsets and indices of the (row, col) pairs, given in any order;
+    duplicate pairs are dropped and each row is sorted
+    """
+    import numpy as np
+    keys = _sorted_unique(np.asarray(rows, np.int64) * max(num_cols, 1) + cols)
+    return _csr_from_keys(keys, num_rows, num_cols)
+
+
+def _csr_compose(row_offsets, row_indices, col_offsets, col_indices, num_cols):
+    """
+    CSR of the rows of `row` reached through `col`: row r holds every
+    entry of col[c] for each c in row[r], except r itself.  Built in
+    chunks of `_ADJACENCY_CHUNK` rows to bound the memory of the expansion.
+    """
+    import numpy as np
+    num_rows = len(row_offsets) - 1
+    chunks = []
+    for first in range(0, num_rows, _ADJACENCY_CHUNK):
+        rows = np.arange(first, min(first + _ADJACENCY_CHUNK, num_rows))
+        owners, middle = _csr_gather(row_offsets, row_indices, rows)
+        inner, cols = _csr_gather(col_offsets, col_indices, middle)
+        rows = rows[owners[inner]]
+        keep = rows != cols
+        chunks.append(_sorted_unique(rows[keep] * num_cols + cols[keep]))
+    keys = np.concatenate(chunks) if chunks else np.zeros(0, np.int64)
+    return _csr_from_keys(keys, num_rows, num_cols)
+
+
+def _import_numpy(required_by=None):
+    """
+    the numpy module, or None if it is not installed; with `required_by`,
+    the name of the calling function, a missing numpy raises an error
+    instead
+    """
+    try:
+        import numpy
+    except ImportError:
+        if required_by is not None:
+            raise Exception("ERROR: {} requires numpy, which is not installed"
+                            .format(required_by))
+        return None
+    return numpy
+
+
+def _csr_from_lists(np, rows):
+    """CSR offsets and indices of a list of integer sequences"""
+    offsets = np.zeros(len(rows) + 1, np.int64)
+    np.cumsum([len(row) for row in rows], out=offsets[1:])
+    indices = np.fromiter(itertools.chain.from_iterable(rows), np.int64, offsets[-1])
+    return offsets, indices
+
+
+def _csr_rows(offsets, indices):
+    """the rows of a CSR structure as a list of lists"""
+    import numpy as np
+    if len(offsets) < 2:
+        return []
+    return [row.tolist() for row in np.split(indices, offsets[1:-1])]
+
+
+_NATIVE_ORDER = {'little': '<', 'big': '>'}[sys.byteorder]
+
+
+def _buffer_kind(fmt):
+    # buffers in the other byte order do not match; they are byte-swapped
+    # by the bulk numpy cast instead
+    if fmt[:1] in '@=<>!':
+        order, fmt = fmt[0], fmt[1:]
+        if order not in ('@', '=', _NATIVE_ORDER) and not (order == '!' and
+                                                           _NATIVE_ORDER == '>'):
+            return None
+    if len(fmt) != 1:
+        return None
+    if fmt in 'bhilqn':
+        return 'i'
+    if fmt in 'BHILQN':
+        return 'u'
+    if fmt in 'fd':
+        return 'f'
+    return None
+
+
+def _buffer_matches(view, c_type, count):
+    return view.c_contiguous and view.itemsize == ctypes.sizeof(c_type) and \
+        view.nbytes >= ctypes.sizeof(c_type) * count and \
+        _buffer_kind(view.format) is not None and \
+        _buffer_kind(view.format) == _buffer_kind(memoryview(c_type()).format)
+
+
+def _out_ctype_array(out, c_type, count):
+    try:
+        view = memoryview(out)
+    except TypeError:
+        view = None
+    if view is None or view.readonly or not _buffer_matches(view, c_type, count):
+        raise Exception("ERROR: 'out' must be a writable, contiguous buffer of "
+                        "at least {} values of type {}".format(count, c_type.__name__))
+    return (c_type * count).from_buffer(view.cast('B'))
+
+
+def as_ctype_array(values, c_type, count=None):
+    """
+    Converts a sequence of values into a c-type array suitable for passing to
+    the exodus library, avoiding per-element conversion whenever possible
+
+    Parameters
+    ----------
+    values : list, array.array, numpy array, c-type array, or any object
+             supporting the buffer protocol
+        values to be converted
+    c_type : ctypes type
+        element type of the returned array, e.g. `ctypes.c_double`
+    count : int, optional
+        number of values to convert; defaults to `len(values)`
+
+    Returns
+    -------
+    c_array : c-type array
+        `(c_type * count)` array holding the values.  If `values` is a
+        writable, C-contiguous buffer whose element type and native byte
+        order match `c_type`, the returned array shares its memory (no copy
+        is made); a read-only matching buffer is copied in a single block.
+        Other array-like inputs, including those in the other byte order,
+        are cast in bulk through numpy, and plain sequences fall back to
+        slice assignment.
+    """
+    if count is None:
+        count = len(values)
+    array_type = c_type * count
+    if isinstance(values, array_type):
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None and _buffer_matches(view, c_type, count):
+        raw = view.cast('B')
+        if raw.readonly:
+            return array_type.from_buffer_copy(raw)
+        return array_type.from_buffer(raw)
+    c_array = array_type()
+    if count == 0:
+        return c_array
+    if view is not None or hasattr(values, '__array_interface__'):
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            source = np.asarray(values if view is None else view)
+            np.copyto(np.ctypeslib.as_array(c_array), np.ravel(source)[:count],
+                      casting='unsafe')
+            return c_array
+    c_array[:] = values[:count]
+    return c_array
@@ -0,0 +1,815 @@
+"""
+exodus_decomposed.py reads the pieces of a decomposed Exodus database,
+the per-rank files `file.e.N.0` ... `file.e.N.(N-1)` written by a parallel
+run, into global numpy arrays without first joining them with `epu`.
+
+>>> from exodus_decomposed import DecomposedExodusReader
+>>> with DecomposedExodusReader("results.e", processes=8) as reader:
+...     x, y, z = reader.get_coords()
+...     conn, num_elems, nodes_per_elem = reader.get_elem_connectivity(1)
+...     temp = reader.get_variable_block('EX_NODAL', 0, ['temp'])
+
+`write_decomposed` does the reverse and splits a global model into such
+pieces, one element-to-rank array entry per element.
+
+>>> files = write_decomposed("restart.e", "global.e", elem_ranks)
+
+The pieces are opened in a pool of worker processes, each piece by one
+worker.  The node and element id maps of the pieces are used to place
+their values in the global arrays: nodes shared by several pieces appear
+once, global nodes are ordered by node id, and the elements of each block
+are ordered by element id.  The workers write their part of each global
+array directly into shared memory (files in /dev/shm where available), so
+no bulk data is pickled between processes.  The arrays returned stay valid
+after the reader is closed.
+
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+"""
+
+import concurrent.futures
+import glob
+import itertools
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# import exodus module
+# (exodus.py should be in the same directory as this file)
+try:
+    import exodus
+except ImportError:
+    import exodus3 as exodus
+
+
+def decomposed_files(base):
+    """
+    get the pieces `base.N.i` of a decomposed exodus database, in rank
+    order
+
+    >>> files = decomposed_files("results.e")
+
+    Parameters
+    ----------
+    base : string
+        name of the database the pieces were decomposed from
+
+    Returns
+    -------
+    files : <list<string>>
+    """
+    pieces = {}
+    for path in glob.glob(glob.escape(base) + ".*.*"):
+        count, _, rank = path[len(base) + 1:].partition(".")
+        if count.isdigit() and rank.isdigit():
+            pieces.setdefault(int(count), {})[int(rank)] = path
+    if len(pieces) != 1:
+        raise Exception("ERROR: expected the pieces of exactly one decomposition of " + base +
+                        ", found " + str(len(pieces)))
+    count, ranks = pieces.popitem()
+    if sorted(ranks) != list(range(count)):
+        raise Exception("ERROR: decomposition of " + base + " into " + str(count) +
+                        " pieces is missing ranks")
+    return [ranks[rank] for rank in range(count)]
+
+
+class _SharedArrays:
+    """arrays in files on a shared-memory file system that worker processes map by name"""
+
+    def __init__(self):
+        root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        self.directory = tempfile.mkdtemp(prefix="exodus-decomposed-", dir=root)
+        self.count = 0
+
+    def create(self, shape, dtype, fill=None):
+        """a new shared array and the spec workers attach it with"""
+        shape = tuple(int(size) for size in shape)
+        if int(np.prod(shape)) == 0:
+            return np.empty(shape, dtype), (None, shape, np.dtype(dtype).str)
+        path = os.path.join(self.directory, str(self.count))
+        self.count += 1
+        array = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        if fill is not None:
+            array.fill(fill)
+        return array, (path, shape, np.dtype(dtype).str)
+
+    @staticmethod
+    def release(spec):
+        """remove the file behind an array; existing mappings stay valid"""
+        if spec[0] is not None:
+            try:
+                os.remove(spec[0])
+            except OSError:
+                pass
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _attach(spec):
+    path, shape, dtype = spec
+    if path is None:
+        return np.empty(shape, dtype)
+    return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+
+def _open(path):
+    return exodus.exodus(path, mode='r', array_type='numpy')
+
+
+def _read_header(path):
+    with _open(path) as exo:
+        blocks = []
+        for blkId in exo.get_ids('EX_ELEM_BLOCK'):
+            elem_type, num_elems, nodes_per_elem, _num_attr = exo.elem_blk_info(blkId)
+            blocks.append((int(blkId), elem_type, int(num_elems), int(nodes_per_elem)))
+        names = {objType: exo.get_variable_names(objType)
+                 for objType in ('EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK')}
+        return {'title': exo.title(), 'num_dim': exo.num_dimensions(),
+                'num_nodes': exo.num_nodes(), 'num_elems': exo.num_elems(),
+                'coord_names': exo.get_coord_names(), 'blocks': blocks,
+                'times': [float(time) for time in exo.get_times()], 'names': names,
+                'globals': {name: [float(value) for value in exo.get_global_variable_values(name)]
+                            for name in names['EX_GLOBAL']}}
+
+
+def _read_id_maps(path, node_ids, node_offset, elem_ids, elem_offset):
+    with _open(path) as exo:
+        node_map = exo.get_node_id_map()
+        _attach(node_ids)[node_offset:node_offset + len(node_map)] = node_map
+        elem_map = exo.get_elem_id_map()
+        _attach(elem_ids)[elem_offset:elem_offset + len(elem_map)] = elem_map
+
+
+def _scatter_mesh(path, piece, shared):
+    """write the global position of the piece's nodes and elements, its coordinates and connectivity"""
+    node_index = _attach(shared['node_index'])[piece['nodes']]
+    elem_index = _attach(shared['elem_index'])[piece['elems']]
+    global_node_ids = _attach(shared['node_ids'])
+    global_elem_ids = _attach(shared['elem_ids'])
+    with _open(path) as exo:
+        node_index[:] = np.searchsorted(global_node_ids, exo.get_node_id_map())
+        coords = _attach(shared['coords'])
+        for dim, values in enumerate(exo.get_coords()):
+            coords[dim, node_index] = values
+        elem_map = exo.get_elem_id_map()
+        start = 0
+        for blkId, _elem_type, num_elems, _nodes_per_elem in piece['blocks']:
+            if num_elems == 0:
+                continue
+            first, count = shared['block_elems'][blkId]
+            positions = np.searchsorted(global_elem_ids[first:first + count],
+                                        elem_map[start:start + num_elems])
+            elem_index[start:start + num_elems] = first + positions
+            connectivity, _num, nodes_per_elem = exo.get_elem_connectivity(blkId)
+            connectivity = np.asarray(connectivity).reshape(num_elems, nodes_per_elem)
+            _attach(shared['connect'][blkId])[positions] = node_index[connectivity - 1] + 1
+            start += num_elems
+
+
+def _scatter_variables(path, piece, shared, objType, entityId, names, steps, values):
+    with _open(path) as exo:
+        out = _attach(values)
+        if objType == 'EX_NODAL':
+            positions = _attach(shared['node_index'])[piece['nodes']]
+        else:
+            blocks = [block for block in piece['blocks'] if block[0] == entityId]
+            if not blocks or blocks[0][2] == 0:
+                return
+            start = sum(block[2] for block in piece['blocks'][:piece['blocks'].index(blocks[0])])
+            first = shared['block_elems'][entityId][0]
+            elem_index = _attach(shared['elem_index'])[piece['elems']]
+            positions = elem_index[start:start + blocks[0][2]] - first
+        out[:, :, positions] = exo.get_variable_block(objType, entityId, names, steps)
+
+
+def _names(exo, objType, ids):
+    return exo.get_names(objType) if len(ids) > 0 else []
+
+
+def _stage_model(path, arrays):
+    """read a global exodus file into shared arrays and describe it for `_write_piece`"""
+    def stage(values, dtype):
+        values = np.asarray(values, dtype=dtype)
+        array, spec = arrays.create(values.shape, dtype)
+        array[...] = values
+        return spec
+
+    with _open(path) as exo:
+        steps = range(1, exo.num_times() + 1)
+        names = {objType: exo.get_variable_names(objType)
+                 for objType in ('EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK')}
+        model = {'title': exo.title(), 'num_dim': exo.num_dimensions(),
+                 'coord_names': exo.get_coord_names(),
+                 'times': [float(time) for time in exo.get_times()], 'names': names,
+                 'globals': [[float(value) for value in exo.get_all_global_variable_values(step)]
+                             for step in steps] if names['EX_GLOBAL'] else [],
+                 'coords': stage(exo.get_coords(), np.float64),
+                 'node_ids': stage(exo.get_node_id_map(), np.int64),
+                 'elem_ids': stage(exo.get_elem_id_map(), np.int64),
+                 'nodal': stage(exo.get_variable_block('EX_NODAL', 0), np.float64)
+                 if names['EX_NODAL'] else None,
+                 'truth': [bool(defined) for defined in
+                           exo.get_variable_truth_table('EX_ELEM_BLOCK')]
+                 if names['EX_ELEM_BLOCK'] else [],
+                 'blocks': [], 'node_sets': [], 'side_sets': []}
+        ids = exo.get_ids('EX_ELEM_BLOCK')
+        first = 0
+        for blkId, name in itertools.zip_longest(ids, _names(exo, 'EX_ELEM_BLOCK', ids)):
+            elem_type, num_elems, nodes_per_elem, _num_attr = exo.elem_blk_info(blkId)
+            connectivity = np.asarray(exo.get_elem_connectivity(blkId)[0])
+            model['blocks'].append({
+                'id': int(blkId), 'name': name or "", 'type': elem_type.decode('ascii'),
+                'first': first, 'count': int(num_elems), 'nodes_per_elem': int(nodes_per_elem),
+                'connect': stage(connectivity.reshape(num_elems, nodes_per_elem), np.int64),
+                'values': stage(exo.get_variable_block('EX_ELEM_BLOCK', blkId), np.float64)
+                if names['EX_ELEM_BLOCK'] else None})
+            first += num_elems
+        ids = exo.get_ids('EX_NODE_SET')
+        for nsId, name in itertools.zip_longest(ids, _names(exo, 'EX_NODE_SET', ids)):
+            _num_nodes, num_dist_facts = exo.get_node_set_params(nsId)
+            model['node_sets'].append({
+                'id': int(nsId), 'name': name or "",
+                'nodes': stage(exo.get_node_set_nodes(nsId), np.int64),
+                'dist_facts': stage(exo.get_node_set_dist_facts(nsId), np.float64)
+                if num_dist_facts else None})
+        ids = exo.get_ids('EX_SIDE_SET')
+        for ssId, name in itertools.zip_longest(ids, _names(exo, 'EX_SIDE_SET', ids)):
+            elems, sides = exo.get_side_set(ssId)
+            model['side_sets'].append({'id': int(ssId), 'name': name or "",
+                                       'elems': stage(elems, np.int64),
+                                       'sides': stage(sides, np.int64)})
+    return model
+
+
+def _write_piece(path, start, stop, model, elem_order, clobber):
+    """write the piece holding the global elements elem_order[start:stop]"""
+    order = _attach(elem_order)[start:stop]
+    blocks = model['blocks']
+    selections = []
+    for block in blocks:
+        lo, hi = np.searchsorted(order, [block['first'], block['first'] + block['count']])
+        selections.append(order[lo:hi] - block['first'])
+    connect = [_attach(block['connect'])[selection]
+               for block, selection in zip(blocks, selections)]
+    nodes = np.unique(np.concatenate([conn.reshape(-1) for conn in connect] +
+                                     [np.empty(0, np.int64)]))
+    coords = _attach(model['coords'])[:, nodes - 1]
+    names = model['names']
+    node_sets = []
+    for node_set in model['node_sets']:
+        members = _attach(node_set['nodes'])
+        local = np.isin(members, nodes)
+        dist_facts = node_set['dist_facts']
+        node_sets.append((node_set, np.searchsorted(nodes, members[local]) + 1,
+                          None if dist_facts is None else _attach(dist_facts)[local]))
+    side_sets = []
+    for side_set in model['side_sets']:
+        elems = _attach(side_set['elems']) - 1
+        local = np.isin(elems, order)
+        side_sets.append((side_set, np.searchsorted(order, elems[local]) + 1,
+                          _attach(side_set['sides'])[local]))
+
+    with exodus.exodus(path, mode='w+' if clobber else 'w', title=model['title'],
+                       numDims=model['num_dim'], numNodes=len(nodes), numElems=len(order),
+                       numBlocks=len(blocks), numNodeSets=len(node_sets),
+                       numSideSets=len(side_sets)) as exo:
+        exo.put_coord_names(model['coord_names'])
+        exo.put_coords(coords[0], coords[1], coords[2])
+        exo.put_node_id_map(_attach(model['node_ids'])[nodes - 1])
+        exo.put_elem_id_map(_attach(model['elem_ids'])[order])
+        for block, conn in zip(blocks, connect):
+            exo.put_elem_blk_info(block['id'], block['type'], len(conn),
+                                  block['nodes_per_elem'], 0)
+            if len(conn) > 0:
+                exo.put_elem_connectivity(block['id'], np.searchsorted(nodes, conn).reshape(-1) + 1)
+        for node_set, members, dist_facts in node_sets:
+            exo.put_node_set_params(node_set['id'], len(members),
+                                    0 if dist_facts is None else len(dist_facts))
+            if len(members) > 0:
+                exo.put_node_set(node_set['id'], members)
+                if dist_facts is not None:
+                    exo.put_node_set_dist_fact(node_set['id'], dist_facts)
+        for side_set, elems, sides in side_sets:
+            exo.put_side_set_params(side_set['id'], len(elems), 0)
+            if len(elems) > 0:
+                exo.put_side_set(side_set['id'], elems, sides)
+        for objType, entities in [('EX_ELEM_BLOCK', blocks),
+                                  ('EX_NODE_SET', model['node_sets']),
+                                  ('EX_SIDE_SET', model['side_sets'])]:
+            if entities:
+                exo.put_names(objType, [entity['name'] for entity in entities])
+
+        schema = {objType: names[objType] for objType in ('EX_GLOBAL', 'EX_NODAL')
+                  if names[objType]}
+        if names['EX_ELEM_BLOCK']:
+            schema['EX_ELEM_BLOCK'] = (names['EX_ELEM_BLOCK'], model['truth'])
+        if not model['times'] or not schema:
+            return
+        exo.define_results(schema)
+        nodal = None if model['nodal'] is None else _attach(model['nodal'])[:, :, nodes - 1]
+        elem_values = [None if block['values'] is None or len(selection) == 0
+                       else _attach(block['values'])[:, :, selection]
+                       for block, selection in zip(blocks, selections)]
+        num_elem_vars = len(names['EX_ELEM_BLOCK'])
+        for index, time in enumerate(model['times']):
+            step = index + 1
+            exo.put_time(step, time)
+            if model['globals']:
+                exo.put_all_global_variable_values(step, model['globals'][index])
+            for var, name in enumerate(names['EX_NODAL'] if len(nodes) > 0 else []):
+                exo.put_node_variable_values(name, step, nodal[index, var])
+            for blk, (block, values) in enumerate(zip(blocks, elem_values)):
+                if values is None:
+                    continue
+                for var, name in enumerate(names['EX_ELEM_BLOCK']):
+                    if model['truth'][blk * num_elem_vars + var]:
+                        exo.put_variable_values('EX_ELEM_BLOCK', block['id'], name, step,
+                                                np.ascontiguousarray(values[index, var]))
+
+
+def write_decomposed(base, source, elem_ranks, num_ranks=None, processes=None, clobber=False):
+    """
+    split a global model into the pieces `base.N.0` ... `base.N.(N-1)` of
+    a decomposed exodus database, each written by its own worker process
+
+    >>> files = write_decomposed("restart.e", "global.e", elem_ranks, processes=16)
+    >>> files = write_decomposed("restart.e", model, elem_ranks)
+
+    Each piece holds the elements assigned to its rank and the nodes they
+    use, with node and element id maps pointing back to the global ids.
+    Every piece has all element blocks, node sets and side sets of the
+    model, possibly empty, and the global, nodal and element block
+    variables of all time steps restricted to its nodes and elements.
+    Side set distribution factors, attributes and set variables are not
+    written.
+
+    Parameters
+    ----------
+    base : string
+        name of the decomposed database; the pieces are named
+        `base.N.i` with `i` zero-padded to the width of `N`
+    source : string or exomerge.ExodusModel
+        global exodus file, or a model that is first exported to one
+    elem_ranks : <list<int>>
+        rank of each global element, in global element *INDEX* order
+        (the order of `exo.get_elem_id_map()`)
+    num_ranks : int, optional
+        number of pieces; defaults to max(elem_ranks) + 1
+    processes : int, optional
+        number of worker processes; defaults to one per CPU
+    clobber : bool
+        overwrite existing pieces instead of raising an error
+
+    Returns
+    -------
+    files : <list<string>>
+        names of the pieces in rank order
+    """
+    if hasattr(source, 'export_model'):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "global.e")
+            source.export_model(path)
+            return write_decomposed(base, path, elem_ranks, num_ranks, processes, clobber)
+
+    elem_ranks = np.asarray(elem_ranks, dtype=np.int64)
+    if num_ranks is None:
+        num_ranks = int(elem_ranks.max()) + 1 if len(elem_ranks) > 0 else 1
+    if len(elem_ranks) > 0 and (elem_ranks.min() < 0 or elem_ranks.max() >= num_ranks):
+        raise Exception("ERROR: element ranks must be between 0 and " + str(num_ranks - 1))
+    width = len(str(num_ranks))
+    files = ["{}.{}.{:0{}d}".format(base, num_ranks, rank, width) for rank in range(num_ranks)]
+
+    arrays = _SharedArrays()
+    try:
+        model = _stage_model(str(source), arrays)
+        num_elems = sum(block['count'] for block in model['blocks'])
+        if len(elem_ranks) != num_elems:
+            raise Exception("ERROR: " + str(len(elem_ranks)) + " element ranks given for " +
+                            str(num_elems) + " elements")
+        elem_order, spec = arrays.create(elem_ranks.shape, np.int64)
+        elem_order[:] = np.argsort(elem_ranks, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(elem_ranks, minlength=num_ranks))])
+        workers = min(processes or os.cpu_count() or 1, num_ranks)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_write_piece, files, bounds[:-1], bounds[1:],
+                          itertools.repeat(model), itertools.repeat(spec),
+                          itertools.repeat(clobber),
+                          chunksize=max(1, num_ranks // (4 * workers))))
+    finally:
+        arrays.close()
+    return files
+
+
+class DecomposedExodusReader:
+    """
+    Global view of a decomposed exodus database, assembled from its
+    pieces by a pool of worker processes
+    """
+
+    def __init__(self, files, processes=None):
+        """
+        Open the pieces of a decomposed exodus database and assemble its
+        node and element id maps, coordinates and connectivity.
+
+        >>> reader = DecomposedExodusReader("results.e", processes=8)
+        >>> reader = DecomposedExodusReader(["results.e.2.0", "results.e.2.1"])
+
+        Parameters
+        ----------
+        files : string or <list<string>>
+            name of the database the pieces were decomposed from, or the
+            names of the pieces in rank order
+        processes : int, optional
+            number of worker processes; defaults to one per CPU, at most
+            one per piece
+        """
+        if isinstance(files, (str, os.PathLike)):
+            files = decomposed_files(str(files))
+        self.files = [str(path) for path in files]
+        self.__pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(processes or os.cpu_count() or 1, len(self.files)))
+        self.__shared = _SharedArrays()
+        try:
+            self.__assemble()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        stop the worker processes and release the shared memory not held
+        by arrays returned by the reader
+
+        >>> reader.close()
+        """
+        self.__pool.shutdown()
+        self.__shared.close()
+
+    # --------------------------------------------------------------------
+
+    def __map(self, function, *args):
+        """run function(files[i], *[arg[i] for arg in args]) for each piece i"""
+        futures = [self.__pool.submit(function, path, *[arg[i] for arg in args])
+                   for i, path in enumerate(self.files)]
+        return [future.result() for future in futures]
+
+    def __assemble(self):
+        headers = self.__map(_read_header)
+        self.__header = headers[0]
+        node_offsets = np.cumsum([0] + [header['num_nodes'] for header in headers])
+        elem_offsets = np.cumsum([0] + [header['num_elems'] for header in headers])
+
+        local_node_ids, node_spec = self.__shared.create([node_offsets[-1]], np.int64)
+        local_elem_ids, elem_spec = self.__shared.create([elem_offsets[-1]], np.int64)
+        self.__map(_read_id_maps, [node_spec] * len(headers), node_offsets[:-1],
+                   [elem_spec] * len(headers), elem_offsets[:-1])
+
+        self.__node_ids = np.unique(local_node_ids)
+        self.__blocks = {}
+        block_ids = {}
+        for header, offset in zip(headers, elem_offsets):
+            start = offset
+            for blkId, elem_type, num_elems, nodes_per_elem in header['blocks']:
+                if blkId not in self.__blocks or self.__blocks[blkId][1] == 0:
+                    self.__blocks[blkId] = (elem_type, num_elems, nodes_per_elem)
+                block_ids.setdefault(blkId, []).append(local_elem_ids[start:start + num_elems])
+                start += num_elems
+        block_ids = {blkId: np.unique(np.concatenate(ids)) for blkId, ids in block_ids.items()}
+        self.__elem_ids = np.concatenate([block_ids[blkId] for blkId in self.__blocks] +
+                                         [np.empty(0, np.int64)])
+        del local_node_ids, local_elem_ids
+        self.__shared.release(node_spec)
+        self.__shared.release(elem_spec)
+
+        self.__block_elems = {}
+        first = 0
+        for blkId in self.__blocks:
+            elem_type, _num_elems, nodes_per_elem = self.__blocks[blkId]
+            self.__blocks[blkId] = (elem_type, len(block_ids[blkId]), nodes_per_elem)
+            self.__block_elems[blkId] = (first, len(block_ids[blkId]))
+            first += len(block_ids[blkId])
+
+        # global ids and per-piece positions are kept in shared memory for
+        # later variable reads; coordinates and connectivity are returned
+        shared = {'block_elems': self.__block_elems}
+        node_ids, shared['node_ids'] = self.__shared.create(self.__node_ids.shape, np.int64)
+        node_ids[:] = self.__node_ids
+        elem_ids, shared['elem_ids'] = self.__shared.create(self.__elem_ids.shape, np.int64)
+        elem_ids[:] = self.__elem_ids
+        _, shared['node_index'] = self.__shared.create([node_offsets[-1]], np.int64)
+        _, shared['elem_index'] = self.__shared.create([elem_offsets[-1]], np.int64)
+        self.__coords, shared['coords'] = self.__shared.create(
+            [3, len(self.__node_ids)], np.float64, fill=0.0)
+        self.__connect = {}
+        shared['connect'] = {}
+        for blkId, (_elem_type, num_elems, nodes_per_elem) in self.__blocks.items():
+            self.__connect[blkId], shared['connect'][blkId] = self.__shared.create(
+                [num_elems, nodes_per_elem], np.int64)
+        self.__pieces = [{'nodes': slice(node_offsets[i], node_offsets[i + 1]),
+                          'elems': slice(elem_offsets[i], elem_offsets[i + 1]),
+                          'blocks': header['blocks']}
+                         for i, header in enumerate(headers)]
+        self.__map(_scatter_mesh, self.__pieces, [shared] * len(headers))
+        self.__shared.release(shared['coords'])
+        for spec in shared['connect'].values():
+            self.__shared.release(spec)
+        self.__shared_specs = shared
+
+    # --------------------------------------------------------------------
+
+    def title(self):
+        """
+        get the database title of the first piece
+
+        >>> title = reader.title()
+
+        Returns
+        -------
+        title : string
+        """
+        return self.__header['title']
+
+    def num_dimensions(self):
+        """
+        get the number of model spatial dimensions
+
+        >>> num_dims = reader.num_dimensions()
+
+        Returns
+        -------
+        num_dims : int
+        """
+        return self.__header['num_dim']
+
+    def num_nodes(self):
+        """
+        get the number of distinct nodes of all pieces
+
+        >>> num_nodes = reader.num_nodes()
+
+        Returns
+        -------
+        num_nodes : int
+        """
+        return len(self.__node_ids)
+
+    def num_elems(self):
+        """
+        get the number of distinct elements of all pieces
+
+        >>> num_elems = reader.num_elems()
+
+        Returns
+        -------
+        num_elems : int
+        """
+        return len(self.__elem_ids)
+
+    def num_blks(self):
+        """
+        get the number of element blocks
+
+        >>> num_elem_blks = reader.num_blks()
+
+        Returns
+        -------
+        num_elem_blks : int
+        """
+        return len(self.__blocks)
+
+    def num_times(self):
+        """
+        get the number of time steps
+
+        >>> num_times = reader.num_times()
+
+        Returns
+        -------
+        num_times : int
+        """
+        return len(self.__header['times'])
+
+    def get_times(self):
+        """
+        get the time values
+
+        >>> time_vals = reader.get_times()
+
+        Returns
+        -------
+        time_vals : <np_array<double>>
+        """
+        return np.array(self.__header['times'])
+
+    def get_coord_names(self):
+        """
+        get a list of length reader.num_dimensions() that has the name
+        of each model coordinate direction
+
+        >>> coord_names = reader.get_coord_names()
+
+        Returns
+        -------
+        coord_names : <list<string>>
+        """
+        return self.__header['coord_names']
+
+    def get_node_id_map(self):
+        """
+        get the sorted ids of the global nodes; the global node *INDEX*
+        ordering of all other arrays follows it
+
+        >>> node_id_map = reader.get_node_id_map()
+
+        Returns
+        -------
+        node_id_map : <np_array<int>>
+        """
+        return self.__node_ids
+
+    def get_elem_id_map(self):
+        """
+        get the ids of the global elements, block by block and sorted
+        within each block
+
+        >>> elem_id_map = reader.get_elem_id_map()
+
+        Returns
+        -------
+        elem_id_map : <np_array<int>>
+        """
+        return self.__elem_ids
+
+    def get_ids(self, objType):
+        """
+        get the element block ids
+
+        >>> elem_blk_ids = reader.get_ids('EX_ELEM_BLOCK')
+
+        Returns
+        -------
+        ids : <np_array<int>>
+        """
+        if objType != 'EX_ELEM_BLOCK':
+            raise Exception("ERROR: DecomposedExodusReader only reads element blocks")
+        return np.array(list(self.__blocks), dtype=np.int64)
+
+    def elem_blk_info(self, object_id):
+        """
+        get the element block info
+
+        >>> elem_type, num_blk_elems, num_elem_nodes, num_elem_attrs
+        ...       = reader.elem_blk_info(elem_blk_id)
+
+        Returns
+        -------
+        elem_type : bytes
+        num_blk_elems : int
+        num_elem_nodes : int
+        num_elem_attrs : int
+            always 0; attributes are not read
+        """
+        elem_type, num_elems, nodes_per_elem = self.__blocks[object_id]
+        return elem_type, num_elems, nodes_per_elem, 0
+
+    def get_coords(self):
+        """
+        get the global model coordinates
+
+        >>> x_coords, y_coords, z_coords = reader.get_coords()
+
+        Returns
+        -------
+        x_coords, y_coords, z_coords : <np_array<double>>
+        """
+        return tuple(self.__coords)
+
+    def get_elem_connectivity(self, object_id):
+        """
+        get the nodal connectivity of a block in global node *INDICES*,
+        the number of elements, and the number of nodes per element
+
+        >>> elem_conn, num_blk_elems, num_elem_nodes
+        ...         = reader.get_elem_connectivity(elem_blk_id)
+
+        Returns
+        -------
+        elem_conn : <np_array<int>>
+        num_blk_elems : int
+        num_elem_nodes : int
+        """
+        connectivity = self.__connect[object_id]
+        return connectivity.reshape(-1), connectivity.shape[0], connectivity.shape[1]
+
+    # --------------------------------------------------------------------
+
+    def get_variable_names(self, objType):
+        """
+        get the list of variable names of 'EX_GLOBAL', 'EX_NODAL' or
+        'EX_ELEM_BLOCK' variables
+
+        >>> nvar_names = reader.get_variable_names('EX_NODAL')
+
+        Returns
+        -------
+        names : <list<string>>
+        """
+        return self.__header['names'][objType]
+
+    def get_global_variable_values(self, name):
+        """
+        get the values of a global variable over all time steps, as
+        written to the first piece
+
+        >>> gvar_vals = reader.get_global_variable_values(gvar_name)
+
+        Returns
+        -------
+        gvar_vals : <np_array<double>>
+        """
+        return np.array(self.__header['globals'][name])
+
+    def get_variable_block(self, objType, entityId, names=None, steps=None):
+        """
+        get the global values of several nodal or element block
+        variables over several time steps, read from all pieces in
+        parallel
+
+        >>> vals = reader.get_variable_block('EX_ELEM_BLOCK', elem_blk_id,
+        ...                                  ['stress', 'strain'], range(1, 11))
+        >>> vals[t, v, e]  # value of names[v] on element e at steps[t]
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            'EX_NODAL' or 'EX_ELEM_BLOCK'
+        entityId : int
+            element block *ID*; ignored for 'EX_NODAL'
+        names : <list<string>>, optional
+            defaults to all variables of `objType`
+        steps : <list<int>>, optional
+            1-based time steps; defaults to all
+
+        Returns
+        -------
+        vals : <np_array<double>>
+            array of shape (num_steps, num_vars, num_entries); values
+            of variables not defined on the block are NaN
+        """
+        if objType == 'EX_NODAL':
+            entityId = 0
+            numVals = self.num_nodes()
+        elif objType == 'EX_ELEM_BLOCK':
+            numVals = self.__blocks[entityId][1]
+        else:
+            raise Exception("ERROR: DecomposedExodusReader reads 'EX_NODAL' and "
+                            "'EX_ELEM_BLOCK' variables only")
+        if names is None:
+            names = self.get_variable_names(objType)
+        steps = list(range(1, self.num_times() + 1) if steps is None else steps)
+        values, spec = self.__shared.create([len(steps), len(names), numVals], np.float64,
+                                            fill=np.nan)
+        count = len(self.files)
+        self.__map(_scatter_variables, self.__pieces, [self.__shared_specs] * count,
+                   [objType] * count, [entityId] * count, [names] * count,
+                   [steps] * count, [spec] * count)
+        self.__shared.release(spec)
+        return values
+
+    def get_variable_values(self, objType, entityId, name, step):
+        """
+        get the global values of one nodal or element block variable at
+        one time step
+
+        >>> evar_vals = reader.get_variable_values('EX_ELEM_BLOCK', elem_blk_id,
+        ...                                        evar_name, time_step)
+
+        Returns
+        -------
+        vals : <np_array<double>>
+        """
+        return self.get_variable_block(objType, entityId, [name], [step])[0, 0]
+
+    def get_node_variable_values(self, name, step):
+        """
+        get the global values of a nodal variable at one time step
+
+        >>> nvar_vals = reader.get_node_variable_values(nvar_name, time_step)
+
+        Returns
+        -------
+        vals : <np_array<double>>
+        """
+        return self.get_variable_values('EX_NODAL', 0, name, step)
@@ -0,0 +1,459 @@
+"""
+exodus_diff.py compares two Exodus databases, typically a candidate and a
+baseline result of the same model, in the manner of exodiff: the sizes,
+blocks, sets, times and variable names must agree, and the coordinates
+and every global, nodal, element block, node set and side set variable at
+every time step must match to within a tolerance.
+
+>>> from exodus_diff import compare
+>>> report = compare("candidate.e", "baseline.e", rtol=1.0e-6, atol=1.0e-12)
+>>> report.passed
+>>> print(report)
+>>> worst = max(report.variables, key=lambda diff: diff.max_rel)
+>>> worst.name, worst.max_rel, worst.max_rel_location
+
+The variables are streamed one (object, variable, time step) array at a
+time through buffers reused across steps, so memory use is a few arrays
+the size of the largest block rather than the whole model.  Each block,
+set, the nodal and the global variables are compared by one worker of a
+process pool.  Two values `a` and `b` match when
+
+    |a - b| <= atol + rtol * max(|a|, |b|)
+
+or when both are NaN.
+
+It can also be run as a script, which prints the report and exits with
+status 1 if the files differ:
+
+    python exodus_diff.py candidate.e baseline.e --rtol 1e-6 --atol 1e-12
+
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+
+import numpy as np
+
+# import exodus module
+# (exodus.py should be in the same directory as this file)
+try:
+    import exodus
+except ImportError:
+    import exodus3 as exodus
+
+# object types whose variables are compared by default
+COMPARED_TYPES = ('EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK', 'EX_NODE_SET', 'EX_SIDE_SET')
+
+# pseudo object type under which the nodal coordinates are reported
+COORDINATES = 'COORDINATES'
+
+_ENTITY_NAMES = {'EX_NODAL': 'node', COORDINATES: 'node', 'EX_ELEM_BLOCK': 'element',
+                 'EX_NODE_SET': 'entry', 'EX_SIDE_SET': 'entry'}
+
+
+class VariableDifference:
+    """
+    the result of comparing one variable on one block or set over all
+    compared time steps
+
+    Attributes
+    ----------
+    obj_type : string
+        'EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK', 'EX_NODE_SET',
+        'EX_SIDE_SET' or COORDINATES
+    entity_id : int
+        block or set *ID*; 0 for global, nodal and coordinate values
+    name : string
+        variable or coordinate name
+    compared : int
+        number of value pairs compared
+    failures : int
+        number of value pairs outside the tolerance
+    max_abs, max_rel : float
+        largest absolute and relative difference, where the relative
+        difference is |a - b| / max(|a|, |b|)
+    max_abs_location, max_rel_location : tuple
+        (step, time, index, id) of the largest difference: the 1-based
+        time step (0 for coordinates) and its time, the 1-based index of
+        the entity within the block or set, and the node or element *ID*
+        where one applies (None otherwise)
+    first_failure : tuple
+        (step, time, index, id, a, b) of the first value pair outside the
+        tolerance, or None
+    """
+
+    def __init__(self, obj_type, entity_id, name):
+        self.obj_type = obj_type
+        self.entity_id = entity_id
+        self.name = name
+        self.compared = 0
+        self.failures = 0
+        self.max_abs = 0.0
+        self.max_rel = 0.0
+        self.max_abs_location = None
+        self.max_rel_location = None
+        self.first_failure = None
+
+    def __repr__(self):
+        return "VariableDifference({!r}, {}, {!r}, failures={}, max_abs={:g}, max_rel={:g})".format(
+            self.obj_type, self.entity_id, self.name, self.failures, self.max_abs, self.max_rel)
+
+    def describe(self):
+        """one line summary, in the register of exodiff's output"""
+        where = self.obj_type if self.entity_id == 0 else "{} {}".format(self.obj_type,
+                                                                         self.entity_id)
+        line = "{} {}: {} of {} values differ".format(where, self.name, self.failures,
+                                                      self.compared)
+        for label, value, location in (("abs", self.max_abs, self.max_abs_location),
+                                       ("rel", self.max_rel, self.max_rel_location)):
+            if location is not None:
+                line += "; max {} {:.6e} at {}".format(label, value,
+                                                       self.__location(location))
+        return line
+
+    def __location(self, location):
+        step, time, index, entity = location[:4]
+        text = "step {} (t={:g})".format(step, time) if step else "the coordinates"
+        noun = _ENTITY_NAMES.get(self.obj_type)
+        if noun is not None:
+            text += " {} {}".format(noun, index if entity is None else entity)
+        return text
+
+
+class ComparisonReport:
+    """
+    the outcome of `compare`: structural differences, as messages, and a
+    `VariableDifference` for every compared variable of every block or set
+
+    >>> report = compare("a.e", "b.e")
+    >>> if not report.passed:
+    ...     print(report)
+    """
+
+    def __init__(self, file_a, file_b, rtol, atol):
+        self.file_a = file_a
+        self.file_b = file_b
+        self.rtol = rtol
+        self.atol = atol
+        self.structure = []
+        self.variables = []
+        self.stopped_early = False
+
+    @property
+    def passed(self):
+        """True if the files match structurally and every value is within tolerance"""
+        return not self.structure and all(diff.failures == 0 for diff in self.variables)
+
+    def failures(self):
+        """the `VariableDifference` of each variable with values outside the tolerance"""
+        return [diff for diff in self.variables if diff.failures]
+
+    def __str__(self):
+        lines = ["{} vs {} (rtol {:g}, atol {:g})".format(self.file_a, self.file_b,
+                                                           self.rtol, self.atol)]
+        lines.extend("  " + message for message in self.structure)
+        lines.extend("  " + diff.describe() for diff in self.failures())
+        if self.stopped_early:
+            lines.append("  stopped at the first difference")
+        lines.append("  files are the same" if self.passed else "  files are different")
+        return "\n".join(lines)
+
+
+class _Comparer:
+    """
+    compares pairs of equally long value arrays through work buffers that
+    are reused for every call with the same length
+    """
+
+    def __init__(self, rtol, atol):
+        self.rtol = rtol
+        self.atol = atol
+        self.__size = -1
+
+    def __buffers(self, size):
+        if size != self.__size:
+            self.__size = size
+            self.__diff = np.empty(size)
+            self.__scale = np.empty(size)
+            self.__work = np.empty(size)
+            self.__bad = np.empty(size, dtype=bool)
+        return self.__diff, self.__scale, self.__work, self.__bad
+
+    def update(self, result, a, b, step, time, ids=None):
+        """fold the comparison of the arrays `a` and `b` at `step` into `result`"""
+        if len(a) == 0:
+            return
+        diff, scale, work, bad = self.__buffers(len(a))
+        with np.errstate(invalid='ignore', over='ignore'):
+            np.subtract(a, b, out=diff)
+        np.abs(diff, out=diff)
+        np.abs(a, out=scale)
+        np.abs(b, out=work)
+        np.maximum(scale, work, out=scale)
+        if not np.isfinite(diff.max()):
+            # NaN against NaN and infinities of the same sign match; anything else
+            # involving a NaN or an infinity is an infinite difference
+            unordered = ~np.isfinite(diff)
+            same = (a == b) | (np.isnan(a) & np.isnan(b))
+            diff[unordered] = np.where(same[unordered], 0.0, np.inf)
+            scale[unordered] = 1.0
+        np.multiply(scale, self.rtol, out=work)
+        work += self.atol
+        np.greater(diff, work, out=bad)
+        failures = int(np.count_nonzero(bad))
+        result.compared += len(a)
+        if failures:
+            index = int(np.argmax(bad))
+            if result.first_failure is None:
+                result.first_failure = (step, time, index + 1, _entity_id(ids, index),
+                                        float(a[index]), float(b[index]))
+            result.failures += failures
+        index = int(np.argmax(diff))
+        if result.max_abs_location is None or diff[index] > result.max_abs:
+            result.max_abs = float(diff[index])
+            result.max_abs_location = (step, time, index + 1, _entity_id(ids, index))
+        # relative difference, with 0 / 0 taken as 0
+        np.maximum(scale, np.finfo(np.float64).tiny, out=scale)
+        np.divide(diff, scale, out=work)
+        index = int(np.argmax(work))
+        if result.max_rel_location is None or work[index] > result.max_rel:
+            result.max_rel = float(work[index])
+            result.max_rel_location = (step, time, index + 1, _entity_id(ids, index))
+
+
+def _entity_id(ids, index):
+    return None if ids is None else int(ids[index])
+
+
+def _entry_ids(exo, objType, entity_id):
+    """the node or element *IDs* of the entries compared for one object, or None"""
+    if objType in ('EX_NODAL', COORDINATES):
+        return exo.id_index('EX_NODE_MAP').id_map
+    if objType == 'EX_ELEM_BLOCK':
+        return exo.block_id_index(objType, entity_id).id_map
+    return None
+
+
+def _num_entries(exo, objType, entity_id):
+    if objType == 'EX_ELEM_BLOCK':
+        return exo.num_elems_in_blk(entity_id)
+    return int(exo.get_set_params(objType, entity_id)[0])
+
+
+def _compare_entity(file_a, file_b, objType, entity_id, names, steps, times, rtol, atol,
+                    fail_fast):
+    """compare the variables `names` of one object of both files over `steps`"""
+    comparer = _Comparer(rtol, atol)
+    results = []
+    with exodus.exodus(file_a, mode='r', array_type='numpy') as exo_a, \
+            exodus.exodus(file_b, mode='r', array_type='numpy') as exo_b:
+        ids = _entry_ids(exo_a, objType, entity_id)
+        if objType == COORDINATES:
+            for name, a, b in zip(names, exo_a.get_coords(), exo_b.get_coords()):
+                results.append(VariableDifference(objType, entity_id, name))
+                comparer.update(results[-1], a, b, 0, 0.0, ids)
+            return results
+
+        if objType == 'EX_GLOBAL':
+            index_a = [list(exo_a.get_variable_names(objType)).index(name) for name in names]
+            index_b = [list(exo_b.get_variable_names(objType)).index(name) for name in names]
+            results = [VariableDifference(objType, entity_id, name) for name in names]
+            for step, time in zip(steps, times):
+                values_a = exo_a.get_all_global_variable_values(step)
+                values_b = exo_b.get_all_global_variable_values(step)
+                for result, i, j in zip(results, index_a, index_b):
+                    comparer.update(result, values_a[i:i + 1], values_b[j:j + 1], step, time)
+                if fail_fast and any(result.failures for result in results):
+                    break
+            return results
+
+        size = exo_a.num_nodes() if objType == 'EX_NODAL' else _num_entries(exo_a, objType,
+                                                                              entity_id)
+        values_a = np.empty(size)
+        values_b = np.empty(size)
+        for name in names:
+            results.append(VariableDifference(objType, entity_id, name))
+            for step, time in zip(steps, times):
+                exo_a.get_variable_values(objType, entity_id, name, step, out=values_a)
+                exo_b.get_variable_values(objType, entity_id, name, step, out=values_b)
+                comparer.update(results[-1], values_a, values_b, step, time, ids)
+                if fail_fast and results[-1].failures:
+                    return results
+    return results
+
+
+def _plan(report, exo_a, exo_b, objTypes, names, steps, coordinates):
+    """
+    record the structural differences of the two files in `report` and
+    return the compared steps, their times and the per-object tasks
+    """
+    def differ(label, a, b):
+        if a != b:
+            report.structure.append("{}: {} vs {}".format(label, a, b))
+        return a != b
+
+    differ("number of dimensions", exo_a.num_dimensions(), exo_b.num_dimensions())
+    same_nodes = not differ("number of nodes", exo_a.num_nodes(), exo_b.num_nodes())
+    differ("number of elements", exo_a.num_elems(), exo_b.num_elems())
+
+    times_a = list(exo_a.get_times())
+    times_b = list(exo_b.get_times())
+    differ("number of time steps", len(times_a), len(times_b))
+    common_steps = min(len(times_a), len(times_b))
+    steps = list(range(1, common_steps + 1) if steps is None else steps)
+    if any(not 1 <= step <= common_steps for step in steps):
+        raise Exception("ERROR: steps must lie in 1..{}, the steps of both files".format(
+            common_steps))
+    for step in steps:
+        a, b = times_a[step - 1], times_b[step - 1]
+        if abs(a - b) > report.atol + report.rtol * max(abs(a), abs(b)):
+            report.structure.append("time of step {}: {} vs {}".format(step, a, b))
+            break
+    times = [times_a[step - 1] for step in steps]
+
+    tasks = []
+    if coordinates and same_nodes and exo_a.num_dimensions() == exo_b.num_dimensions():
+        tasks.append((COORDINATES, 0, list(exo_a.get_coord_names())))
+    for objType in objTypes:
+        if objType not in COMPARED_TYPES:
+            raise Exception("ERROR: cannot compare {} variables; use one of {}".format(
+                objType, COMPARED_TYPES))
+        names_a = list(exo_a.get_variable_names(objType))
+        names_b = list(exo_b.get_variable_names(objType))
+        for name in names_a + names_b:
+            if (name in names_a) != (name in names_b):
+                report.structure.append("{} variable {} only in {}".format(
+                    objType, name, report.file_a if name in names_a else report.file_b))
+        common = [name for name in names_a
+                  if name in names_b and (names is None or name in names)]
+        if not common or not steps:
+            continue
+        if objType == 'EX_GLOBAL' or (objType == 'EX_NODAL' and same_nodes):
+            tasks.append((objType, 0, common))
+            continue
+        if objType == 'EX_NODAL':
+            continue
+        ids_a = list(exo_a.get_ids(objType))
+        ids_b = list(exo_b.get_ids(objType))
+        for entity_id in ids_a + ids_b:
+            if (entity_id in ids_a) != (entity_id in ids_b):
+                report.structure.append("{} {} only in {}".format(
+                    objType, entity_id, report.file_a if entity_id in ids_a else report.file_b))
+        for entity_id in ids_a:
+            if entity_id not in ids_b:
+                continue
+            if differ("size of {} {}".format(objType, entity_id),
+                      _num_entries(exo_a, objType, entity_id),
+                      _num_entries(exo_b, objType, entity_id)):
+                continue
+            truth_a = exo_a.get_variable_truth_table(objType, entity_id)
+            truth_b = exo_b.get_variable_truth_table(objType, entity_id)
+            defined = []
+            for name in common:
+                in_a = bool(truth_a[names_a.index(name)])
+                if differ("{} {} defines {}".format(objType, entity_id, name), in_a,
+                          bool(truth_b[names_b.index(name)])):
+                    continue
+                if in_a:
+                    defined.append(name)
+            if defined:
+                tasks.append((objType, entity_id, defined))
+    return steps, times, tasks
+
+
+def compare(file_a, file_b, rtol=1.0e-6, atol=0.0, objTypes=COMPARED_TYPES, names=None,
+            steps=None, coordinates=True, fail_fast=False, processes=None):
+    """
+    compare two exodus databases, one block or set per worker process
+
+    >>> report = compare("candidate.e", "baseline.e", rtol=1.0e-8, atol=1.0e-14,
+    ...                  objTypes=['EX_NODAL'], names=['disp_x'], fail_fast=True)
+    >>> report.passed, report.failures()
+
+    Parameters
+    ----------
+    file_a, file_b : string
+        exodus databases to compare
+    rtol, atol : float
+        relative and absolute tolerance; `a` and `b` match when
+        |a - b| <= atol + rtol * max(|a|, |b|)
+    objTypes : <list<string>>, optional
+        object types whose variables are compared, from COMPARED_TYPES
+    names : <list<string>>, optional
+        variables to compare; defaults to all variables present in both
+        files
+    steps : <list<int>>, optional
+        1-based indices of the time steps to compare; defaults to all
+        steps present in both files
+    coordinates : bool
+        also compare the nodal coordinates
+    fail_fast : bool
+        stop at the first value outside the tolerance, or before comparing
+        any values if the files differ structurally; objects already being
+        compared by other workers are finished
+    processes : int, optional
+        number of worker processes; defaults to the number of CPUs, and 1
+        compares everything in this process
+
+    Returns
+    -------
+    report : `ComparisonReport`
+    """
+    report = ComparisonReport(file_a, file_b, rtol, atol)
+    with exodus.exodus(file_a, mode='r') as exo_a, exodus.exodus(file_b, mode='r') as exo_b:
+        steps, times, tasks = _plan(report, exo_a, exo_b, objTypes, names, steps, coordinates)
+    if fail_fast and report.structure:
+        report.stopped_early = bool(tasks)
+        return report
+
+    args = [(file_a, file_b, objType, entity_id, task_names, steps, times, rtol, atol, fail_fast)
+            for objType, entity_id, task_names in tasks]
+    results = [None] * len(args)
+    workers = min(processes or os.cpu_count() or 1, max(len(args), 1))
+    if workers <= 1:
+        for position, arg in enumerate(args):
+            results[position] = _compare_entity(*arg)
+            if fail_fast and any(diff.failures for diff in results[position]):
+                break
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_compare_entity, *arg): position
+                       for position, arg in enumerate(args)}
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+                if fail_fast and any(diff.failures for diff in future.result()):
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    report.stopped_early = fail_fast and any(block is None for block in results)
+    report.variables = [diff for block in results if block is not None for diff in block]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="compare two exodus databases; exits with status 1 if they differ")
+    parser.add_argument('file_a')
+    parser.add_argument('file_b')
+    parser.add_argument('--rtol', type=float, default=1.0e-6, help="relative tolerance")
+    parser.add_argument('--atol', type=float, default=0.0, help="absolute tolerance")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="stop at the first difference")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="number of worker processes (default: number of CPUs)")
+    args = parser.parse_args(argv)
+    report = compare(args.file_a, args.file_b, rtol=args.rtol, atol=args.atol,
+                     fail_fast=args.fail_fast, processes=args.processes)
+    print(report)
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,734 @@
+"""
+exodus_mmap.py is a read-only reader of Exodus files stored in the classic,
+64-bit offset or 64-bit data (CDF-5) netCDF formats that does not use the
+exodus or netCDF libraries.
+
+The netCDF header is parsed once when the file is opened and the file is
+mapped into memory with `numpy.memmap`.  Coordinates, connectivity, maps and
+variable values are returned as read-only numpy views of that mapping, so no
+data is read or copied until it is touched, and processes reading the same
+file share the operating system page cache instead of each holding a private
+copy.  The arrays keep the byte order of the file (big-endian); numpy
+converts on use, and `numpy.ascontiguousarray(a, dtype=float)` makes a
+native copy when one is needed.
+
+>>> from exodus_mmap import exodus_mmap
+>>> with exodus_mmap("results.e") as exo:
+...     x, y, z = exo.get_coords()
+...     temp = exo.get_node_variable_values("temp", exo.num_times())
+
+The methods are a read-only subset of those of `exodus.exodus`, with the
+same names, arguments and return values as when that class is opened with
+`array_type='numpy'`.  Files in the netCDF-4 (HDF5) format are not
+supported and must be read through `exodus.exodus`.
+
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+"""
+
+import struct
+
+import numpy as np
+
+# netCDF-3 header tags and external types
+NC_DIMENSION = 0x0A
+NC_VARIABLE = 0x0B
+NC_ATTRIBUTE = 0x0C
+NC_STREAMING = 0xFFFFFFFF
+
+NC_TYPES = {
+    1: np.dtype('>i1'),   # NC_BYTE
+    2: np.dtype('S1'),    # NC_CHAR
+    3: np.dtype('>i2'),   # NC_SHORT
+    4: np.dtype('>i4'),   # NC_INT
+    5: np.dtype('>f4'),   # NC_FLOAT
+    6: np.dtype('>f8'),   # NC_DOUBLE
+    7: np.dtype('>u1'),   # NC_UBYTE
+    8: np.dtype('>u2'),   # NC_USHORT
+    9: np.dtype('>u4'),   # NC_UINT
+    10: np.dtype('>i8'),  # NC_INT64
+    11: np.dtype('>u8'),  # NC_UINT64
+}
+
+# netCDF names of the entities of each object type: (count dimension, id
+# variable, entry count dimension, name variable, variable-name variable,
+# truth table, values variable prefix and suffix)
+OBJ_TYPES = {
+    'EX_ELEM_BLOCK': ('num_el_blk', 'eb_prop1', 'num_el_in_blk', 'eb_names',
+                      'name_elem_var', 'elem_var_tab', 'vals_elem_var', 'eb'),
+    'EX_NODE_SET': ('num_node_sets', 'ns_prop1', 'num_nod_ns', 'ns_names',
+                    'name_nset_var', 'nset_var_tab', 'vals_nset_var', 'ns'),
+    'EX_SIDE_SET': ('num_side_sets', 'ss_prop1', 'num_side_ss', 'ss_names',
+                    'name_sset_var', 'sset_var_tab', 'vals_sset_var', 'ss'),
+}
+
+VAR_NAMES = {
+    'EX_GLOBAL': 'name_glo_var',
+    'EX_NODAL': 'name_nod_var',
+}
+
+
+def _round4(size):
+    return (size + 3) & ~3
+
+
+class _netcdf_variable:
+    """location and layout of one variable in a netCDF-3 file"""
+
+    def __init__(self, name, dims, attributes, dtype, begin, is_record):
+        self.name = name
+        self.dims = dims
+        self.attributes = attributes
+        self.dtype = dtype
+        self.begin = begin
+        self.is_record = is_record
+
+
+class _header_parser:
+    """reads the netCDF-3 header at the start of a buffer"""
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+        magic = bytes(buf[:4])
+        if magic[:3] != b'CDF' or magic[3] not in (1, 2, 5):
+            raise Exception("ERROR: not a classic, 64-bit offset or 64-bit data netCDF file")
+        self.version = magic[3]
+        self.pos = 4
+        self.count_format = '>Q' if self.version == 5 else '>I'
+        self.offset_format = '>I' if self.version == 1 else '>Q'
+
+    def unpack(self, fmt):
+        value = struct.unpack_from(fmt, self.buf, self.pos)[0]
+        self.pos += struct.calcsize(fmt)
+        return value
+
+    def count(self):
+        return self.unpack(self.count_format)
+
+    def name(self):
+        length = self.count()
+        value = bytes(self.buf[self.pos:self.pos + length]).decode('utf-8')
+        self.pos += _round4(length)
+        return value
+
+    def list_header(self, tag):
+        found = self.unpack('>I')
+        num = self.count()
+        if found == 0 and num == 0:
+            return 0
+        if found != tag:
+            raise Exception("ERROR: malformed netCDF header")
+        return num
+
+    def attributes(self):
+        attributes = {}
+        for _ in range(self.list_header(NC_ATTRIBUTE)):
+            name = self.name()
+            dtype = NC_TYPES[self.unpack('>I')]
+            num = self.count()
+            raw = bytes(self.buf[self.pos:self.pos + num * dtype.itemsize])
+            self.pos += _round4(num * dtype.itemsize)
+            if dtype.kind == 'S':
+                attributes[name] = raw.split(b'\0', 1)[0].decode('utf-8', 'replace')
+            else:
+                values = np.frombuffer(raw, dtype=dtype)
+                attributes[name] = values[0].item() if num == 1 else values.copy()
+        return attributes
+
+    def parse(self):
+        numrecs = self.count()
+        dims = []
+        for _ in range(self.list_header(NC_DIMENSION)):
+            dims.append((self.name(), self.count()))
+        global_attributes = self.attributes()
+        variables = {}
+        for _ in range(self.list_header(NC_VARIABLE)):
+            name = self.name()
+            dimids = [self.count() for _ in range(self.count())]
+            attributes = self.attributes()
+            dtype = NC_TYPES[self.unpack('>I')]
+            self.count()  # vsize; recomputed below as it may overflow
+            begin = self.unpack(self.offset_format)
+            is_record = bool(dimids) and dims[dimids[0]][1] == 0
+            shape = [dims[dimid][1] for dimid in dimids]
+            variables[name] = _netcdf_variable(name, shape, attributes, dtype, begin, is_record)
+        return numrecs, dict(dims), global_attributes, variables
+
+
+class exodus_mmap:
+    """
+    Read-only, memory-mapped view of an Exodus file in a classic netCDF
+    format
+    """
+
+    def __init__(self, file):
+        """
+        Open an Exodus file for memory-mapped reading.
+
+        >>> exo = exodus_mmap(file_name)
+
+        Parameters
+        ----------
+        file : string
+            name of the exodus file to open
+        """
+        self.fileName = str(file)
+        self.__map = np.memmap(self.fileName, dtype=np.uint8, mode='r')
+        numrecs, self.__dims, self.__attributes, self.__vars = \
+            _header_parser(self.__map).parse()
+        record_vars = [var for var in self.__vars.values() if var.is_record]
+        sizes = [int(np.prod(var.dims[1:], dtype=np.int64)) * var.dtype.itemsize
+                 for var in record_vars]
+        if len(record_vars) == 1:
+            self.__record_size = sizes[0]
+        else:
+            self.__record_size = sum(_round4(size) for size in sizes)
+        if numrecs == NC_STREAMING and record_vars:
+            first = min(var.begin for var in record_vars)
+            numrecs = (self.__map.size - first) // self.__record_size
+        self.__numrecs = numrecs
+        self.__cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        release the mapping of the file; arrays returned earlier keep it
+        alive until they are deleted
+
+        >>> exo.close()
+        """
+        self.__cache.clear()
+        self.__map = None
+
+    # --------------------------------------------------------------------
+
+    def __has(self, name):
+        return name in self.__vars
+
+    def __array(self, name):
+        """zero-copy view of a netCDF variable; record variables include all records"""
+        if name not in self.__cache:
+            if name not in self.__vars:
+                raise Exception("ERROR: variable " + name + " not found in " + self.fileName)
+            var = self.__vars[name]
+            shape = list(var.dims)
+            strides = []
+            stride = var.dtype.itemsize
+            for size in reversed(shape[1:] if var.is_record else shape):
+                strides.insert(0, stride)
+                stride *= size
+            if var.is_record:
+                shape[0] = self.__numrecs
+                strides.insert(0, self.__record_size)
+            self.__cache[name] = np.ndarray(tuple(shape), dtype=var.dtype, buffer=self.__map,
+                                            offset=var.begin, strides=tuple(strides))
+        return self.__cache[name]
+
+    def __dim(self, name):
+        return self.__dims.get(name, 0)
+
+    def __strings(self, name):
+        if not self.__has(name):
+            return []
+        rows = self.__array(name)
+        return [row.tobytes().split(b'\0', 1)[0].decode('utf-8', 'replace').rstrip()
+                for row in rows]
+
+    def __index(self, objType, entityId):
+        """1-based index of a block or set, used in its netCDF names"""
+        ids = self.get_ids(objType)
+        matches = np.nonzero(ids == entityId)[0]
+        if len(matches) == 0:
+            raise Exception("ERROR: " + objType + " id " + str(entityId) +
+                            " not found in " + self.fileName)
+        return int(matches[0]) + 1
+
+    def __variable_index(self, objType, name):
+        names = self.get_variable_names(objType)
+        if name not in names:
+            raise ValueError("variable \"{}\" not found for {} in {}".format(
+                name, objType, self.fileName))
+        return names.index(name) + 1
+
+    # --------------------------------------------------------------------
+
+    def title(self):
+        """
+        get the database title
+
+        >>> title = exo.title()
+
+        Returns
+        -------
+        title : string
+        """
+        return self.__attributes.get('title', '')
+
+    def version_num(self):
+        """
+        get exodus version number used to create the database
+
+        >>> version = exo.version_num()
+
+        Returns
+        -------
+        version : string
+            representation of version number
+        """
+        return "%1.2f" % self.__attributes.get('version', 0.0)
+
+    def num_dimensions(self):
+        """
+        get the number of model spatial dimensions
+
+        >>> num_dims = exo.num_dimensions()
+
+        Returns
+        -------
+        num_dims : int
+        """
+        return self.__dim('num_dim')
+
+    def num_nodes(self):
+        """
+        get the number of nodes in the model
+
+        >>> num_nodes = exo.num_nodes()
+
+        Returns
+        -------
+        num_nodes : int
+        """
+        return self.__dim('num_nodes')
+
+    def num_elems(self):
+        """
+        get the number of elements in the model
+
+        >>> num_elems = exo.num_elems()
+
+        Returns
+        -------
+        num_elems : int
+        """
+        return self.__dim('num_elem')
+
+    def num_blks(self):
+        """
+        get the number of element blocks in the model
+
+        >>> num_elem_blks = exo.num_blks()
+
+        Returns
+        -------
+        num_elem_blks : int
+        """
+        return self.__dim('num_el_blk')
+
+    def num_node_sets(self):
+        """
+        get the number of node sets in the model
+
+        >>> num_node_sets = exo.num_node_sets()
+
+        Returns
+        -------
+        num_node_sets : int
+        """
+        return self.__dim('num_node_sets')
+
+    def num_side_sets(self):
+        """
+        get the number of side sets in the model
+
+        >>> num_side_sets = exo.num_side_sets()
+
+        Returns
+        -------
+        num_side_sets : int
+        """
+        return self.__dim('num_side_sets')
+
+    def num_times(self):
+        """
+        get the number of time steps
+
+        >>> num_times = exo.num_times()
+
+        Returns
+        -------
+        num_times : int
+        """
+        return self.__numrecs if self.__has('time_whole') else 0
+
+    def get_times(self):
+        """
+        get the time values
+
+        >>> time_vals = exo.get_times()
+
+        Returns
+        -------
+        time_vals : <np_array<double>>
+        """
+        if not self.__has('time_whole'):
+            return np.array([])
+        return self.__array('time_whole')
+
+    # --------------------------------------------------------------------
+
+    def get_coord_names(self):
+        """
+        get a list of length exo.num_dimensions() that has the name
+        of each model coordinate direction, e.g. ['x', 'y', 'z']
+
+        >>> coord_names = exo.get_coord_names()
+
+        Returns
+        -------
+        coord_names : <list<string>>
+        """
+        return self.__strings('coor_names')
+
+    def get_coords(self):
+        """
+        get model coordinates of all nodes; for each coordinate direction,
+        a length exo.num_nodes() list is returned
+
+        >>> x_coords, y_coords, z_coords = exo.get_coords()
+
+        Returns
+        -------
+        x_coords, y_coords, z_coords : <np_array<double>>
+            the coordinates of a direction the model does not have are
+            zero
+        """
+        if self.__has('coordx'):
+            coords = [self.__array(name) for name in ('coordx', 'coordy', 'coordz')
+                      if self.__has(name)]
+        elif self.__has('coord'):
+            coords = list(self.__array('coord'))
+        else:
+            coords = []
+        while len(coords) < 3:
+            coords.append(np.zeros(self.num_nodes()))
+        return tuple(coords)
+
+    def get_node_id_map(self):
+        """
+        get mapping of exodus node index to user- or application-defined
+        node id
+
+        >>> node_id_map = exo.get_node_id_map()
+
+        Returns
+        -------
+        node_id_map : <np_array<int>>
+        """
+        if self.__has('node_num_map'):
+            return self.__array('node_num_map')
+        return np.arange(1, self.num_nodes() + 1)
+
+    def get_elem_id_map(self):
+        """
+        get mapping of exodus element index to user- or
+        application-defined element id
+
+        >>> elem_id_map = exo.get_elem_id_map()
+
+        Returns
+        -------
+        elem_id_map : <np_array<int>>
+        """
+        if self.__has('elem_num_map'):
+            return self.__array('elem_num_map')
+        return np.arange(1, self.num_elems() + 1)
+
+    def get_ids(self, objType):
+        """
+        get mapping of exodus block/set index to user- or
+        application- defined block/set id
+
+        >>> elem_blk_ids = exo.get_ids('EX_ELEM_BLOCK')
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            'EX_ELEM_BLOCK', 'EX_NODE_SET' or 'EX_SIDE_SET'
+
+        Returns
+        -------
+        ids : <np_array<int>>
+        """
+        count_dim, id_var = OBJ_TYPES[objType][:2]
+        if self.__dim(count_dim) == 0:
+            return np.array([], dtype=np.int32)
+        return self.__array(id_var)
+
+    def get_name(self, objType, objId):
+        """
+        get the name of the specified entity_type and entity
+
+        >>> elem_blk_name = exo.get_name('EX_ELEM_BLOCK', elem_blk_id)
+
+        Returns
+        -------
+        name : string
+        """
+        names = self.get_names(objType)
+        if not names:
+            return ""
+        return names[self.__index(objType, objId) - 1]
+
+    def get_names(self, objType):
+        """
+        get a list of all block/set names ordered by block/set *INDEX*
+
+        >>> blk_names = exo.get_names('EX_ELEM_BLOCK')
+
+        Returns
+        -------
+        names : <list<string>>
+        """
+        return self.__strings(OBJ_TYPES[objType][3])
+
+    # --------------------------------------------------------------------
+
+    def elem_blk_info(self, object_id):
+        """
+        get the element block info
+
+        >>> elem_type, num_blk_elems, num_elem_nodes, num_elem_attrs
+        ...       = exo.elem_blk_info(elem_blk_id)
+
+        Parameters
+        ----------
+        object_id : int
+            element block *ID* (not *INDEX*)
+
+        Returns
+        -------
+        elem_type : bytes
+            element type, e.g. b'HEX8'
+        num_blk_elems : int
+        num_elem_nodes : int
+        num_elem_attrs : int
+        """
+        index = self.__index('EX_ELEM_BLOCK', object_id)
+        connect = "connect" + str(index)
+        if not self.__has(connect):
+            return b"NULL", 0, 0, 0
+        elem_type = self.__vars[connect].attributes.get('elem_type', '').encode('ascii')
+        num_elems, nodes_per_elem = self.__vars[connect].dims
+        return elem_type, num_elems, nodes_per_elem, self.__dim("num_att_in_blk" + str(index))
+
+    def num_elems_in_blk(self, object_id):
+        """
+        get the number of elements in an element block
+
+        >>> num_blk_elems = exo.num_elems_in_blk(elem_blk_id)
+
+        Returns
+        -------
+        num_blk_elems : int
+        """
+        return self.elem_blk_info(object_id)[1]
+
+    def get_elem_connectivity(self, object_id):
+        """
+        get the nodal connectivity, number of elements, and
+        number of nodes per element for a single block
+
+        >>> elem_conn, num_blk_elems, num_elem_nodes
+        ...         = exo.get_elem_connectivity(elem_blk_id)
+
+        Parameters
+        ----------
+        object_id : int
+            element block *ID* (not *INDEX*)
+
+        Returns
+        -------
+        elem_conn : <np_array<int>>
+            ordered list of node *INDICES* that define the connectivity of
+            each element in the block; the list cycles through all nodes of
+            the first element, then all nodes of the second element, etc.
+        num_blk_elems : int
+        num_elem_nodes : int
+        """
+        index = self.__index('EX_ELEM_BLOCK', object_id)
+        connect = "connect" + str(index)
+        if not self.__has(connect):
+            return np.array([], dtype=np.int32), 0, 0
+        conn = self.__array(connect)
+        return conn.reshape(-1), conn.shape[0], conn.shape[1]
+
+    def get_node_set_nodes(self, object_id):
+        """
+        get the list of node *INDICES* in a node set
+
+        >>> ns_nodes = exo.get_node_set_nodes(node_set_id)
+
+        Returns
+        -------
+        ns_nodes : <np_array<int>>
+        """
+        index = self.__index('EX_NODE_SET', object_id)
+        return self.__array("node_ns" + str(index))
+
+    def get_side_set(self, object_id):
+        """
+        get the lists of element and side indices in a side set; the
+        two lists correspond: together, ss_elems[i] and ss_sides[i]
+        define the face of an element
+
+        >>> ss_elems, ss_sides = exo.get_side_set(side_set_id)
+
+        Returns
+        -------
+        ss_elems : <np_array<int>>
+        ss_sides : <np_array<int>>
+        """
+        index = self.__index('EX_SIDE_SET', object_id)
+        return self.__array("elem_ss" + str(index)), self.__array("side_ss" + str(index))
+
+    # --------------------------------------------------------------------
+
+    def get_variable_names(self, objType):
+        """
+        get the list of variable names in the model for the specified object type.
+
+        >>> nar_names = exo.get_variable_names('EX_NODAL')
+
+        Returns
+        -------
+        <list<string>>  nvar_names
+        """
+        if objType in VAR_NAMES:
+            return self.__strings(VAR_NAMES[objType])
+        return self.__strings(OBJ_TYPES[objType][4])
+
+    def get_variable_number(self, objType):
+        """
+        get the number of variables of the specified type in the model
+
+        >>> num_nvars = exo.get_variable_number('EX_NODAL')
+
+        Returns
+        -------
+        num_vars : int
+        """
+        return len(self.get_variable_names(objType))
+
+    def get_variable_truth_table(self, objType):
+        """
+        gets a truth table indicating which variables are defined for
+        specified entity type; size: num_blocks * num_variables; variable
+        index cycles faster than the block index
+
+        >>> truth_tab = exo.get_variable_truth_table('EX_ELEM_BLOCK')
+
+        Returns
+        -------
+        truth_tab : <list<bool>>
+        """
+        num_vars = self.get_variable_number(objType)
+        ids = self.get_ids(objType)
+        table = OBJ_TYPES[objType][5]
+        if self.__has(table):
+            return [bool(val) for val in self.__array(table).reshape(-1)]
+        prefix, suffix = OBJ_TYPES[objType][6:]
+        return [self.__has("{}{}{}{}".format(prefix, var, suffix, index))
+                for index in range(1, len(ids) + 1) for var in range(1, num_vars + 1)]
+
+    def get_variable_values(self, objType, entityId, name, step):
+        """
+        get list of `objType` variable values for a specified object id
+        block, variable name, and time step
+
+        >>> evar_vals = exo.get_variable_values('EX_ELEM_BLOCK', elem_blk_id,
+        ...                                            evar_name, time_step)
+
+        Parameters
+        ----------
+        objType : ex_entity_type
+            'EX_NODAL', 'EX_ELEM_BLOCK', 'EX_NODE_SET' or 'EX_SIDE_SET'
+        entityId : int
+            id of the entity (block, set) *ID* (not *INDEX*); ignored for
+            'EX_NODAL'
+        name : string
+            name of variable
+        step : int
+            1-based index of time step
+
+        Returns
+        -------
+        <np_array<double>>  evar_vals
+        """
+        if not 1 <= step <= self.num_times():
+            raise Exception("ERROR: time step " + str(step) + " out of range in " +
+                            self.fileName)
+        var = self.__variable_index(objType, name)
+        if objType == 'EX_NODAL':
+            if self.__has("vals_nod_var" + str(var)):
+                return self.__array("vals_nod_var" + str(var))[step - 1]
+            return self.__array("vals_nod_var")[step - 1, var - 1]
+        prefix, suffix = OBJ_TYPES[objType][6:]
+        index = self.__index(objType, entityId)
+        values = "{}{}{}{}".format(prefix, var, suffix, index)
+        if not self.__has(values):
+            raise Exception("ERROR: variable " + name + " is not defined on " + objType +
+                            " " + str(entityId) + " in " + self.fileName)
+        return self.__array(values)[step - 1]
+
+    def get_node_variable_values(self, name, step):
+        """
+        get list of nodal variable values for a nodal variable name
+        and time step
+
+        >>> nvar_vals = exo.get_node_variable_values(nvar_name, time_step)
+
+        Returns
+        -------
+        <np_array<double>>  nvar_vals
+        """
+        return self.get_variable_values('EX_NODAL', None, name, step)
+
+    def get_global_variable_values(self, name):
+        """
+        get global variable values over all time steps for one global
+        variable name
+
+        >>> gvar_vals = exo.get_global_variable_values(gvar_name)
+
+        Returns
+        -------
+        <np_array<double>>  gvar_vals
+        """
+        var = self.__variable_index('EX_GLOBAL', name)
+        return self.__array('vals_glo_var')[:, var - 1]
+
+    def get_all_global_variable_values(self, step):
+        """
+        get all global variable values (one for each global variable
+        name, and in the order given by exo.get_variable_names('EX_GLOBAL'))
+        at a specified time step
+
+        >>> gvar_vals = exo.get_all_global_variable_values(time_step)
+
+        Returns
+        -------
+        <np_array<double>>  gvar_vals
+        """
+        if self.get_variable_number('EX_GLOBAL') == 0:
+            return np.array([])
+        return self.__array('vals_glo_var')[step - 1]
@@ -0,0 +1,409 @@
+"""
+exodus_stats.py computes summary statistics of the time histories of the
+element and nodal variables of an Exodus database: for every element (or
+node) the minimum, maximum, mean, standard deviation, quantiles and the
+times of the extremes, and the same statistics over each whole block.
+
+>>> from exodus_stats import variable_statistics, write_statistics
+>>> stats = variable_statistics("results.e", names=['stress'], processes=4)
+>>> peak = stats[(1, 'stress')]
+>>> peak.max, peak.time_of_max, peak.quantiles[0.95]
+>>> peak.summary['max'], peak.summary['entity_of_max']
+>>> write_statistics("results.e", "stress_stats.e", stats)
+
+The histories are streamed one time step at a time, so memory use does not
+grow with the number of steps: the moments are kept in Welford
+accumulators and the quantiles in a t-digest style sketch of at most
+`compression` weighted centroids per entity.  The quantiles are therefore
+estimates; they are exact at the ends of the distribution and most
+accurate near them.  Each block is processed by one worker of a process
+pool.
+
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+"""
+
+import concurrent.futures
+import os
+
+import numpy as np
+
+# import exodus module
+# (exodus.py should be in the same directory as this file)
+try:
+    import exodus
+except ImportError:
+    import exodus3 as exodus
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+# statistics written back by `write_statistics`, besides the quantiles
+STATISTIC_FIELDS = ('min', 'max', 'mean', 'std', 'time_of_min', 'time_of_max')
+
+
+class RunningMoments:
+    """
+    Welford accumulators of the mean and the sum of squared deviations of
+    each of `size` streams of values, updated one sample per stream at a
+    time, with the minimum and maximum of each stream and the time each
+    was first reached.
+
+    >>> moments = RunningMoments(num_elems)
+    >>> moments.update(values, time)
+    >>> moments.mean, moments.std()
+    """
+
+    def __init__(self, size):
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+        self.time_of_min = np.full(size, np.nan)
+        self.time_of_max = np.full(size, np.nan)
+
+    def update(self, values, time=np.nan):
+        """add one sample of every stream, taken at `time`"""
+        values = np.asarray(values, dtype=np.float64)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        lower = values < self.min
+        self.min[lower] = values[lower]
+        self.time_of_min[lower] = time
+        higher = values > self.max
+        self.max[higher] = values[higher]
+        self.time_of_max[higher] = time
+
+    def variance(self):
+        """population variance of each stream"""
+        if self.count == 0:
+            return np.full(self.mean.shape, np.nan)
+        return self.m2 / self.count
+
+    def std(self):
+        """population standard deviation of each stream"""
+        return np.sqrt(self.variance())
+
+    def combined(self):
+        """count, mean and population variance of all samples of all streams together"""
+        count = self.count * len(self.mean)
+        if count == 0:
+            return 0, np.nan, np.nan
+        mean = self.mean.mean()
+        m2 = self.m2.sum() + self.count * np.square(self.mean - mean).sum()
+        return count, mean, m2 / count
+
+
+def _compress(means, weights, compression):
+    """
+    merge the weighted centroids of each row into at most `compression`
+    centroids, bounded by the quantiles of the t-digest k1 scale function
+    so that centroids are small in the tails; empty centroids have zero
+    weight
+    """
+    rows = means.shape[0]
+    order = np.argsort(np.where(weights > 0, means, np.inf), axis=1, kind='stable')
+    means = np.take_along_axis(means, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    total = weights.sum(axis=1, keepdims=True)
+    q = (np.cumsum(weights, axis=1) - weights / 2) / np.where(total > 0, total, 1)
+    bins = np.minimum((np.arcsin(np.clip(2 * q - 1, -1, 1)) / np.pi + 0.5) * compression,
+                      compression - 1).astype(np.int64)
+    keys = (np.arange(rows)[:, None] * compression + bins).ravel()
+    size = rows * compression
+    new_weights = np.bincount(keys, weights.ravel(), minlength=size).reshape(rows, compression)
+    sums = np.bincount(keys, np.where(weights > 0, weights * means, 0).ravel(),
+                       minlength=size).reshape(rows, compression)
+    new_means = sums / np.where(new_weights > 0, new_weights, 1)
+    return new_means, new_weights
+
+
+class QuantileSketch:
+    """
+    t-digest style sketch of the distribution of each of `size` streams of
+    values: at most `compression` weighted centroids per stream, plus a
+    buffer of up to `buffer_size` samples that is merged into the
+    centroids when it is full.
+
+    >>> sketch = QuantileSketch(num_elems, compression=64)
+    >>> sketch.update(values)
+    >>> p95 = sketch.quantile(0.95, low=moments.min, high=moments.max)
+    """
+
+    def __init__(self, size, compression=64, buffer_size=32):
+        if compression < 2:
+            raise Exception("ERROR: a quantile sketch needs a compression of at least 2")
+        self.compression = compression
+        self.means = np.zeros((size, 0))
+        self.weights = np.zeros((size, 0))
+        self.__buffer = np.empty((size, max(buffer_size, 1)))
+        self.__buffered = 0
+        self.__compacted = None
+
+    def update(self, values):
+        """add one sample of every stream"""
+        self.__buffer[:, self.__buffered] = values
+        self.__buffered += 1
+        if self.__buffered == self.__buffer.shape[1]:
+            self.flush()
+
+    def flush(self):
+        """merge the buffered samples into the centroids"""
+        if self.__buffered == 0:
+            return
+        means = np.concatenate([self.means, self.__buffer[:, :self.__buffered]], axis=1)
+        weights = np.concatenate([self.weights, np.ones((len(means), self.__buffered))], axis=1)
+        self.means, self.weights = _compress(means, weights, self.compression)
+        self.__buffered = 0
+        self.__compacted = None
+
+    def combined(self):
+        """a one-stream sketch of all samples of all streams together"""
+        self.flush()
+        sketch = QuantileSketch(1, self.compression)
+        sketch.means, sketch.weights = _compress(self.means.reshape(1, -1),
+                                                 self.weights.reshape(1, -1), self.compression)
+        return sketch
+
+    def quantile(self, q, low=None, high=None):
+        """
+        estimate the `q` quantile (0 <= q <= 1) of each stream by linear
+        interpolation between the centroids; `low` and `high`, the exact
+        minimum and maximum of each stream if known, anchor the ends
+        """
+        self.flush()
+        rows = len(self.means)
+        if self.__compacted is None:
+            # the filled centroids first, still in order; kept until the next flush
+            order = np.argsort(self.weights <= 0, axis=1, kind='stable')
+            self.__compacted = (np.take_along_axis(self.means, order, axis=1),
+                                np.take_along_axis(self.weights, order, axis=1))
+        means, weights = self.__compacted
+        total = weights.sum(axis=1)
+        filled = weights > 0
+        last = np.maximum(filled.sum(axis=1) - 1, 0)
+        first_mean = means[:, 0] if means.shape[1] else np.full(rows, np.nan)
+        last_mean = means[np.arange(rows), last] if means.shape[1] else np.full(rows, np.nan)
+        low = first_mean if low is None else np.broadcast_to(low, (rows,))
+        high = last_mean if high is None else np.broadcast_to(high, (rows,))
+        # the centroid midpoints, with the extremes at cumulative weight 0 and total
+        mids = np.where(filled, np.cumsum(weights, axis=1) - weights / 2, total[:, None])
+        means = np.where(filled, means, high[:, None])
+        x = np.concatenate([np.zeros((rows, 1)), mids, total[:, None]], axis=1)
+        y = np.concatenate([low[:, None], means, high[:, None]], axis=1)
+        target = q * total
+        upper = np.minimum((x < target[:, None]).sum(axis=1), x.shape[1] - 1)
+        lower = np.maximum(upper - 1, 0)
+        x0, x1 = x[np.arange(rows), lower], x[np.arange(rows), upper]
+        y0, y1 = y[np.arange(rows), lower], y[np.arange(rows), upper]
+        span = x1 - x0
+        fraction = np.where(span > 0, (target - x0) / np.where(span > 0, span, 1), 1.0)
+        result = y0 + fraction * (y1 - y0)
+        return np.where(total > 0, result, np.nan)
+
+
+class VariableStatistics:
+    """
+    Statistics of one variable on one block (block *ID* 0 for nodal
+    variables) over the time steps read.
+
+    Per-entity arrays, in block *INDEX* order: `min`, `max`, `mean`,
+    `std`, `time_of_min`, `time_of_max` and `quantiles`, a dict mapping
+    each requested quantile to an array.  `summary` holds the same
+    statistics over all entities and steps of the block, together with
+    `entity_of_min` and `entity_of_max`, the 1-based *INDEX* within the
+    block of the entity where each extreme was reached.
+    """
+
+    def __init__(self, name, block_id, moments, sketch, quantiles):
+        self.name = name
+        self.block_id = block_id
+        self.count = moments.count
+        self.min = moments.min
+        self.max = moments.max
+        self.mean = moments.mean
+        self.std = moments.std()
+        self.time_of_min = moments.time_of_min
+        self.time_of_max = moments.time_of_max
+        self.quantiles = {q: sketch.quantile(q, moments.min, moments.max) for q in quantiles}
+        self.summary = {'count': self.count * len(self.mean)}
+        if len(self.mean) == 0 or self.count == 0:
+            return
+        _, mean, variance = moments.combined()
+        entity_of_min = int(np.argmin(self.min))
+        entity_of_max = int(np.argmax(self.max))
+        block = sketch.combined()
+        self.summary.update({
+            'min': self.min[entity_of_min], 'max': self.max[entity_of_max],
+            'mean': mean, 'std': np.sqrt(variance),
+            'time_of_min': self.time_of_min[entity_of_min],
+            'time_of_max': self.time_of_max[entity_of_max],
+            'entity_of_min': entity_of_min + 1, 'entity_of_max': entity_of_max + 1,
+            'quantiles': {q: block.quantile(q, self.min[entity_of_min],
+                                            self.max[entity_of_max])[0] for q in quantiles}})
+
+    def __repr__(self):
+        return "VariableStatistics({!r}, block {}, {} entities, {} steps)".format(
+            self.name, self.block_id, len(self.mean), self.count)
+
+
+def _block_statistics(path, objType, block_id, names, steps, quantiles, compression):
+    """stream every variable of one block over the steps, in a worker process"""
+    with exodus.exodus(path, mode='r', array_type='numpy') as exo:
+        times = exo.get_times()
+        moments = {}
+        sketches = {}
+        for step in steps:
+            for name in names:
+                values = exo.get_variable_values(objType, block_id, name, step)
+                if name not in moments:
+                    moments[name] = RunningMoments(len(values))
+                    sketches[name] = QuantileSketch(len(values), compression)
+                moments[name].update(values, times[step - 1])
+                sketches[name].update(values)
+    return [VariableStatistics(name, block_id, moments[name], sketches[name], quantiles)
+            for name in names if name in moments]
+
+
+def variable_statistics(path, objType='EX_ELEM_BLOCK', names=None, block_ids=None, steps=None,
+                        quantiles=DEFAULT_QUANTILES, compression=64, processes=None):
+    """
+    compute the statistics of the time histories of element or nodal
+    variables, one block per worker process
+
+    >>> stats = variable_statistics("results.e", names=['stress'], steps=range(10, 101))
+    >>> stats[(1, 'stress')].quantiles[0.5]
+
+    Parameters
+    ----------
+    path : string
+        exodus database to read
+    objType : string
+        'EX_ELEM_BLOCK' or 'EX_NODAL'
+    names : <list<string>>, optional
+        variables to summarize; defaults to all variables of `objType`
+    block_ids : <list<int>>, optional
+        element blocks to summarize; defaults to all blocks (ignored for
+        nodal variables)
+    steps : <list<int>>, optional
+        1-based indices of the time steps to read; defaults to all
+    quantiles : <list<float>>
+        quantiles to estimate, each between 0 and 1
+    compression : int
+        centroids kept per entity by the quantile sketches; larger is
+        more accurate and uses more memory
+    processes : int, optional
+        number of worker processes; defaults to the number of CPUs, and 1
+        computes everything in this process
+
+    Returns
+    -------
+    stats : dict
+        maps (block *ID*, variable name) to `VariableStatistics`; a
+        variable is skipped on blocks where the truth table marks it as
+        undefined
+    """
+    if objType not in ('EX_ELEM_BLOCK', 'EX_NODAL'):
+        raise Exception("ERROR: statistics are only computed for 'EX_ELEM_BLOCK' and "
+                        "'EX_NODAL' variables, not {}.".format(objType))
+    if any(not 0 <= q <= 1 for q in quantiles):
+        raise Exception("ERROR: quantiles must be between 0 and 1")
+    with exodus.exodus(path, mode='r') as exo:
+        all_names = list(exo.get_variable_names(objType))
+        names = all_names if names is None else list(names)
+        unknown = [name for name in names if name not in all_names]
+        if unknown:
+            raise Exception("ERROR: no {} variables {} in {}".format(objType, unknown, path))
+        steps = list(range(1, exo.num_times() + 1) if steps is None else steps)
+        tasks = []
+        if objType == 'EX_NODAL':
+            tasks.append((0, names))
+        else:
+            for block_id in exo.get_ids(objType) if block_ids is None else block_ids:
+                truth = exo.get_variable_truth_table(objType, block_id)
+                defined = [name for name in names if truth[all_names.index(name)]]
+                if defined:
+                    tasks.append((block_id, defined))
+
+    workers = min(processes or os.cpu_count() or 1, max(len(tasks), 1))
+    args = [(path, objType, block_id, block_names, steps, tuple(quantiles), compression)
+            for block_id, block_names in tasks]
+    if workers <= 1:
+        results = [_block_statistics(*arg) for arg in args]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_block_statistics, *zip(*args)))
+    return {(stat.block_id, stat.name): stat for block in results for stat in block}
+
+
+def _field_name(name, field):
+    if isinstance(field, float):
+        return "{}_p{:g}".format(name, 100 * field)
+    return "{}_{}".format(name, field)
+
+
+def write_statistics(path, output, statistics, fields=STATISTIC_FIELDS, clobber=False):
+    """
+    copy the mesh of `path` to `output` and store the per-entity
+    statistics as variables named '<variable>_<field>' ('<variable>_p95'
+    for the 0.95 quantile) at a single time step, at the time of the last
+    step of `path`
+
+    >>> write_statistics("results.e", "stress_stats.e", stats, fields=('max', 0.95))
+
+    Parameters
+    ----------
+    path : string
+        exodus database the statistics were computed from
+    output : string
+        exodus database to create
+    statistics : dict
+        as returned by `variable_statistics`
+    fields : <list<string or float>>
+        statistics to store: names of `STATISTIC_FIELDS` and quantiles
+    clobber : bool
+        replace `output` if it exists
+    """
+    for field in fields:
+        if isinstance(field, float):
+            if any(field not in stat.quantiles for stat in statistics.values()):
+                raise Exception("ERROR: quantile {} was not computed".format(field))
+        elif field not in STATISTIC_FIELDS:
+            raise Exception("ERROR: unknown statistic " + str(field))
+    if os.path.exists(output):
+        if not clobber:
+            raise Exception("ERROR: Cowardly not writing " + output + ". File already exists.")
+        os.remove(output)
+    nodal = sorted({stat.name for (block_id, _), stat in statistics.items() if block_id == 0})
+    element = {}
+    for (block_id, name), stat in statistics.items():
+        if block_id != 0:
+            element.setdefault(block_id, []).append(name)
+    with exodus.exodus(path, mode='r') as source:
+        times = source.get_times()
+        with exodus.copy_mesh(path, output, exoFromObj=source) as out:
+            schema = {}
+            if nodal:
+                schema['EX_NODAL'] = [_field_name(name, f) for name in nodal for f in fields]
+            if element:
+                all_names = sorted({name for names in element.values() for name in names})
+                schema['EX_ELEM_BLOCK'] = (
+                    [_field_name(name, f) for name in all_names for f in fields],
+                    {block_id: [_field_name(name, f) for name in names for f in fields]
+                     for block_id, names in element.items()})
+            out.define_results(schema)
+            out.put_time(1, times[-1] if len(times) else 0.0)
+            for (block_id, name), stat in statistics.items():
+                for field in fields:
+                    values = stat.quantiles[field] if isinstance(field, float) \
+                        else getattr(stat, field)
+                    if block_id == 0:
+                        out.put_node_variable_values(_field_name(name, field), 1, values)
+                    else:
+                        out.put_variable_values('EX_ELEM_BLOCK', block_id,
+                                                _field_name(name, field), 1, values)
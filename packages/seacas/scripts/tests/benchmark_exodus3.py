@@ -0,0 +1,484 @@
+#!/usr/bin/env python
+"""
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+
+Timing harness for exodus.py.  Each benchmark writes a structured hex
+mesh into a temporary directory and reports the best wall time over a
+number of repetitions.  With --json the results, the arguments and the
+versions of exodus.py, numpy and Python are also written as JSON, so
+runs of different releases can be compared by a script.
+
+>>> python benchmark_exodus3.py --size 40 --steps 20 probe
+>>> python benchmark_exodus3.py --elements 1e4 1e5 1e6 1e7 --steps 10 --json suite.json suite
+"""
+
+import argparse
+import contextlib
+import ctypes
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ACCESS = os.getenv('ACCESS', '@ACCESSDIR@')
+sys.path.append(os.path.join(ACCESS, "lib"))
+import exodus as exo
+import numpy as np
+
+
+def write_hex_mesh(path, size, num_steps, num_node_vars=2, num_elem_vars=2,
+                   write_profile=None):
+    """
+    write a size x size x size HEX8 mesh in a single block with `num_steps`
+    time steps of nodal and element variables; returns the number of bytes
+    of coordinates, connectivity, maps and variable values written
+    """
+    num_nodes_1d = size + 1
+    num_nodes = num_nodes_1d ** 3
+    num_elems = size ** 3
+    grid = np.arange(num_nodes_1d, dtype=np.float64)
+    z_coords, y_coords, x_coords = (c.ravel() for c in np.meshgrid(grid, grid, grid, indexing='ij'))
+
+    i, j, k = (c.ravel() for c in np.meshgrid(np.arange(size), np.arange(size),
+                                              np.arange(size), indexing='ij'))
+    base = 1 + k + num_nodes_1d * (j + num_nodes_1d * i)
+    layer = num_nodes_1d * num_nodes_1d
+    connectivity = np.stack([base, base + 1, base + 1 + num_nodes_1d, base + num_nodes_1d,
+                             base + layer, base + layer + 1, base + layer + 1 + num_nodes_1d,
+                             base + layer + num_nodes_1d], axis=1).astype(np.int32).ravel()
+
+    with exo.exodus(path, mode='w', array_type='numpy', title="benchmark mesh", numDims=3,
+                    numNodes=num_nodes, numElems=num_elems, numBlocks=1, numNodeSets=0,
+                    numSideSets=0, write_profile=write_profile) as exofile:
+        exofile.put_coords(x_coords, y_coords, z_coords)
+        exofile.put_elem_blk_info(1, 'HEX8', num_elems, 8, 0)
+        exofile.put_elem_connectivity(1, connectivity)
+        exofile.put_node_id_map(np.arange(1, num_nodes + 1, dtype=np.int32))
+        exofile.put_elem_id_map(np.arange(1, num_elems + 1, dtype=np.int32))
+        exofile.set_node_variable_number(num_node_vars)
+        for index in range(num_node_vars):
+            exofile.put_node_variable_name("nvar{}".format(index + 1), index + 1)
+        exofile.set_element_variable_number(num_elem_vars)
+        for index in range(num_elem_vars):
+            exofile.put_element_variable_name("evar{}".format(index + 1), index + 1)
+        node_values = np.empty(num_nodes)
+        elem_values = np.empty(num_elems)
+        for step in range(1, num_steps + 1):
+            exofile.put_time(step, float(step))
+            for index in range(num_node_vars):
+                node_values[:] = x_coords * step + index
+                exofile.put_node_variable_values("nvar{}".format(index + 1), step, node_values)
+            for index in range(num_elem_vars):
+                elem_values[:] = np.arange(num_elems) * step + index
+                exofile.put_variable_values('EX_ELEM_BLOCK', 1, "evar{}".format(index + 1),
+                                            step, elem_values)
+    return (3 * 8 * num_nodes + 8 * 4 * num_elems + 4 * (num_nodes + num_elems) +
+            8 * num_steps * (num_node_vars * num_nodes + num_elem_vars * num_elems))
+
+
+def read_hex_mesh(path):
+    """read back everything `write_hex_mesh` wrote"""
+    with exo.exodus(path, mode='r', array_type='numpy') as exofile:
+        exofile.get_coords()
+        exofile.get_elem_connectivity(1)
+        exofile.get_node_id_map()
+        exofile.get_elem_id_map()
+        for objType in ['EX_NODAL', 'EX_ELEM_BLOCK']:
+            exofile.get_variable_block(objType, 1)
+
+
+def best_time(function, repeat):
+    """best wall time of `repeat` calls to `function`, and its last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_probe(path, args):
+    """scattered node probes over all steps: get_probe_values vs. full read and index"""
+    rng = np.random.default_rng(0)
+    with exo.exodus(path, mode='r', array_type='numpy') as exofile:
+        names = exofile.get_variable_names('EX_NODAL')
+        probe_ids = rng.choice(exofile.num_nodes(), size=min(args.probes, exofile.num_nodes()),
+                               replace=False) + 1
+
+        def full_read():
+            values = np.empty((exofile.num_times(), len(probe_ids), len(names)))
+            for step in range(1, exofile.num_times() + 1):
+                for col, name in enumerate(names):
+                    values[step - 1, :, col] = \
+                        exofile.get_node_variable_values(name, step)[probe_ids - 1]
+            return values
+
+        def probe_read():
+            return exofile.get_probe_values('EX_NODAL', probe_ids, names,
+                                            max_gap=args.max_gap)
+
+        full_time, expected = best_time(full_read, args.repeat)
+        probe_time, actual = best_time(probe_read, args.repeat)
+        assert np.array_equal(expected, actual)
+    return [("full read + index", full_time), ("get_probe_values", probe_time)]
+
+
+def write_set_mesh(path, num_sets, nodes_per_set=4):
+    """write a mesh of `num_sets` small node sets over a line of nodes"""
+    num_nodes = num_sets * nodes_per_set
+    with exo.exodus(path, mode='w', array_type='numpy', title="set benchmark mesh", numDims=1,
+                    numNodes=num_nodes, numElems=0, numBlocks=0, numNodeSets=num_sets,
+                    numSideSets=0) as exofile:
+        coords = np.arange(num_nodes, dtype=np.float64)
+        exofile.put_coords(coords, coords, coords)
+        for set_id in range(1, num_sets + 1):
+            exofile.put_set_params('EX_NODE_SET', set_id, nodes_per_set, 0)
+            first = (set_id - 1) * nodes_per_set + 1
+            exofile.put_node_set(set_id, np.arange(first, first + nodes_per_set, dtype=np.int32))
+
+
+def bench_calls(path, args):
+    """per-call overhead of ex_get_set_param over many node sets: untyped vs. prototype"""
+    path = os.path.join(os.path.dirname(path), "sets.exo")
+    write_set_mesh(path, args.sets)
+    with exo.exodus(path, mode='r') as exofile:
+        set_ids = list(exofile.get_ids('EX_NODE_SET'))
+        file_id = exofile.fileId
+        node_set = exo.get_entity_type('EX_NODE_SET')
+        prototypes = exo.exodus_prototypes(exo.exodus_prototypes().ex_int64_status(file_id))
+        int_type = prototypes.int_type('bulk')
+
+        def untyped():
+            num_entries = int_type(0)
+            num_dist_facts = int_type(0)
+            total = 0
+            for set_id in set_ids:
+                exo.EXODUS_LIB.ex_get_set_param(file_id, ctypes.c_int(node_set),
+                                                ctypes.c_longlong(set_id),
+                                                ctypes.byref(num_entries),
+                                                ctypes.byref(num_dist_facts))
+                total += num_entries.value
+            return total
+
+        def typed():
+            num_entries = int_type(0)
+            num_dist_facts = int_type(0)
+            get_set_param = prototypes.ex_get_set_param
+            total = 0
+            for set_id in set_ids:
+                get_set_param(file_id, node_set, set_id, num_entries, num_dist_facts)
+                total += num_entries.value
+            return total
+
+        untyped_time, expected = best_time(untyped, args.repeat)
+        typed_time, actual = best_time(typed, args.repeat)
+        assert expected == actual
+    return [("untyped EXODUS_LIB", untyped_time), ("typed prototype", typed_time)]
+
+
+def bench_startup(path, args):
+    """module import in a fresh interpreter, and open/close of an existing file"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [os.path.dirname(exo.__file__), os.getenv('PYTHONPATH', '')]))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    def run(code):
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+    run("import exodus")  # populate the bytecode cache
+    interpreter_time, _ = best_time(lambda: run("pass"), args.repeat)
+    import_time, _ = best_time(lambda: run("import exodus"), args.repeat)
+
+    def open_close():
+        with exo.exodus(path, mode='r') as exofile:
+            return exofile.num_nodes()
+
+    open_time, _ = best_time(open_close, args.repeat)
+    return [("interpreter startup", interpreter_time),
+            ("interpreter + import exodus", import_time),
+            ("open + close", open_time)]
+
+
+def bench_transfer(path, args):
+    """copyTransfer of the whole file, and the bulk variable copy with and without prefetch"""
+    tempdir = os.path.dirname(path)
+    counter = iter(range(1000000))
+
+    def copy_transfer():
+        to_path = os.path.join(tempdir, "transfer{}.exo".format(next(counter)))
+        exo.copyTransfer(path, to_path).close()
+        os.remove(to_path)
+
+    results = [("copyTransfer", best_time(copy_transfer, args.repeat)[0])]
+    to_path = os.path.join(tempdir, "transfer.exo")
+    with exo.exodus(path, mode='r') as exo_from:
+        with exo.copy_mesh(path, to_path, exoFromObj=exo_from) as exo_to:
+            exo.transfer_variables(exo_from, exo_to)
+            for prefetch in [0, args.prefetch]:
+                seconds, stats = best_time(
+                    lambda: exo.transfer_variable_values(exo_from, exo_to, prefetch=prefetch),
+                    args.repeat)
+                results.append(("values, prefetch={} ({:.0f} MB/s)".format(
+                    prefetch, stats['bytes'] / 1.0e6 / seconds), seconds))
+    os.remove(to_path)
+    return results
+
+
+def bench_define(path, args):
+    """declaring many global, nodal and element variables: per-name calls vs. define_results"""
+    tempdir = os.path.dirname(path)
+    num_blocks = 4
+    names = ["var{}".format(index + 1) for index in range(args.variables)]
+    counter = iter(range(1000000))
+
+    def create():
+        new_path = os.path.join(tempdir, "define{}.exo".format(next(counter)))
+        exofile = exo.exodus(new_path, mode='w', title="define benchmark", numDims=3,
+                             numNodes=num_blocks * 8, numElems=num_blocks,
+                             numBlocks=num_blocks, numNodeSets=0, numSideSets=0)
+        for block in range(num_blocks):
+            exofile.put_elem_blk_info(block + 1, 'HEX8', 1, 8, 0)
+        return exofile
+
+    def per_name():
+        exofile = create()
+        for objType in ['EX_GLOBAL', 'EX_NODAL', 'EX_ELEM_BLOCK']:
+            exofile.set_variable_number(objType, len(names))
+            for index, name in enumerate(names):
+                exofile.put_variable_name(objType, name, index + 1)
+        exofile.set_variable_truth_table('EX_ELEM_BLOCK', [True] * (num_blocks * len(names)))
+        exofile.close()
+
+    def define_results():
+        exofile = create()
+        exofile.define_results({'EX_GLOBAL': names, 'EX_NODAL': names, 'EX_ELEM_BLOCK': names})
+        exofile.close()
+
+    return [("per-name calls", best_time(per_name, args.repeat)[0]),
+            ("define_results", best_time(define_results, args.repeat)[0])]
+
+
+def bench_profiles(path, args):
+    """file size, write and read-back speed of each write profile (--size 216 is ~10M elements)"""
+    tempdir = os.path.dirname(path)
+    results = []
+    for profile in args.profiles:
+        profile_path = os.path.join(tempdir, "profile-{}.exo".format(profile))
+
+        def write():
+            if os.path.exists(profile_path):
+                os.remove(profile_path)
+            return write_hex_mesh(profile_path, args.size, args.steps, write_profile=profile)
+
+        write_time, nbytes = best_time(write, args.repeat)
+        read_time, _ = best_time(lambda: read_hex_mesh(profile_path), args.repeat)
+        results.append(("{}: {:.1f} MB, write {:.0f} MB/s, read {:.0f} MB/s".format(
+            profile, os.path.getsize(profile_path) / 1.0e6, nbytes / 1.0e6 / write_time,
+            nbytes / 1.0e6 / read_time), write_time))
+        os.remove(profile_path)
+    return results
+
+
+def bench_adjacency(path, args):
+    """CSR adjacency builders from a cold cache, and the collect* list form"""
+    results = []
+    with exo.exodus(path, mode='r', array_type='numpy') as exofile:
+        builders = [("elem -> node", exofile.get_elem_node_adjacency),
+                    ("node -> elem", exofile.get_node_elem_adjacency),
+                    ("elem -> elem (node)", lambda: exofile.get_elem_elem_adjacency('node')),
+                    ("elem -> elem (face)", lambda: exofile.get_elem_elem_adjacency('face')),
+                    ("node -> node", exofile.get_node_node_adjacency)]
+        for label, build in builders:
+            def cold():
+                exofile.clear_metadata_cache()
+                return build()
+            results.append((label, best_time(cold, args.repeat)[0]))
+
+        def lists():
+            exofile.clear_metadata_cache()
+            exo.collectLocalElemToLocalElems(exofile, [], [], [])
+        results.append(("collectLocalElemToLocalElems", best_time(lists, args.repeat)[0]))
+    return results
+
+
+def suite_operations(path, array_type, args):
+    """
+    time the suite operations on the mesh of `write_hex_mesh` at `path`
+    with handles of `array_type`; returns (operation, seconds, bytes)
+    tuples, where bytes is the amount of data the operation moves
+    """
+    tempdir = os.path.dirname(path)
+    counter = iter(range(1000000))
+
+    def open_close():
+        with exo.exodus(path, mode='r', array_type=array_type) as exofile:
+            return exofile.num_nodes()
+
+    results = [("open + close", best_time(open_close, args.repeat)[0], 0)]
+    with exo.exodus(path, mode='r', array_type=array_type) as exofile:
+        num_nodes = exofile.num_nodes()
+        num_elems = exofile.num_elems()
+        num_steps = exofile.num_times()
+        variables = [(objType, name) for objType in ['EX_NODAL', 'EX_ELEM_BLOCK']
+                     for name in exofile.get_variable_names(objType)]
+        step_bytes = sum(8 * (num_nodes if objType == 'EX_NODAL' else num_elems)
+                         for objType, _name in variables)
+        mesh_bytes = 3 * 8 * num_nodes + 4 * 8 * num_elems + 4 * (num_nodes + num_elems)
+
+        def read_steps():
+            for step in range(1, num_steps + 1):
+                for objType, name in variables:
+                    exofile.get_variable_values(objType, 1, name, step)
+
+        results.append(("coordinate read", best_time(exofile.get_coords, args.repeat)[0],
+                        3 * 8 * num_nodes))
+        results.append(("connectivity read",
+                        best_time(lambda: exofile.get_elem_connectivity(1), args.repeat)[0],
+                        4 * 8 * num_elems))
+        results.append(("variable read per step",
+                        best_time(read_steps, args.repeat)[0] / num_steps, step_bytes))
+        values = {key: exofile.get_variable_values(key[0], 1, key[1], 1) for key in variables}
+
+        def summarize():
+            with contextlib.redirect_stdout(io.StringIO()):
+                exofile.summarize()
+
+        results.append(("summarize", best_time(summarize, args.repeat)[0], 0))
+
+    with exo.exodus(path, mode='a', array_type=array_type) as exofile:
+        def write_steps():
+            for step in range(1, num_steps + 1):
+                for objType, name in variables:
+                    exofile.put_variable_values(objType, 1, name, step, values[(objType, name)])
+
+        results.append(("variable write per step",
+                        best_time(write_steps, args.repeat)[0] / num_steps, step_bytes))
+
+    def copy():
+        to_path = os.path.join(tempdir, "suite-copy{}.exo".format(next(counter)))
+        exo.copy_mesh(path, to_path, array_type=array_type).close()
+        os.remove(to_path)
+
+    results.append(("copy_mesh", best_time(copy, args.repeat)[0], mesh_bytes))
+
+    # each repetition transfers into a fresh copy of the mesh, which is not timed
+    best = None
+    with exo.exodus(path, mode='r', array_type=array_type) as exo_from:
+        for _ in range(args.repeat):
+            to_path = os.path.join(tempdir, "suite-transfer.exo")
+            with exo.copy_mesh(path, to_path, exoFromObj=exo_from,
+                               array_type=array_type) as exo_to:
+                start = time.perf_counter()
+                exo.transfer_variables(exo_from, exo_to, array_type=array_type)
+                elapsed = time.perf_counter() - start
+            os.remove(to_path)
+            best = elapsed if best is None else min(best, elapsed)
+    results.append(("transfer_variables", best, num_steps * step_bytes))
+    return results
+
+
+def bench_suite(path, args):
+    """open, mesh and per-step variable I/O, copy_mesh, transfer_variables, summarize by size"""
+    tempdir = os.path.dirname(path)
+    results = []
+    for target in args.elements:
+        size = max(1, int(round(target ** (1.0 / 3.0))))
+        mesh_path = os.path.join(tempdir, "suite-{}.exo".format(size))
+        write_hex_mesh(mesh_path, size, args.steps, args.node_vars, args.elem_vars)
+        for array_type in args.array_types:
+            for operation, seconds, nbytes in suite_operations(mesh_path, array_type, args):
+                info = {'elements': size ** 3, 'nodes': (size + 1) ** 3, 'steps': args.steps,
+                        'array_type': array_type, 'operation': operation, 'bytes': nbytes}
+                if nbytes:
+                    info['MB/s'] = nbytes / 1.0e6 / seconds
+                label = "{:>8d} {:<5s} {}".format(size ** 3, array_type, operation)
+                results.append((label, seconds, info))
+        os.remove(mesh_path)
+    return results
+
+
+BENCHMARKS = {
+    'adjacency': bench_adjacency,
+    'calls': bench_calls,
+    'define': bench_define,
+    'probe': bench_probe,
+    'profiles': bench_profiles,
+    'startup': bench_startup,
+    'suite': bench_suite,
+    'transfer': bench_transfer,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="exodus.py benchmarks")
+    parser.add_argument('benchmarks', nargs='*', choices=sorted(BENCHMARKS) + [[]],
+                        help="benchmarks to run (default: all but suite)")
+    parser.add_argument('--size', type=int, default=30,
+                        help="number of hex elements along each edge of the mesh")
+    parser.add_argument('--steps', type=int, default=20, help="number of time steps")
+    parser.add_argument('--node-vars', type=int, default=2,
+                        help="number of nodal variables of the generated meshes")
+    parser.add_argument('--elem-vars', type=int, default=2,
+                        help="number of element variables of the generated meshes")
+    parser.add_argument('--elements', type=float, nargs='+', default=[1e4, 1e5],
+                        help="approximate element counts of the meshes of the suite benchmark")
+    parser.add_argument('--array-types', nargs='+', default=['ctype', 'numpy'],
+                        choices=['ctype', 'numpy'],
+                        help="array types compared by the suite benchmark")
+    parser.add_argument('--json', metavar='FILE',
+                        help="also write the results as JSON to FILE")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per timing")
+    parser.add_argument('--probes', type=int, default=200, help="number of probe nodes")
+    parser.add_argument('--sets', type=int, default=5000,
+                        help="number of node sets for the call overhead benchmark")
+    parser.add_argument('--variables', type=int, default=500,
+                        help="number of variables of each type for the define benchmark")
+    parser.add_argument('--prefetch', type=int, default=2,
+                        help="read-ahead depth for the transfer benchmark")
+    parser.add_argument('--max-gap', type=int, default=4096,
+                        help="range coalescing threshold for probe reads")
+    parser.add_argument('--profiles', nargs='+', default=sorted(exo.WRITE_PROFILES),
+                        choices=sorted(exo.WRITE_PROFILES),
+                        help="write profiles compared by the profiles benchmark")
+    args = parser.parse_args(argv)
+
+    records = []
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "benchmark.exo")
+        write_hex_mesh(path, args.size, args.steps, args.node_vars, args.elem_vars)
+        for name in args.benchmarks or sorted(set(BENCHMARKS) - {'suite'}):
+            print("{}: {}".format(name, BENCHMARKS[name].__doc__))
+            for result in BENCHMARKS[name](path, args):
+                label, seconds = result[:2]
+                record = {'benchmark': name, 'label': label, 'seconds': seconds}
+                record.update(result[2] if len(result) > 2 else {})
+                records.append(record)
+                line = "  {:<40s} {:10.4f} s".format(label, seconds)
+                if 'MB/s' in record:
+                    line += " {:8.0f} MB/s".format(record['MB/s'])
+                print(line)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({'exodus_py': exo.EXODUS_PY_VERSION,
+                       'exodus_api': exo.EX_API_VERSION_NODOT,
+                       'numpy': np.__version__,
+                       'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                       'arguments': vars(args),
+                       'results': records}, output, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Copyright(C) 1999-2022 National Technology & Engineering Solutions
+of Sandia, LLC (NTESS).  Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+
+See packages/seacas/LICENSE for details
+
+MPI driver for the parallel open test of exodus.py.  All ranks create one
+shared file collectively, each rank writes and reads back its own
+hyperslab of a nodal and an element variable, and rank 0 checks the
+assembled file with a serial open.  Needs mpi4py and an exodus library
+built with MPI support.
+
+>>> mpirun -n 4 python parallel_exodus3.py shared.e
+"""
+
+import os
+import sys
+
+ACCESS = os.getenv('ACCESS', '@ACCESSDIR@')
+sys.path.append(os.path.join(ACCESS, "lib"))
+import exodus as exo
+import numpy as np
+from mpi4py import MPI
+
+NUM_ELEMS = 103
+NUM_STEPS = 3
+
+
+def expected(step, start, count, scale):
+    return scale * step + np.arange(start, start + count, dtype=np.float64)
+
+
+def write_shared(path, comm):
+    """define the model on all ranks, then write each rank's hyperslab"""
+    num_nodes = 2 * (NUM_ELEMS + 1)
+    with exo.exodus(path, mode='w+', array_type='numpy', title="parallel", numDims=2,
+                    numNodes=num_nodes, numElems=NUM_ELEMS, numBlocks=1, numNodeSets=0,
+                    numSideSets=0, comm=comm) as out:
+        out.put_coord_names(["x", "y"])
+        x = np.repeat(np.arange(NUM_ELEMS + 1, dtype=np.float64), 2)
+        y = np.tile([0.0, 1.0], NUM_ELEMS + 1)
+        out.put_coords(x, y, np.zeros(num_nodes))
+        out.put_elem_blk_info(1, "QUAD4", NUM_ELEMS, 4, 0)
+        first = 2 * np.arange(NUM_ELEMS) + 1
+        connect = np.column_stack([first, first + 2, first + 3, first + 1])
+        out.put_elem_connectivity(1, connect.ravel().astype(np.int32))
+        out.set_node_variable_number(1)
+        out.put_node_variable_name("temp", 1)
+        out.set_element_variable_number(1)
+        out.put_element_variable_name("stress", 1)
+        out.set_element_variable_truth_table([True])
+        node_start, node_count = exo.partition_range(num_nodes, comm.rank, comm.size)
+        elem_start, elem_count = exo.partition_range(NUM_ELEMS, comm.rank, comm.size)
+        for step in range(1, NUM_STEPS + 1):
+            out.put_time(step, float(step))
+            out.put_partial_node_variable_values(
+                "temp", step, node_start, expected(step, node_start, node_count, 1000.0))
+            out.put_partial_element_variable_values(
+                1, "stress", step, elem_start, expected(step, elem_start, elem_count, -1000.0))
+
+
+def read_shared(path, comm):
+    """read back each rank's hyperslab through a parallel open"""
+    with exo.exodus(path, mode='r', array_type='numpy', comm=comm) as inp:
+        node_start, node_count = exo.partition_range(inp.num_nodes(), comm.rank, comm.size)
+        elem_start, elem_count = exo.partition_range(inp.num_elems(), comm.rank, comm.size)
+        for step in range(1, NUM_STEPS + 1):
+            temp = inp.get_partial_node_variable_values("temp", step, node_start, node_count)
+            stress = inp.get_partial_element_variable_values(1, "stress", step, elem_start,
+                                                             elem_count)
+            assert np.array_equal(temp, expected(step, node_start, node_count, 1000.0))
+            assert np.array_equal(stress, expected(step, elem_start, elem_count, -1000.0))
+
+
+def check_serial(path):
+    """the file assembled from all hyperslabs, read back by one rank"""
+    with exo.exodus(path, mode='r', array_type='numpy') as inp:
+        assert inp.num_times() == NUM_STEPS
+        for step in range(1, NUM_STEPS + 1):
+            temp = inp.get_node_variable_values("temp", step)
+            stress = inp.get_element_variable_values(1, "stress", step)
+            assert np.array_equal(temp, expected(step, 1, inp.num_nodes(), 1000.0))
+            assert np.array_equal(stress, expected(step, 1, NUM_ELEMS, -1000.0))
+
+
+def main():
+    comm = MPI.COMM_WORLD
+    path = sys.argv[1]
+    try:
+        write_shared(path, comm)
+        read_shared(path, comm)
+        comm.Barrier()
+        if comm.rank == 0:
+            check_serial(path)
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        comm.Abort(1)
+    if comm.rank == 0:
+        print("parallel open: {} ranks ok".format(comm.size))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,33 @@ See packages/seacas/LICENSE for details
 """
 
 import unittest
+import array
 import sys
 import os
 import tempfile
 import ctypes
-from contextlib import contextmanager
+import io
+import json
+import importlib.util
+import shutil
+import subprocess
+import threading
+from contextlib import contextmanager, redirect_stdout
+from unittest import mock
 
 ACCESS = os.getenv('ACCESS', '@ACCESSDIR@')
 sys.path.append(os.path.join(ACCESS, "lib"))
 import exodus as exo
 
 
+def import_numpy(test):
+    """numpy, or skip `test` when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        test.skipTest("numpy not available")
+    return numpy
+
 
 class TestAssemblies(unittest.TestCase):
 
@@ -52,6 +68,22 @@ class TestAssemblies(unittest.TestCase):
             with exo.exodus(self.temp_exo_path, mode='r'):
                 self.assertFalse(True)
 
+    def test_open_and_close_are_quiet_unless_verbose(self):
+        output = io.StringIO()
+        with swap_module_value('VERBOSE', False), redirect_stdout(output):
+            with exo.exodus(self.temp_exo_path, mode='r'):
+                pass
+        self.assertEqual("", output.getvalue())
+        with swap_module_value('VERBOSE', True), swap_module_value('SHOW_BANNER', False), \
+                redirect_stdout(output):
+            with exo.exodus(self.temp_exo_path, mode='r'):
+                pass
+        self.assertIn("Opening exodus file", output.getvalue())
+        self.assertIn("Closing exodus file", output.getvalue())
+
+    def test_library_is_loaded_once(self):
+        self.assertIs(exo.exodus_lib(), exo.EXODUS_LIB)
+
     def test_copy_opened_in_append_mode(self):
         new = exo.assembly(name='Unit_test', type=exo.ex_entity_type.EX_ASSEMBLY, id=444)
         new.entity_list = [100, 222]
@@ -261,6 +293,1426 @@ class TestExodusUtilities(unittest.TestCase):
             self.assertEqual(0, exo.getExodusVersion())
 
 
+class TestBufferPuts(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.temp_exo_path = os.path.join(self.tempdir.name, "temp-buffer-puts.exo")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_as_ctype_array_shares_matching_buffer(self):
+        values = array.array('d', [1.0, 2.0, 3.0])
+        c_array = exo.as_ctype_array(values, ctypes.c_double)
+        self.assertEqual(values.buffer_info()[0], ctypes.addressof(c_array))
+        self.assertEqual([1.0, 2.0, 3.0], list(c_array))
+
+    def test_as_ctype_array_converts_list(self):
+        c_array = exo.as_ctype_array([1, 2, 3, 4], ctypes.c_int, 3)
+        self.assertEqual(3, len(c_array))
+        self.assertEqual([1, 2, 3], list(c_array))
+
+    def test_as_ctype_array_converts_mismatched_buffer(self):
+        values = array.array('i', [5, 6, 7])
+        c_array = exo.as_ctype_array(values, ctypes.c_longlong)
+        self.assertEqual([5, 6, 7], list(c_array))
+
+    def test_as_ctype_array_numpy(self):
+        np = import_numpy(self)
+        values = np.arange(6, dtype=np.float64)
+        c_array = exo.as_ctype_array(values, ctypes.c_double)
+        self.assertEqual(values.ctypes.data, ctypes.addressof(c_array))
+        c_array = exo.as_ctype_array(values.reshape(2, 3)[:, 0], ctypes.c_double)
+        self.assertEqual([0.0, 3.0], list(c_array))
+
+    def test_put_coords_from_buffers(self):
+        with exo.exodus(self.temp_exo_path, mode='w', title="buffer puts", numDims=3,
+                        numNodes=4, numElems=1, numBlocks=1, numNodeSets=0,
+                        numSideSets=0) as exofile:
+            exofile.put_coords(array.array('d', [0.0, 1.0, 0.0, 0.0]),
+                               array.array('d', [0.0, 0.0, 1.0, 0.0]),
+                               (0.0, 0.0, 0.0, 1.0))
+            exofile.put_elem_blk_info(1, 'TET4', 1, 4, 0)
+            exofile.put_elem_connectivity(1, array.array('i', [1, 2, 3, 4]))
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            x_coords, y_coords, z_coords = exofile.get_coords()
+            self.assertEqual([0.0, 1.0, 0.0, 0.0], list(x_coords))
+            self.assertEqual([0.0, 0.0, 0.0, 1.0], list(z_coords))
+            self.assertEqual([1, 2, 3, 4], list(exofile.get_elem_connectivity(1)[0]))
+
+    def test_put_non_native_byte_order(self):
+        np = import_numpy(self)
+        swapped = '>' if sys.byteorder == 'little' else '<'
+        x_coords = np.array([0.0, 1.0, 0.0, 0.0], dtype=swapped + 'f8')
+        x_coords.setflags(write=False)
+        with exo.exodus(self.temp_exo_path, mode='w', title="buffer puts", numDims=3,
+                        numNodes=4, numElems=1, numBlocks=1, numNodeSets=0,
+                        numSideSets=0) as exofile:
+            exofile.put_coords(x_coords, np.array([0.0, 0.0, 1.0, 0.0], dtype=swapped + 'f8'),
+                               np.array([0.0, 0.0, 0.0, 1.0], dtype=swapped + 'f8'))
+            exofile.put_elem_blk_info(1, 'TET4', 1, 4, 0)
+            exofile.put_elem_connectivity(1, np.array([1, 2, 3, 4], dtype=swapped + 'i4'))
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            x_coords, y_coords, z_coords = exofile.get_coords()
+            self.assertEqual([0.0, 1.0, 0.0, 0.0], list(x_coords))
+            self.assertEqual([0.0, 0.0, 1.0, 0.0], list(y_coords))
+            self.assertEqual([0.0, 0.0, 0.0, 1.0], list(z_coords))
+            self.assertEqual([1, 2, 3, 4], list(exofile.get_elem_connectivity(1)[0]))
+
+
+class TestPreallocatedGets(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.temp_exo_path = os.path.join(self.tempdir.name, "temp-preallocated-gets.exo")
+        with exo.exodus(self.temp_exo_path, mode='w', title="preallocated gets", numDims=3,
+                        numNodes=4, numElems=1, numBlocks=1, numNodeSets=0,
+                        numSideSets=0) as exofile:
+            exofile.put_coords([0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+            exofile.put_elem_blk_info(1, 'TET4', 1, 4, 0)
+            exofile.put_elem_connectivity(1, [1, 2, 3, 4])
+            exofile.set_node_variable_number(1)
+            exofile.put_node_variable_name("temp", 1)
+            exofile.set_element_variable_number(1)
+            exofile.put_element_variable_name("stress", 1)
+            exofile.put_time(1, 0.5)
+            exofile.put_node_variable_values("temp", 1, [1.0, 2.0, 3.0, 4.0])
+            exofile.put_variable_values('EX_ELEM_BLOCK', 1, "stress", 1, [7.0])
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_get_node_variable_values_out(self):
+        out = array.array('d', [0.0] * 4)
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            values = exofile.get_node_variable_values("temp", 1, out=out)
+        self.assertIs(out, values)
+        self.assertEqual([1.0, 2.0, 3.0, 4.0], list(out))
+
+    def test_get_variable_values_out(self):
+        out = array.array('d', [0.0])
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            exofile.get_variable_values('EX_ELEM_BLOCK', 1, "stress", 1, out=out)
+        self.assertEqual([7.0], list(out))
+
+    def test_get_coords_out(self):
+        out = tuple(array.array('d', [0.0] * 4) for _ in range(3))
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            coords = exofile.get_coords(out=out)
+        self.assertIs(out[1], coords[1])
+        self.assertEqual([0.0, 0.0, 1.0, 0.0], list(out[1]))
+        self.assertIsNone(exofile.coordsY)
+
+    def test_get_partial_variable_values_out(self):
+        out = array.array('d', [0.0] * 2)
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            values = exofile.get_partial_node_variable_values("temp", 1, 2, 2, out=out)
+            self.assertIs(out, values)
+            self.assertEqual([2.0, 3.0], list(out))
+            exofile.get_partial_element_variable_values(1, "stress", 1, 1, 1, out=out)
+            self.assertEqual([7.0, 3.0], list(out))
+            with self.assertRaises(Exception):
+                exofile.get_partial_node_variable_values("temp", 1, 1, 4, out=out)
+            with self.assertRaises(Exception):
+                exofile.get_partial_node_variable_values("temp", 1, 1, 2,
+                                                         out=array.array('f', [0.0] * 2))
+
+    def test_metadata_cache_follows_puts(self):
+        with exo.exodus(self.temp_exo_path, mode='a') as exofile:
+            names = exofile.get_variable_names('EX_NODAL')
+            names.append("not a variable")
+            self.assertEqual(["temp"], exofile.get_variable_names('EX_NODAL'))
+            self.assertEqual(1, exofile.num_elems_in_blk(1))
+            exofile.put_variable_name('EX_NODAL', "pressure", 1)
+            self.assertEqual(["pressure"], exofile.get_variable_names('EX_NODAL'))
+            self.assertEqual([1.0, 2.0, 3.0, 4.0],
+                             list(exofile.get_node_variable_values("pressure", 1)))
+            with self.assertRaises(ValueError):
+                exofile.get_node_variable_values("temp", 1)
+            exofile.put_elem_id_map([10])
+            self.assertEqual([10], list(exofile.get_elem_id_map()))
+
+    def test_out_rejects_incompatible_buffer(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            with self.assertRaises(Exception):
+                exofile.get_node_variable_values("temp", 1, out=array.array('d', [0.0] * 3))
+            with self.assertRaises(Exception):
+                exofile.get_node_variable_values("temp", 1, out=array.array('f', [0.0] * 4))
+
+    def test_out_rejects_non_native_byte_order(self):
+        np = import_numpy(self)
+        swapped = '>' if sys.byteorder == 'little' else '<'
+        out = np.zeros(4, dtype=swapped + 'f8')
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            with self.assertRaisesRegex(Exception, "'out' must be a writable, contiguous buffer"):
+                exofile.get_node_variable_values("temp", 1, out=out)
+        self.assertEqual([0.0] * 4, list(out))
+
+
+def write_transient_mesh(path, num_steps=4):
+    """two blocks of TET4 elements sharing nodes, with global, nodal and element variables"""
+    with exo.exodus(path, mode='w', title="transient mesh", numDims=3, numNodes=5,
+                    numElems=3, numBlocks=2, numNodeSets=0, numSideSets=0) as exofile:
+        exofile.put_coords([0.0, 1.0, 0.0, 0.0, 1.0], [0.0, 0.0, 1.0, 0.0, 1.0],
+                           [0.0, 0.0, 0.0, 1.0, 1.0])
+        exofile.put_elem_blk_info(10, 'TET4', 2, 4, 0)
+        exofile.put_elem_connectivity(10, [1, 2, 3, 4, 2, 3, 4, 5])
+        exofile.put_elem_blk_info(20, 'TET4', 1, 4, 0)
+        exofile.put_elem_connectivity(20, [1, 3, 4, 5])
+        exofile.put_elem_id_map([100, 200, 300])
+        exofile.put_node_id_map([11, 12, 13, 14, 15])
+        exofile.set_global_variable_number(1)
+        exofile.put_global_variable_name("energy", 1)
+        exofile.set_node_variable_number(2)
+        exofile.put_node_variable_name("temp", 1)
+        exofile.put_node_variable_name("disp", 2)
+        exofile.set_element_variable_number(2)
+        exofile.put_element_variable_name("stress", 1)
+        exofile.put_element_variable_name("strain", 2)
+        exofile.set_element_variable_truth_table([True, True, True, False])
+        for step in range(1, num_steps + 1):
+            exofile.put_time(step, 0.5 * step)
+            exofile.put_global_variable_value("energy", step, 10.0 * step)
+            exofile.put_node_variable_values("temp", step, [step + 0.1 * i for i in range(5)])
+            exofile.put_node_variable_values("disp", step, [-step - 0.1 * i for i in range(5)])
+            exofile.put_variable_values('EX_ELEM_BLOCK', 10, "stress", step, [step, 2.0 * step])
+            exofile.put_variable_values('EX_ELEM_BLOCK', 10, "strain", step, [-step, -2.0 * step])
+            exofile.put_variable_values('EX_ELEM_BLOCK', 20, "stress", step, [3.0 * step])
+
+
+def write_transient_piece(path, node_ids, elem_ids, num_steps=4):
+    """the elements elem_ids of write_transient_mesh, with its nodes node_ids in that local order"""
+    coords = {11: (0.0, 0.0, 0.0), 12: (1.0, 0.0, 0.0), 13: (0.0, 1.0, 0.0),
+              14: (0.0, 0.0, 1.0), 15: (1.0, 1.0, 1.0)}
+    blocks = {10: {100: [11, 12, 13, 14], 200: [12, 13, 14, 15]}, 20: {300: [11, 13, 14, 15]}}
+    local = {node_id: index + 1 for index, node_id in enumerate(node_ids)}
+    piece_blocks = [(blkId, [elem for elem in sorted(blocks[blkId]) if elem in elem_ids])
+                    for blkId in sorted(blocks)]
+    with exo.exodus(path, mode='w', title="transient mesh", numDims=3, numNodes=len(node_ids),
+                    numElems=len(elem_ids), numBlocks=2, numNodeSets=0,
+                    numSideSets=0) as exofile:
+        exofile.put_coords(*[[coords[node][dim] for node in node_ids] for dim in range(3)])
+        for blkId, elems in piece_blocks:
+            exofile.put_elem_blk_info(blkId, 'TET4', len(elems), 4, 0)
+            if elems:
+                exofile.put_elem_connectivity(
+                    blkId, [local[node] for elem in elems for node in blocks[blkId][elem]])
+        exofile.put_elem_id_map([elem for _blkId, elems in piece_blocks for elem in elems])
+        exofile.put_node_id_map(node_ids)
+        exofile.set_global_variable_number(1)
+        exofile.put_global_variable_name("energy", 1)
+        exofile.set_node_variable_number(2)
+        exofile.put_node_variable_name("temp", 1)
+        exofile.put_node_variable_name("disp", 2)
+        exofile.set_element_variable_number(2)
+        exofile.put_element_variable_name("stress", 1)
+        exofile.put_element_variable_name("strain", 2)
+        exofile.set_element_variable_truth_table([True, True, True, False])
+        for step in range(1, num_steps + 1):
+            exofile.put_time(step, 0.5 * step)
+            exofile.put_global_variable_value("energy", step, 10.0 * step)
+            exofile.put_node_variable_values("temp", step,
+                                             [step + 0.1 * (node - 11) for node in node_ids])
+            exofile.put_node_variable_values("disp", step,
+                                             [-step - 0.1 * (node - 11) for node in node_ids])
+            for blkId, elems in piece_blocks:
+                if not elems:
+                    continue
+                exofile.put_variable_values('EX_ELEM_BLOCK', blkId, "stress", step,
+                                            [step * elem / 100.0 for elem in elems])
+                if blkId == 10:
+                    exofile.put_variable_values('EX_ELEM_BLOCK', blkId, "strain", step,
+                                                [-step * elem / 100.0 for elem in elems])
+
+
+class TransientMeshTestCase(unittest.TestCase):
+    """writes write_transient_mesh to `temp_exo_path` in a fresh temporary directory
+
+    Subclasses set `mesh_name` to name the file and `requires_numpy` to skip
+    when numpy is not installed; `self.np` is numpy when it is required.
+    """
+    mesh_name = "temp-transient.exo"
+    requires_numpy = False
+
+    def setUp(self):
+        if self.requires_numpy:
+            self.np = import_numpy(self)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.temp_exo_path = os.path.join(self.tempdir.name, self.mesh_name)
+        write_transient_mesh(self.temp_exo_path)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+
+class TestVariableTimeSeries(TransientMeshTestCase):
+    mesh_name = "temp-time-series.exo"
+
+    def test_global_variable_values(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            self.assertEqual([10.0, 20.0, 30.0, 40.0], exofile.get_global_variable_values("energy"))
+            self.assertEqual([20.0, 30.0], list(exofile.get_variable_time_series(
+                'EX_GLOBAL', None, "energy", begin_step=2, end_step=3)))
+
+    def test_node_time_series(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            history = exofile.get_variable_time_series('EX_NODAL', None, "temp", 3)
+            self.assertEqual([1.2, 2.2, 3.2, 4.2], [round(v, 12) for v in history])
+
+    def test_element_time_series_second_block(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            histories = exofile.get_variable_time_series('EX_ELEM_BLOCK', 20, "stress", [1], 2, 4)
+            self.assertEqual([[6.0, 9.0, 12.0]], [list(h) for h in histories])
+
+    def test_element_time_series_numpy(self):
+        import_numpy(self)
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            histories = exofile.get_variable_time_series('EX_ELEM_BLOCK', 10, "stress", [1, 2])
+            self.assertEqual((2, 4), histories.shape)
+            self.assertTrue(histories.flags.c_contiguous)
+            self.assertEqual([2.0, 4.0, 6.0, 8.0], list(histories[1]))
+            self.assertEqual([1.0, 2.0, 3.0, 4.0],
+                             list(exofile.get_variable_time_series('EX_ELEM_BLOCK', 10,
+                                                                   "stress", 1)))
+            with self.assertRaises(Exception):
+                exofile.get_variable_time_series('EX_ELEM_BLOCK', 10, "stress", 3)
+
+
+class TestVariableBlock(TransientMeshTestCase):
+    mesh_name = "temp-variable-block.exo"
+    requires_numpy = True
+
+    def test_element_block(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            values = exofile.get_variable_block('EX_ELEM_BLOCK', 10, ["strain", "stress"], [1, 3])
+        self.assertEqual((2, 2, 2), values.shape)
+        self.assertEqual([-3.0, -6.0], list(values[1, 0]))
+        self.assertEqual([3.0, 6.0], list(values[1, 1]))
+
+    def test_truth_table_absent_variable(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            values = exofile.get_variable_block('EX_ELEM_BLOCK', 20)
+        self.assertEqual((4, 2, 1), values.shape)
+        self.assertEqual([3.0, 6.0, 9.0, 12.0], list(values[:, 0, 0]))
+        self.assertTrue(all(v != v for v in values[:, 1, 0]))
+
+    def test_nodal_matches_single_reads(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            values = exofile.get_variable_block('EX_NODAL', None, ["disp"])
+            for step in range(1, 5):
+                self.assertEqual(list(exofile.get_node_variable_values("disp", step)),
+                                 list(values[step - 1, 0]))
+
+    def test_short_entities_read_histories(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        profile_io=True) as exofile:
+            values = exofile.get_variable_block('EX_ELEM_BLOCK', 10, steps=[4, 1, 2, 3])
+            calls = exofile.io_stats()['functions']
+            self.assertEqual(4, calls['ex_get_var_time']['calls'])
+            self.assertEqual(2, calls['ex_get_var']['calls'])
+            for row, step in enumerate([4, 1, 2, 3]):
+                for col, name in enumerate(["stress", "strain"]):
+                    self.assertEqual(
+                        list(exofile.get_variable_values('EX_ELEM_BLOCK', 10, name, step)),
+                        list(values[row, col]))
+            values = exofile.get_variable_block('EX_ELEM_BLOCK', 20)
+            self.assertEqual([3.0, 6.0, 9.0, 12.0], list(values[:, 0, 0]))
+
+
+class TestIterSteps(TransientMeshTestCase):
+    mesh_name = "temp-iter-steps.exo"
+    requires_numpy = True
+
+    def check_steps(self, prefetch):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            visited = []
+            for step, values in exofile.iter_steps(prefetch=prefetch):
+                visited.append(step)
+                self.assertEqual(10.0 * step, values[('EX_GLOBAL', None, "energy")])
+                self.assertEqual(list(exofile.get_node_variable_values("temp", step)),
+                                 list(values[('EX_NODAL', None, "temp")]))
+                self.assertEqual([3.0 * step], list(values[('EX_ELEM_BLOCK', 20, "stress")]))
+                self.assertNotIn(('EX_ELEM_BLOCK', 20, "strain"), values)
+            self.assertEqual([1, 2, 3, 4], visited)
+
+    def test_iter_steps_prefetch(self):
+        self.check_steps(prefetch=2)
+
+    def test_iter_steps_synchronous(self):
+        self.check_steps(prefetch=0)
+
+    def test_iter_steps_serializes_library_calls(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            prototypes = exofile._exodus__lib
+            bare = prototypes.ex_get_var
+            if exofile.inquire('EX_INQ_THREADSAFE') == 1:
+                self.skipTest("exodus library is thread-safe")
+            # with two buffers the reader cannot finish before step 3 is consumed
+            for step, _values in exofile.iter_steps(prefetch=1):
+                if step == 1:
+                    self.assertIsNot(bare, prototypes.ex_get_var)
+            self.assertIs(bare, prototypes.ex_get_var)
+
+            steps = exofile.iter_steps(prefetch=1)
+            for _step, _values in steps:
+                break
+            self.assertIsNot(bare, prototypes.ex_get_var)
+            steps.close()
+            self.assertIs(bare, prototypes.ex_get_var)
+
+    def test_iter_steps_selection_and_early_exit(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            for step, values in exofile.iter_steps(["strain"], ['EX_ELEM_BLOCK'], steps=[3, 4],
+                                                   prefetch=1):
+                self.assertEqual(3, step)
+                self.assertEqual([('EX_ELEM_BLOCK', 10, "strain")], list(values))
+                self.assertEqual([-3.0, -6.0], list(values[('EX_ELEM_BLOCK', 10, "strain")]))
+                break
+
+
+class TestProbeValues(TransientMeshTestCase):
+    mesh_name = "temp-probes.exo"
+    requires_numpy = True
+
+    def test_coalesce_ranges(self):
+        self.assertEqual([(1, 4), (10, 11)], exo._coalesce_ranges([3, 1, 10, 2, 3], 2))
+        self.assertEqual([(1, 2), (3, 4)], exo._coalesce_ranges([1, 3], 0))
+        self.assertEqual([(1, 11)], exo._coalesce_ranges([1, 10], 9))
+
+    def test_node_probes_match_full_reads(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            probes = exofile.get_probe_values('EX_NODAL', [15, 12, 15], ["temp", "disp"],
+                                              max_gap=0)
+            self.assertEqual((4, 3, 2), probes.shape)
+            for step in range(1, 5):
+                temp = exofile.get_node_variable_values("temp", step)
+                disp = exofile.get_node_variable_values("disp", step)
+                self.assertEqual([temp[4], temp[1], temp[4]], list(probes[step - 1, :, 0]))
+                self.assertEqual([disp[4], disp[1], disp[4]], list(probes[step - 1, :, 1]))
+
+    def test_element_probes_across_blocks(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            probes = exofile.get_probe_values('EX_ELEM_BLOCK', [300, 200],
+                                              ["stress", "strain"], steps=[2, 3])
+        self.assertEqual([6.0, 4.0], list(probes[0, :, 0]))
+        self.assertEqual([9.0, 6.0], list(probes[1, :, 0]))
+        self.assertTrue(probes[0, 0, 1] != probes[0, 0, 1])
+        self.assertEqual(-6.0, probes[1, 1, 1])
+
+
+class TestDefineResults(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.temp_exo_path = os.path.join(self.tempdir.name, "temp-define-results.exo")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_define_results_declares_all_variables(self):
+        with exo.exodus(self.temp_exo_path, mode='w', title="define results", numDims=3,
+                        numNodes=5, numElems=3, numBlocks=2, numNodeSets=1, numSideSets=0,
+                        numAssembly=1) as exofile:
+            exofile.put_elem_blk_info(10, 'TET4', 2, 4, 0)
+            exofile.put_elem_blk_info(20, 'TET4', 1, 4, 0)
+            exofile.put_node_set_params(7, 2)
+            assembly = exo.assembly(name='both', type='EX_ELEM_BLOCK', id=1)
+            assembly.entity_list = [10, 20]
+            exofile.put_assembly(assembly)
+            exofile.define_results({
+                'EX_GLOBAL': ["energy"],
+                'EX_NODAL': ["temp", "disp"],
+                'EX_ELEM_BLOCK': (["stress", "strain"], {10: ["stress", "strain"],
+                                                         20: ["stress"]}),
+                'EX_NODE_SET': ["flux"],
+                'reduction': {'EX_ASSEMBLY': ["mass", "volume"]}})
+            self.assertEqual(["energy"], exofile.get_variable_names('EX_GLOBAL'))
+            self.assertEqual(["temp", "disp"], exofile.get_variable_names('EX_NODAL'))
+            self.assertEqual(["stress", "strain"], exofile.get_variable_names('EX_ELEM_BLOCK'))
+            self.assertEqual([True, True, True, False],
+                             exofile.get_variable_truth_table('EX_ELEM_BLOCK'))
+            self.assertEqual(["flux"], exofile.get_variable_names('EX_NODE_SET'))
+            self.assertEqual(["mass", "volume"],
+                             exofile.get_reduction_variable_names('EX_ASSEMBLY'))
+            exofile.put_time(1, 0.5)
+            exofile.put_variable_values('EX_ELEM_BLOCK', 20, "stress", 1, [3.0])
+            self.assertEqual([3.0], list(exofile.get_variable_values('EX_ELEM_BLOCK', 20,
+                                                                     "stress", 1)))
+
+    def test_define_results_rejects_bad_truth_table(self):
+        with exo.exodus(self.temp_exo_path, mode='w', title="define results", numDims=3,
+                        numNodes=5, numElems=3, numBlocks=2, numNodeSets=0,
+                        numSideSets=0) as exofile:
+            exofile.put_elem_blk_info(10, 'TET4', 2, 4, 0)
+            exofile.put_elem_blk_info(20, 'TET4', 1, 4, 0)
+            with self.assertRaises(Exception):
+                exofile.define_results({'EX_ELEM_BLOCK': (["stress"], [True])})
+
+
+class TestTransfer(TransientMeshTestCase):
+    mesh_name = "temp-transfer-from.exo"
+
+    def setUp(self):
+        super().setUp()
+        self.temp_exo_path2 = os.path.join(self.tempdir.name, "temp-transfer-to.exo")
+
+    def test_copy_transfer_copies_all_values(self):
+        with exo.copyTransfer(self.temp_exo_path, self.temp_exo_path2,
+                              additionalGlobalVariables=["work"],
+                              additionalElementVariables=[("damage", [20])]) as exo_to:
+            self.assertEqual(["energy", "work"], exo_to.get_variable_names('EX_GLOBAL'))
+            self.assertEqual(["stress", "strain", "damage"],
+                             exo_to.get_variable_names('EX_ELEM_BLOCK'))
+            self.assertEqual([True, True, False, True, False, True],
+                             exo_to.get_variable_truth_table('EX_ELEM_BLOCK'))
+            with exo.exodus(self.temp_exo_path, mode='r') as exoFrom:
+                for step in range(1, 5):
+                    self.assertEqual([10.0 * step, 0.0],
+                                     list(exo_to.get_all_global_variable_values(step)))
+                    for name in ["temp", "disp"]:
+                        self.assertEqual(list(exoFrom.get_node_variable_values(name, step)),
+                                         list(exo_to.get_node_variable_values(name, step)))
+                    for blkId, name in [(10, "stress"), (10, "strain"), (20, "stress")]:
+                        self.assertEqual(
+                            list(exoFrom.get_variable_values('EX_ELEM_BLOCK', blkId, name, step)),
+                            list(exo_to.get_variable_values('EX_ELEM_BLOCK', blkId, name, step)))
+
+    def test_transfer_variable_values_reports_throughput(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exoFrom:
+            with exo.copy_mesh(self.temp_exo_path, self.temp_exo_path2,
+                               exoFromObj=exoFrom) as exo_to:
+                exo.transfer_variables(exoFrom, exo_to)
+                for prefetch in [0, 2]:
+                    stats = exo.transfer_variable_values(exoFrom, exo_to, ['EX_NODAL'],
+                                                         prefetch=prefetch)
+                    self.assertEqual(2 * 4 * 5 * 8, stats['bytes'])
+                    self.assertGreater(stats['MB/s'], 0.0)
+
+    def test_transfer_variable_values_skips_types_without_variables(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            nodal_path = os.path.join(self.tempdir.name, "temp-nodal-only.exo")
+            with exo.copy_mesh(self.temp_exo_path, nodal_path, exoFromObj=exofile) as nodal:
+                nodal.set_node_variable_number(1)
+                nodal.put_node_variable_name("temp", 1)
+                for step in range(1, 5):
+                    nodal.put_time(step, 0.5 * step)
+                    nodal.put_node_variable_values("temp", step, [float(step)] * 5)
+        with exo.exodus(nodal_path, mode='r') as exoFrom:
+            with exo.copy_mesh(nodal_path, self.temp_exo_path2, exoFromObj=exoFrom) as exo_to:
+                with tempfile.TemporaryFile() as captured:
+                    saved = os.dup(2)
+                    os.dup2(captured.fileno(), 2)
+                    try:
+                        exo.transfer_variables(exoFrom, exo_to)
+                        stats = exo.transfer_variable_values(exoFrom, exo_to)
+                    finally:
+                        os.dup2(saved, 2)
+                        os.close(saved)
+                    captured.seek(0)
+                    self.assertEqual(b"", captured.read())
+                self.assertEqual(4 * 5 * 8, stats['bytes'])
+                self.assertEqual([4.0] * 5, list(exo_to.get_node_variable_values("temp", 4)))
+
+
+class TestPrototypes(TransientMeshTestCase):
+    mesh_name = "temp-prototypes.exo"
+
+    def test_int_width_follows_int64_status(self):
+        prototypes = exo.exodus_prototypes(exo.EX_IDS_INT64_API)
+        self.assertIs(prototypes, exo.exodus_prototypes(exo.EX_IDS_INT64_API | exo.EX_ALL_INT64_DB))
+        self.assertIs(ctypes.c_longlong, prototypes.int_type('ids'))
+        self.assertIs(ctypes.c_int, prototypes.int_type('bulk'))
+
+    def test_wrong_width_array_is_rejected(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            ids = (ctypes.c_longlong * 2)()
+            prototypes = exo.exodus_prototypes(0)
+            with self.assertRaises(ctypes.ArgumentError):
+                prototypes.ex_get_ids(exofile.fileId, exo.get_entity_type('EX_ELEM_BLOCK'), ids)
+            self.assertEqual(2, prototypes.ex_inquire_int(exofile.fileId,
+                                                          exo.ex_inquiry_map('EX_INQ_ELEM_BLK')))
+
+
+class TestIOStats(TransientMeshTestCase):
+    mesh_name = "temp-io-stats.exo"
+    requires_numpy = True
+
+    def test_counts_per_function_and_variable(self):
+        before = exo.io_stats()['total']['calls']
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        profile_io=True) as exofile:
+            for step in range(1, 5):
+                exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", step)
+            exofile.get_node_variable_values("temp", 2)
+            exofile.get_all_global_variable_values(1)
+            stats = exofile.io_stats()
+            self.assertEqual(stats, exofile.io_stats())
+        self.assertEqual({'calls': 6, 'bytes': 4 * 2 * 8 + 5 * 8 + 8},
+                         {key: stats['functions']['ex_get_var'][key] for key in ('calls', 'bytes')})
+        self.assertEqual({'EX_ELEM_BLOCK': ['stress'], 'EX_GLOBAL': ['(all)'],
+                          'EX_NODAL': ['temp']},
+                         {objType: list(names) for objType, names in stats['variables'].items()})
+        self.assertEqual(4, stats['variables']['EX_ELEM_BLOCK']['stress']['calls'])
+        self.assertEqual(40, stats['variables']['EX_NODAL']['temp']['bytes'])
+        self.assertIn('ex_open_int', stats['functions'])
+        self.assertEqual(1, stats['functions']['ex_int64_status']['calls'])
+        self.assertGreater(exo.io_stats()['total']['calls'], before + stats['total']['calls'])
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            self.assertIsInstance(exofile._exodus__lib, exo.ExodusPrototypes)
+            with self.assertRaises(Exception):
+                exofile.io_stats()
+
+    def test_record_from_several_threads(self):
+        stats = exo.IOStats()
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=lambda: [
+                stats.record(stats.functions, 'ex_get_var', 0.5, 8) for _ in range(20000)])
+                for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual([80000, 40000.0, 640000], stats.functions['ex_get_var'])
+        self.assertEqual(80000, stats.as_dict()['total']['calls'])
+
+    def test_json_dump_at_exit(self):
+        output = os.path.join(self.tempdir.name, "io_stats.json")
+        script = ("import exodus\n"
+                  "with exodus.exodus({!r}, mode='r') as exofile:\n"
+                  "    exofile.get_coords()\n").format(self.temp_exo_path)
+        env = dict(os.environ, EXODUS_PY_IO_STATS=output,
+                   PYTHONPATH=os.path.dirname(os.path.abspath(exo.__file__)))
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+        with open(output) as stream:
+            stats = json.load(stream)
+        self.assertEqual(1, stats['functions']['ex_get_coord']['calls'])
+        self.assertEqual(3 * 5 * 8, stats['functions']['ex_get_coord']['bytes'])
+
+
+class TestArrayCache(TransientMeshTestCase):
+    mesh_name = "temp-array-cache.exo"
+
+    def test_repeated_reads_hit(self):
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            self.assertIsNone(exofile.cache_stats())
+        with exo.exodus(self.temp_exo_path, mode='r', cache_bytes=2**20) as exofile:
+            for _ in range(3):
+                for step in range(1, 5):
+                    values = exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", step)
+                    self.assertEqual([step, 2.0 * step], list(values))
+                    self.assertEqual([step + 0.1 * i for i in range(5)],
+                                     list(exofile.get_node_variable_values("temp", step)))
+                exofile.get_coords()
+                self.assertEqual([1, 3, 4, 5], list(exofile.get_elem_connectivity(20)[0]))
+            stats = exofile.cache_stats()
+            self.assertEqual(10, stats['misses'])
+            self.assertEqual(20, stats['hits'])
+            self.assertEqual(10, stats['entries'])
+
+    def test_ctype_reads_return_copies(self):
+        with exo.exodus(self.temp_exo_path, mode='r', cache_bytes=2**20) as exofile:
+            values = exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 1)
+            values[0] = -1.0
+            values = exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 1)
+            self.assertEqual([1.0, 2.0], list(values))
+            values[1] = -1.0
+            self.assertEqual([1.0, 2.0],
+                             list(exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 1)))
+            exofile.get_elem_connectivity(20)[0][0] = 99
+            self.assertEqual([1, 3, 4, 5], list(exofile.get_elem_connectivity(20)[0]))
+            self.assertEqual(3, exofile.cache_stats()['hits'])
+
+    def test_budget_evicts_least_recently_used(self):
+        import_numpy(self)
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        cache_bytes=100) as exofile:
+            for step in range(1, 5):
+                self.assertFalse(exofile.get_node_variable_values("temp", step).flags.writeable)
+            stats = exofile.cache_stats()
+            self.assertEqual(2, stats['entries'])
+            self.assertEqual(2, stats['evictions'])
+            self.assertLessEqual(stats['bytes'], 100)
+            exofile.get_node_variable_values("temp", 4)
+            exofile.get_node_variable_values("temp", 1)
+            self.assertEqual(1, exofile.cache_stats()['hits'])
+
+    def test_put_invalidates_key(self):
+        import_numpy(self)
+        with exo.exodus(self.temp_exo_path, mode='a', array_type='numpy',
+                        cache_bytes=2**20) as exofile:
+            self.assertEqual([2.0, 4.0],
+                             list(exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 2)))
+            exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 3)
+            exofile.get_elem_connectivity(10)
+            exofile.put_variable_values('EX_ELEM_BLOCK', 10, "stress", 2, [7.0, 8.0])
+            exofile.put_elem_connectivity(10, [5, 4, 3, 2, 4, 3, 2, 1])
+            self.assertEqual([7.0, 8.0],
+                             list(exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 2)))
+            self.assertEqual([3.0, 6.0],
+                             list(exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 3)))
+            self.assertEqual([5, 4, 3, 2, 4, 3, 2, 1], list(exofile.get_elem_connectivity(10)[0]))
+            self.assertEqual(1, exofile.cache_stats()['hits'])
+
+
+class TestWriteProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, name, profile):
+        path = os.path.join(self.tempdir.name, name + ".exo")
+        with exo.exodus(path, mode='w', title="profile", numDims=1, numNodes=2000, numElems=0,
+                        numBlocks=0, numNodeSets=0, numSideSets=0,
+                        write_profile=profile) as exofile:
+            exofile.put_coords([0.0] * 2000, [0.0] * 2000, [0.0] * 2000)
+            exofile.set_node_variable_number(1)
+            exofile.put_node_variable_name("temp", 1)
+            for step in range(1, 4):
+                exofile.put_time(step, float(step))
+                exofile.put_node_variable_values("temp", step, [float(step)] * 2000)
+            int64_status = exofile._exodus__lib.ex_int64_status(exofile.fileId)
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+        with exo.exodus(path, mode='r') as exofile:
+            self.assertEqual([3.0] * 2000, list(exofile.get_node_variable_values("temp", 3)))
+        return magic, os.path.getsize(path), int64_status
+
+    def test_profiles_select_format_and_compression(self):
+        fast_magic, fast_size, _ = self.write("fast", 'fast')
+        small_magic, small_size, _ = self.write("small", 'small')
+        self.assertEqual(b'CDF\x02', fast_magic)
+        self.assertEqual(b'\x89HDF', small_magic)
+        self.assertLess(small_size, fast_size)
+        _, _, int64_status = self.write("int64", {'int64': True})
+        self.assertEqual(exo.EX_ALL_INT64_DB, int64_status & exo.EX_ALL_INT64_DB)
+
+    def test_polyhedra_counts_in_int64_file(self):
+        path = os.path.join(self.tempdir.name, "polyhedra.exo")
+        ex_pars = exo.ex_init_params(title=b"polyhedra", num_dim=3, num_nodes=4, num_face=4,
+                                     num_face_blk=1, num_elem=1, num_elem_blk=1)
+        with exo.exodus(path, mode='w', init_params=ex_pars,
+                        write_profile={'int64': True}) as exofile:
+            exofile.put_coords([0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0],
+                               [0.0, 0.0, 0.0, 1.0])
+            exofile.put_polyhedra_face_blk(1, 4, 12, 0)
+            exofile.put_node_count_per_face(1, array.array('q', [3, 3, 3, 3]))
+            exofile.put_face_node_conn(1, [1, 2, 4, 2, 3, 4, 3, 1, 4, 1, 3, 2])
+            exofile.put_polyhedra_elem_blk(10, 1, 4, 0)
+            exofile.put_face_count_per_polyhedra(10, [4])
+            exofile.put_elem_face_conn(10, [1, 2, 3, 4])
+        with exo.exodus(path, mode='r') as exofile:
+            self.assertEqual(b"NFACED", exofile.elem_type(10))
+            for obj_type, blkID, expected in [('EX_FACE_BLOCK', 1, [3, 3, 3, 3]),
+                                              ('EX_ELEM_BLOCK', 10, [4])]:
+                counts = (ctypes.c_int * len(expected))()
+                exofile._exodus__lib.ex_get_entity_count_per_polyhedra(
+                    exofile.fileId, exo.get_entity_type(obj_type), blkID, counts)
+                self.assertEqual(expected, list(counts))
+
+    def test_invalid_profiles_are_rejected(self):
+        for profile in ['tiny', {'compression': 4}, {'level': 1}]:
+            with self.assertRaises(Exception):
+                self.write("invalid", profile)
+
+
+class TestParallelOpen(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_partition_range_covers_all_entries(self):
+        for num_entries in [0, 3, 4, 103]:
+            ranges = [exo.partition_range(num_entries, rank, 4) for rank in range(4)]
+            self.assertEqual(1, ranges[0][0])
+            for (start, count), (next_start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(start + count, next_start)
+            self.assertEqual(num_entries, sum(count for _, count in ranges))
+            self.assertLessEqual(max(ranges)[1] - min(ranges)[1], 1)
+        with self.assertRaises(Exception):
+            exo.partition_range(10, 4, 4)
+
+    def test_partial_puts_assemble_full_variables(self):
+        path = os.path.join(self.tempdir.name, "partial.exo")
+        with exo.exodus(path, mode='w', title="partial", numDims=1, numNodes=10, numElems=9,
+                        numBlocks=1, numNodeSets=0, numSideSets=0) as exofile:
+            exofile.put_coords([float(i) for i in range(10)], [0.0] * 10, [0.0] * 10)
+            exofile.put_elem_blk_info(1, "BAR2", 9, 2, 0)
+            exofile.put_elem_connectivity(1, [n for i in range(1, 10) for n in (i, i + 1)])
+            exofile.set_node_variable_number(1)
+            exofile.put_node_variable_name("temp", 1)
+            exofile.set_element_variable_number(1)
+            exofile.put_element_variable_name("stress", 1)
+            exofile.set_element_variable_truth_table([True])
+            exofile.put_time(1, 1.0)
+            for rank in range(3):
+                start, count = exo.partition_range(10, rank, 3)
+                exofile.put_partial_node_variable_values(
+                    "temp", 1, start, [float(i) for i in range(start, start + count)])
+                start, count = exo.partition_range(9, rank, 3)
+                exofile.put_partial_element_variable_values(
+                    1, "stress", 1, start, [-float(i) for i in range(start, start + count)])
+        with exo.exodus(path, mode='r') as exofile:
+            self.assertEqual([float(i) for i in range(1, 11)],
+                             list(exofile.get_node_variable_values("temp", 1)))
+            self.assertEqual([-float(i) for i in range(1, 10)],
+                             list(exofile.get_element_variable_values(1, "stress", 1)))
+
+    @unittest.skipIf(exo.parallel_available(), "exodus library has MPI support")
+    def test_communicator_requires_parallel_library(self):
+        path = os.path.join(os.path.dirname(__file__), "test-assembly.exo")
+        with self.assertRaises(Exception):
+            exo.exodus(path, mode='r', comm=object())
+
+    @unittest.skipUnless(exo.parallel_available() and shutil.which("mpirun")
+                         and importlib.util.find_spec("mpi4py"),
+                         "needs mpirun, mpi4py and an exodus library with MPI support")
+    def test_mpirun_shared_file(self):
+        driver = os.path.join(os.path.dirname(__file__), "parallel_exodus3.py")
+        path = os.path.join(self.tempdir.name, "shared.exo")
+        result = subprocess.run(["mpirun", "-n", "4", sys.executable, driver, path],
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, timeout=300)
+        self.assertEqual(0, result.returncode, result.stdout)
+        self.assertIn("parallel open: 4 ranks ok", result.stdout)
+
+
+class TestAdjacency(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(os.path.dirname(__file__), "exomerge_unit_test.e")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    @staticmethod
+    def rows(offsets, indices):
+        return [sorted(indices[offsets[i]:offsets[i + 1]].tolist()) for i in range(len(offsets) - 1)]
+
+    def test_csr_matches_element_connectivity(self):
+        import_numpy(self)
+        with exo.exodus(self.path, mode='r', array_type='numpy') as exofile:
+            elems = []
+            for block_id in exofile.get_ids('EX_ELEM_BLOCK'):
+                connectivity, num_elems, num_nodes = exofile.get_elem_connectivity(block_id)
+                elems += [set(connectivity[k * num_nodes:(k + 1) * num_nodes] - 1)
+                          for k in range(num_elems)]
+            node_elems = [set() for _ in range(exofile.num_nodes())]
+            node_nodes = [set() for _ in range(exofile.num_nodes())]
+            for e, nodes in enumerate(elems):
+                for n in nodes:
+                    node_elems[n].add(e)
+                    node_nodes[n].update(nodes - {n})
+            elem_elems = [set().union(*(node_elems[n] for n in nodes)) - {e}
+                          for e, nodes in enumerate(elems)]
+            self.assertEqual([sorted(x) for x in node_elems],
+                             self.rows(*exofile.get_node_elem_adjacency()))
+            self.assertEqual([sorted(x) for x in node_nodes],
+                             self.rows(*exofile.get_node_node_adjacency()))
+            self.assertEqual([sorted(x) for x in elem_elems],
+                             self.rows(*exofile.get_elem_elem_adjacency()))
+            self.assertIs(exofile.get_elem_elem_adjacency(), exofile.get_elem_elem_adjacency())
+
+            connectivity, nodeToElems, elemToElems = [], [], []
+            exo.collectLocalElemToLocalElems(exofile, connectivity, nodeToElems, elemToElems)
+            self.assertEqual([sorted(x) for x in elems], [sorted(c - 1) for c in connectivity])
+            self.assertEqual([[]] + [sorted(x) for x in node_elems], nodeToElems)
+            self.assertEqual([sorted(x | {e}) for e, x in enumerate(elem_elems)], elemToElems)
+
+    def test_collect_lists_without_numpy(self):
+        with exo.exodus(self.path, mode='r') as exofile:
+            expected = [], [], []
+            exo.collectLocalElemToLocalElems(exofile, *expected)
+            with mock.patch.object(exo, '_import_numpy', lambda: None):
+                lists = [], [], []
+                exo.collectLocalElemToLocalElems(exofile, *lists)
+            self.assertEqual([list(c) for c in expected[0]], [list(c) for c in lists[0]])
+            self.assertEqual(expected[1:], lists[1:])
+
+    def test_collect_lists_use_supplied_lists(self):
+        connectivity = [[1, 2], [2, 3], [4]]
+        with exo.exodus(self.path, mode='r') as exofile:
+            for import_numpy in [exo._import_numpy, lambda: None]:
+                with mock.patch.object(exo, '_import_numpy', import_numpy):
+                    nodeToElems, elemToElems = [], []
+                    exo.collectLocalElemToLocalElems(exofile, connectivity, nodeToElems,
+                                                     elemToElems)
+                    self.assertEqual([[], [0], [0, 1], [1], [2]], nodeToElems[:5])
+                    self.assertEqual([[0, 1], [0, 1], [2]], elemToElems)
+                    elemToElems = []
+                    exo.collectLocalElemToLocalElems(exofile, connectivity,
+                                                     [[], [0], [0, 1], [1, 2], [2]], elemToElems)
+                    self.assertEqual([[0, 1], [0, 1, 2], [2]], elemToElems)
+
+    def test_face_adjacency_of_hex_grid(self):
+        import_numpy(self)
+        # 2 x 2 x 1 hexes: diagonal elements share an edge but no face
+        path = os.path.join(self.tempdir.name, "grid.exo")
+        index = {(i, j, k): 1 + i + 3 * j + 9 * k
+                 for k in range(2) for j in range(3) for i in range(3)}
+        with exo.exodus(path, mode='w', title="grid", numDims=3, numNodes=18, numElems=4,
+                        numBlocks=1, numNodeSets=0, numSideSets=0) as exofile:
+            coords = sorted(index, key=index.get)
+            exofile.put_coords(*[[float(c[d]) for c in coords] for d in range(3)])
+            exofile.put_elem_blk_info(1, "HEX8", 4, 8, 0)
+            connectivity = []
+            for j in range(2):
+                for i in range(2):
+                    for k in range(2):
+                        connectivity += [index[(i, j, k)], index[(i + 1, j, k)],
+                                         index[(i + 1, j + 1, k)], index[(i, j + 1, k)]]
+            exofile.put_elem_connectivity(1, connectivity)
+            self.assertEqual([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]],
+                             self.rows(*exofile.get_elem_elem_adjacency('node')))
+            self.assertEqual([[1, 2], [0, 3], [0, 3], [1, 2]],
+                             self.rows(*exofile.get_elem_elem_adjacency('face')))
+        with exo.exodus(self.path, mode='r') as exofile:
+            faces = self.rows(*exofile.get_elem_elem_adjacency('face'))
+            nodes = self.rows(*exofile.get_elem_elem_adjacency('node'))
+        for e, (face, node) in enumerate(zip(faces, nodes)):
+            self.assertLessEqual(len(face), 6)
+            self.assertTrue(set(face) <= set(node))
+            self.assertTrue(all(e in faces[f] for f in face))
+
+
+class TestTimeInterpolation(TransientMeshTestCase):
+    mesh_name = "temp-interpolation.exo"
+    requires_numpy = True
+
+    def test_weights(self):
+        steps, weights = exo._interpolation_weights([0.0, 1.0, 2.0, 3.0], 1.71, 'cubic')
+        self.assertEqual([2, 3, 1, 4], steps)
+        self.assertEqual([0.2766165, 0.8263335, -0.0298555, -0.0730945],
+                         [round(w, 7) for w in weights])
+        self.assertEqual(([2], [1.0]), exo._interpolation_weights([0.0, 1.0, 2.0], 1.0, 'cubic'))
+        steps, weights = exo._interpolation_weights([0.0, 1.0, 2.0], 0.25, 'cubic')
+        self.assertEqual([1, 2, 3], steps)
+        self.assertAlmostEqual(1.0, sum(weights))
+        with self.assertRaises(Exception):
+            exo._interpolation_weights([0.0, 1.0], 1.5, 'linear')
+        with self.assertRaises(Exception):
+            exo._interpolation_weights([0.0, 1.0], 0.5, 'nearest')
+
+    def test_values_at_time(self):
+        # the stored values are linear in time, which both methods reproduce
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            for method in ('linear', 'cubic'):
+                stress = exofile.get_variable_values_at_time('EX_ELEM_BLOCK', 10, "stress", 0.75,
+                                                             method)
+                self.assertEqual([1.5, 3.0], [round(v, 12) for v in stress])
+                temp = exofile.get_variable_values_at_time('EX_NODAL', 0, "temp", 1.8, method)
+                self.assertEqual([3.6, 3.7, 3.8, 3.9, 4.0], [round(v, 12) for v in temp])
+            self.assertEqual([4.0, 8.0], list(exofile.get_variable_values_at_time(
+                'EX_ELEM_BLOCK', 10, "stress", 2.0)))
+            with self.assertRaises(Exception):
+                exofile.get_variable_values_at_time('EX_NODAL', 0, "temp", 0.25)
+        with exo.exodus(self.temp_exo_path, mode='r') as exofile:
+            self.assertEqual([4.5], exofile.get_variable_values_at_time(
+                'EX_ELEM_BLOCK', 20, "stress", 0.75))
+
+    def test_resample(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile:
+            values = exofile.resample('EX_ELEM_BLOCK', 20, times=[1.25, 0.5, 0.6], method='cubic')
+            self.assertEqual((3, 2, 1), values.shape)
+            self.assertEqual([7.5, 3.0, 3.6], [round(v, 12) for v in values[:, 0, 0]])
+            self.assertTrue(all(v != v for v in values[:, 1, 0]))
+            nodal = exofile.resample('EX_NODAL', None, "disp", [1.0, 1.5])
+            self.assertEqual([-2.0, -3.0], [round(v, 12) for v in nodal[:, 0, 0]])
+
+
+class TestIdIndex(unittest.TestCase):
+    def setUp(self):
+        import_numpy(self)
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_sorted_and_identity_lookups(self):
+        index = exo.IdIndex([40, 10, 30, 10, 20], 'test map')
+        self.assertFalse(index.identity)
+        self.assertEqual([2, 1, 5, 2], index.indices([10, 40, 20, 10]).tolist())
+        self.assertEqual(3, index.indices(30))
+        self.assertEqual([40, 30], index.ids([1, 3]).tolist())
+        self.assertEqual([True, False, True], index.contains([20, 25, 40]).tolist())
+        self.assertNotIn(50, index)
+        with self.assertRaisesRegex(Exception, "no entry with id 50 in test map"):
+            index.indices([10, 50])
+        with self.assertRaises(Exception):
+            index.ids([0])
+        identity = exo.IdIndex(range(1, 6))
+        self.assertTrue(identity.identity)
+        self.assertEqual([5, 1], identity.indices([5, 1]).tolist())
+        self.assertEqual([False, True], identity.contains([6, 3]).tolist())
+
+    def test_handle_lookups_and_block_local_resolution(self):
+        path = os.path.join(self.tempdir.name, "ids.exo")
+        elem_ids = [105, 101, 103, 102, 104]
+        with exo.exodus(path, mode='w', title="ids", numDims=1, numNodes=6, numElems=5,
+                        numBlocks=2, numNodeSets=0, numSideSets=0) as exofile:
+            exofile.put_coords([float(i) for i in range(6)], [0.0] * 6, [0.0] * 6)
+            exofile.put_elem_blk_info(20, "BAR2", 2, 2, 0)
+            exofile.put_elem_blk_info(10, "BAR2", 3, 2, 0)
+            exofile.put_elem_connectivity(20, [1, 2, 2, 3])
+            exofile.put_elem_connectivity(10, [3, 4, 4, 5, 5, 6])
+            exofile.put_elem_id_map(elem_ids)
+        with exo.exodus(path, mode='r') as exofile:
+            self.assertTrue(exofile.id_index('EX_NODE_MAP').identity)
+            self.assertEqual([2, 1], exofile.id_index('EX_ELEM_BLOCK').indices([10, 20]).tolist())
+            self.assertEqual([1, 5], exofile.id_index('EX_ELEM_MAP').indices([105, 104]).tolist())
+            blocks, local = exofile.elem_ids_to_block_local([101, 102, 105, 104])
+            self.assertEqual([20, 10, 20, 10], blocks.tolist())
+            self.assertEqual([2, 2, 1, 3], local.tolist())
+            self.assertEqual((10, 1), exofile.elem_ids_to_block_local(103))
+            self.assertEqual([3, 1], exofile.block_id_index('EX_ELEM_BLOCK', 10)
+                             .indices([104, 103]).tolist())
+
+
+class TestSidecarCache(TransientMeshTestCase):
+    mesh_name = "temp-sidecar.exo"
+    requires_numpy = True
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.tempdir.name, "cache")
+
+    def read_all(self, cache):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        sidecar=cache) as exofile:
+            return (exofile.get_coords(), exofile.get_elem_connectivity(10),
+                    exofile.get_node_id_map(), exofile.get_elem_id_map(),
+                    exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 2),
+                    exofile.get_node_variable_values("temp", 3))
+
+    def test_second_open_is_served_from_cache(self):
+        cache = exo.SidecarCache(self.cache_dir)
+        first = self.read_all(cache)
+        self.assertGreater(cache.size(), 0)
+        second = self.read_all(self.cache_dir)
+        self.assertIsInstance(second[2], self.np.memmap)
+        self.assertIsInstance(second[0][0], self.np.memmap)
+        for expected, actual in zip(first[0], second[0]):
+            self.assertEqual(list(expected), list(actual))
+        self.assertEqual(list(first[1][0]), list(second[1][0]))
+        self.assertEqual(first[1][1:], second[1][1:])
+        for expected, actual in zip(first[2:], second[2:]):
+            self.assertEqual(list(expected), list(actual))
+        self.assertEqual([1, 2, 3, 4, 2, 3, 4, 5], list(second[1][0]))
+        self.assertEqual([2.0, 4.0], list(second[4]))
+
+    def test_changed_source_is_invalidated(self):
+        cache = exo.SidecarCache(self.cache_dir)
+        self.read_all(cache)
+        os.remove(self.temp_exo_path)
+        write_transient_mesh(self.temp_exo_path, num_steps=5)
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        sidecar=cache) as exofile:
+            self.assertEqual(0, cache.size())
+            self.assertNotIsInstance(exofile.get_node_id_map(), self.np.memmap)
+
+    def test_budget_evicts_least_recently_used(self):
+        cache = exo.SidecarCache(self.cache_dir, budget_bytes=400, variables=["temp"])
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy',
+                        sidecar=cache) as exofile:
+            exofile.get_variable_values('EX_ELEM_BLOCK', 10, "stress", 1)
+            for step in range(1, 5):
+                exofile.get_node_variable_values("temp", step)
+                self.assertLessEqual(cache.size(), 400)
+            self.assertIsNone(cache.lookup(self.temp_exo_path, "var/EX_NODAL/0/temp/1"))
+            self.assertIsNotNone(cache.lookup(self.temp_exo_path, "var/EX_NODAL/0/temp/4"))
+        cache.invalidate()
+        self.assertEqual(0, cache.size())
+
+    def test_manifest_is_written_on_flush(self):
+        cache = exo.SidecarCache(self.cache_dir)
+        cache.attach(self.temp_exo_path)
+        manifest_path = os.path.join(self.cache_dir, exo.SidecarCache.MANIFEST)
+        with open(manifest_path) as manifest:
+            before = manifest.read()
+        for step in range(1, 5):
+            cache.store(self.temp_exo_path, "step/{}".format(step), self.np.arange(step))
+        with open(manifest_path) as manifest:
+            self.assertEqual(before, manifest.read())
+        cache.flush()
+        with open(manifest_path) as manifest:
+            arrays = json.load(manifest)[os.path.abspath(self.temp_exo_path)]['arrays']
+        self.assertEqual(["step/1", "step/2", "step/3", "step/4"], sorted(arrays))
+
+    def test_shared_directory_budget(self):
+        first = exo.SidecarCache(self.cache_dir, budget_bytes=600)
+        second = exo.SidecarCache(self.cache_dir, budget_bytes=600)
+        for cache in [first, second]:
+            cache.attach(self.temp_exo_path)
+        first.store(self.temp_exo_path, "first", self.np.zeros(40))
+        first.flush()
+        second.store(self.temp_exo_path, "second", self.np.zeros(40))
+        second.flush()
+        self.assertLessEqual(first.size(), 600)
+        self.assertIsNone(first.lookup(self.temp_exo_path, "first"))
+        self.assertIsNotNone(first.lookup(self.temp_exo_path, "second"))
+
+    def test_sidecar_requires_numpy_read_mode(self):
+        with self.assertRaises(Exception):
+            exo.exodus(self.temp_exo_path, mode='r', sidecar=self.cache_dir)
+
+
+class TestDecomposedReader(TransientMeshTestCase):
+    mesh_name = "temp-global.exo"
+    requires_numpy = True
+
+    def setUp(self):
+        super().setUp()
+        import exodus_decomposed
+        self.exodus_decomposed = exodus_decomposed
+        self.base = os.path.join(self.tempdir.name, "temp-decomposed.exo")
+        write_transient_piece(self.base + ".2.0", [15, 13, 12, 14], [200])
+        write_transient_piece(self.base + ".2.1", [14, 11, 15, 12, 13], [100, 300])
+
+    def test_finds_pieces(self):
+        self.assertEqual([self.base + ".2.0", self.base + ".2.1"],
+                         self.exodus_decomposed.decomposed_files(self.base))
+        os.remove(self.base + ".2.1")
+        with self.assertRaises(Exception):
+            self.exodus_decomposed.decomposed_files(self.base)
+
+    def test_assembles_global_arrays(self):
+        with exo.exodus(self.temp_exo_path, mode='r', array_type='numpy') as exofile, \
+                self.exodus_decomposed.DecomposedExodusReader(self.base, processes=2) as reader:
+            self.assertEqual(5, reader.num_nodes())
+            self.assertEqual(3, reader.num_elems())
+            self.assertEqual([11, 12, 13, 14, 15], list(reader.get_node_id_map()))
+            self.assertEqual([100, 200, 300], list(reader.get_elem_id_map()))
+            for expected, actual in zip(exofile.get_coords(), reader.get_coords()):
+                self.assertEqual(list(expected), list(actual))
+            for blkId in [10, 20]:
+                self.assertEqual(exofile.elem_blk_info(blkId), reader.elem_blk_info(blkId))
+                self.assertEqual(list(exofile.get_elem_connectivity(blkId)[0]),
+                                 list(reader.get_elem_connectivity(blkId)[0]))
+            self.assertEqual(list(exofile.get_times()), list(reader.get_times()))
+            self.assertEqual(list(exofile.get_global_variable_values("energy")),
+                             list(reader.get_global_variable_values("energy")))
+            self.np.testing.assert_allclose(exofile.get_variable_block('EX_NODAL', 0),
+                                            reader.get_variable_block('EX_NODAL', 0))
+            for blkId in [10, 20]:
+                self.np.testing.assert_allclose(
+                    exofile.get_variable_block('EX_ELEM_BLOCK', blkId),
+                    reader.get_variable_block('EX_ELEM_BLOCK', blkId))
+            temp = reader.get_node_variable_values("temp", 3)
+        self.np.testing.assert_allclose([3.0, 3.1, 3.2, 3.3, 3.4], temp)
+
+
+class TestDecomposedWriter(unittest.TestCase):
+    def setUp(self):
+        self.np = import_numpy(self)
+        import exodus_decomposed
+        self.exodus_decomposed = exodus_decomposed
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.tempdir.name, "temp-split.exo")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def assertRoundTrip(self, path, elem_ranks, num_ranks=None):
+        files = self.exodus_decomposed.write_decomposed(self.base, path, elem_ranks,
+                                                        num_ranks=num_ranks, processes=2)
+        with exo.exodus(path, mode='r', array_type='numpy') as exofile, \
+                self.exodus_decomposed.DecomposedExodusReader(files, processes=2) as reader:
+            self.assertEqual(list(exofile.get_node_id_map()), list(reader.get_node_id_map()))
+            self.assertEqual(list(exofile.get_elem_id_map()), list(reader.get_elem_id_map()))
+            for expected, actual in zip(exofile.get_coords(), reader.get_coords()):
+                self.assertEqual(list(expected), list(actual))
+            for blkId in exofile.get_ids('EX_ELEM_BLOCK'):
+                self.assertEqual(list(exofile.get_elem_connectivity(blkId)[0]),
+                                 list(reader.get_elem_connectivity(blkId)[0]))
+                self.np.testing.assert_array_equal(
+                    exofile.get_variable_block('EX_ELEM_BLOCK', blkId),
+                    reader.get_variable_block('EX_ELEM_BLOCK', blkId))
+            self.np.testing.assert_array_equal(exofile.get_variable_block('EX_NODAL', 0),
+                                               reader.get_variable_block('EX_NODAL', 0))
+            node_ids = exofile.get_node_id_map()
+            for nsId in exofile.get_ids('EX_NODE_SET'):
+                members = set()
+                for piece in files:
+                    with exo.exodus(piece, mode='r', array_type='numpy') as piecefile:
+                        piece_ids = piecefile.get_node_id_map()
+                        members.update(piece_ids[piecefile.get_node_set_nodes(nsId).astype(int) - 1])
+                self.assertEqual(set(node_ids[exofile.get_node_set_nodes(nsId) - 1]), members)
+            num_sides = {ssId: 0 for ssId in exofile.get_ids('EX_SIDE_SET')}
+            for piece in files:
+                with exo.exodus(piece, mode='r') as piecefile:
+                    for ssId in num_sides:
+                        num_sides[ssId] += piecefile.num_faces_in_side_set(ssId)
+            for ssId, count in num_sides.items():
+                self.assertEqual(exofile.num_faces_in_side_set(ssId), count)
+        return files
+
+    def test_split_transient_mesh(self):
+        path = os.path.join(self.tempdir.name, "temp-global.exo")
+        write_transient_mesh(path)
+        files = self.assertRoundTrip(path, [1, 0, 1], num_ranks=3)
+        self.assertEqual([self.base + ".3.0", self.base + ".3.1", self.base + ".3.2"], files)
+        with exo.exodus(files[0], mode='r') as piece:
+            self.assertEqual([200], list(piece.get_elem_id_map()))
+            self.assertEqual([12, 13, 14, 15], list(piece.get_node_id_map()))
+            self.assertEqual(0, piece.num_elems_in_blk(20))
+        with exo.exodus(files[2], mode='r') as piece:
+            self.assertEqual(0, piece.num_nodes())
+        with self.assertRaises(Exception):
+            self.exodus_decomposed.write_decomposed(self.base, path, [1, 0, 1], num_ranks=3)
+
+    def test_split_model_with_sets(self):
+        path = os.path.join(os.path.dirname(__file__), "exomerge_unit_test.e")
+        self.assertRoundTrip(path, [(elem * 7) % 4 for elem in range(1300)])
+
+
+class TestStatistics(TransientMeshTestCase):
+    requires_numpy = True
+
+    def setUp(self):
+        super().setUp()
+        import exodus_stats
+        self.exodus_stats = exodus_stats
+
+    def test_streaming_accumulators_match_numpy(self):
+        np = self.np
+        values = np.random.default_rng(0).uniform(size=(500, 200))
+        moments = self.exodus_stats.RunningMoments(200)
+        sketch = self.exodus_stats.QuantileSketch(200, compression=64)
+        for step, row in enumerate(values):
+            moments.update(row, float(step))
+            sketch.update(row)
+        np.testing.assert_allclose(values.mean(axis=0), moments.mean)
+        np.testing.assert_allclose(values.std(axis=0), moments.std())
+        np.testing.assert_array_equal(values.argmax(axis=0), moments.time_of_max)
+        for q in [0.01, 0.5, 0.95]:
+            estimate = sketch.quantile(q, moments.min, moments.max)
+            self.assertLess(np.abs(estimate - np.quantile(values, q, axis=0)).max(), 0.02)
+        combined = sketch.combined().quantile(0.5)[0]
+        self.assertAlmostEqual(np.median(values), combined, delta=0.01)
+
+    def test_block_statistics_and_write_back(self):
+        stats = self.exodus_stats.variable_statistics(self.temp_exo_path, quantiles=[0.5],
+                                                      processes=2)
+        self.assertEqual({(10, 'stress'), (10, 'strain'), (20, 'stress')}, set(stats))
+        stress = stats[(10, 'stress')]
+        self.assertEqual([1.0, 2.0], list(stress.min))
+        self.assertEqual([4.0, 8.0], list(stress.max))
+        self.assertEqual([2.5, 5.0], list(stress.mean))
+        self.assertEqual([0.5, 0.5], list(stress.time_of_min))
+        self.assertEqual([2.0, 2.0], list(stress.time_of_max))
+        self.assertEqual([2.5, 5.0], list(stress.quantiles[0.5]))
+        self.assertEqual(8.0, stress.summary['max'])
+        self.assertEqual(2, stress.summary['entity_of_max'])
+        self.assertAlmostEqual(3.75, stress.summary['mean'])
+        nodal = self.exodus_stats.variable_statistics(self.temp_exo_path, 'EX_NODAL',
+                                                      names=['temp'], processes=1)
+        self.np.testing.assert_allclose([4.0, 4.1, 4.2, 4.3, 4.4], nodal[(0, 'temp')].max)
+
+        stats.update(nodal)
+        output = os.path.join(self.tempdir.name, "stats.exo")
+        self.exodus_stats.write_statistics(self.temp_exo_path, output, stats,
+                                           fields=('max', 'time_of_max', 0.5))
+        with exo.exodus(output, mode='r') as exofile:
+            self.assertEqual([2.0], list(exofile.get_times()))
+            self.assertIn("stress_p50", exofile.get_variable_names('EX_ELEM_BLOCK'))
+            self.assertEqual([4.0, 8.0],
+                             list(exofile.get_element_variable_values(10, "stress_max", 1)))
+            self.assertEqual([12.0],
+                             list(exofile.get_element_variable_values(20, "stress_max", 1)))
+            self.np.testing.assert_allclose([2.0] * 5,
+                                            exofile.get_node_variable_values("temp_time_of_max", 1))
+        with self.assertRaises(Exception):
+            self.exodus_stats.write_statistics(self.temp_exo_path, output, stats)
+
+
+class TestCompare(TransientMeshTestCase):
+    mesh_name = "baseline.exo"
+    requires_numpy = True
+
+    def setUp(self):
+        super().setUp()
+        import exodus_diff
+        self.exodus_diff = exodus_diff
+        self.baseline = self.temp_exo_path
+        self.candidate = os.path.join(self.tempdir.name, "candidate.exo")
+        shutil.copy(self.baseline, self.candidate)
+
+    def test_value_differences(self):
+        self.assertTrue(self.exodus_diff.compare(self.candidate, self.baseline).passed)
+        with exo.exodus(self.candidate, mode='a') as exofile:
+            exofile.put_variable_values('EX_ELEM_BLOCK', 10, "stress", 3, [3.0, 6.006])
+        report = self.exodus_diff.compare(self.candidate, self.baseline, rtol=1.0e-6,
+                                          processes=2)
+        self.assertFalse(report.passed)
+        self.assertEqual([], report.structure)
+        [stress] = report.failures()
+        self.assertEqual(('EX_ELEM_BLOCK', 10, 'stress', 1, 8),
+                         (stress.obj_type, stress.entity_id, stress.name, stress.failures,
+                          stress.compared))
+        self.assertEqual((3, 1.5, 2, 200), stress.max_abs_location)
+        self.assertEqual((3, 1.5, 2, 200, 6.006, 6.0), stress.first_failure)
+        self.assertAlmostEqual(0.006, stress.max_abs)
+        self.assertAlmostEqual(0.006 / 6.006, stress.max_rel)
+        self.assertIn("max abs 6.0", str(report))
+        self.assertIn("step 3 (t=1.5) element 200", str(report))
+        self.assertTrue(self.exodus_diff.compare(self.candidate, self.baseline,
+                                                 rtol=1.0e-2).passed)
+        self.assertTrue(self.exodus_diff.compare(self.candidate, self.baseline,
+                                                 atol=0.01, rtol=0.0).passed)
+        report = self.exodus_diff.compare(self.candidate, self.baseline, fail_fast=True,
+                                          processes=1)
+        self.assertTrue(report.stopped_early)
+        self.assertEqual(1, len(report.failures()))
+
+    def test_structure_and_special_values(self):
+        shorter = os.path.join(self.tempdir.name, "shorter.exo")
+        write_transient_mesh(shorter, num_steps=3)
+        report = self.exodus_diff.compare(shorter, self.baseline)
+        self.assertEqual(["number of time steps: 3 vs 4"], report.structure)
+        self.assertEqual(0, sum(diff.failures for diff in report.variables))
+        temp = [diff for diff in report.variables if diff.name == 'temp'][0]
+        self.assertEqual(3 * 5, temp.compared)
+        self.assertFalse(report.passed)
+        np = self.np
+        result = self.exodus_diff.VariableDifference('EX_NODAL', 0, 'temp')
+        comparer = self.exodus_diff._Comparer(1.0e-6, 0.0)
+        comparer.update(result, np.array([np.nan, np.inf, 0.0, 1.0, np.inf]),
+                        np.array([np.nan, np.inf, 0.0, np.nan, 1.0]), 1, 0.5)
+        self.assertEqual(2, result.failures)
+        self.assertEqual((1, 0.5, 4, None, 1.0), result.first_failure[:5])
+        self.assertEqual(np.inf, result.max_abs)
+
+
+class TestMemoryMappedReader(TransientMeshTestCase):
+    mesh_name = "temp-mmap.exo"
+    requires_numpy = True
+
+    def setUp(self):
+        super().setUp()
+        import exodus_mmap
+        self.exodus_mmap = exodus_mmap.exodus_mmap
+        input_dir = os.path.dirname(__file__)
+        self.paths = [self.temp_exo_path,
+                      os.path.join(input_dir, "exomerge_unit_test.e"),
+                      os.path.join(input_dir, "test-assembly.exo")]
+
+    def assertArrayEqual(self, expected, actual):
+        self.assertEqual(list(self.np.asarray(expected)), list(self.np.asarray(actual)))
+
+    def test_mesh_matches_library(self):
+        for path in self.paths:
+            with exo.exodus(path, mode='r', array_type='numpy') as exofile, \
+                    self.exodus_mmap(path) as mapped:
+                self.assertEqual(exofile.title(), mapped.title())
+                self.assertEqual(exofile.num_nodes(), mapped.num_nodes())
+                self.assertEqual(exofile.num_elems(), mapped.num_elems())
+                self.assertEqual(exofile.get_coord_names(), mapped.get_coord_names())
+                for expected, actual in zip(exofile.get_coords(), mapped.get_coords()):
+                    self.assertArrayEqual(expected, actual)
+                self.assertArrayEqual(exofile.get_node_id_map(), mapped.get_node_id_map())
+                self.assertArrayEqual(exofile.get_elem_id_map(), mapped.get_elem_id_map())
+                for objType in ['EX_ELEM_BLOCK', 'EX_NODE_SET', 'EX_SIDE_SET']:
+                    ids = exofile.get_ids(objType)
+                    self.assertArrayEqual(ids, mapped.get_ids(objType))
+                    if len(ids) > 0:
+                        self.assertEqual(exofile.get_names(objType), mapped.get_names(objType))
+                for blkId in exofile.get_ids('EX_ELEM_BLOCK'):
+                    self.assertEqual(exofile.elem_blk_info(blkId), mapped.elem_blk_info(blkId))
+                    expected = exofile.get_elem_connectivity(blkId)
+                    actual = mapped.get_elem_connectivity(blkId)
+                    self.assertArrayEqual(expected[0], actual[0])
+                    self.assertEqual(expected[1:], actual[1:])
+                for nsId in exofile.get_ids('EX_NODE_SET'):
+                    self.assertArrayEqual(exofile.get_node_set_nodes(nsId),
+                                          mapped.get_node_set_nodes(nsId))
+                for ssId in exofile.get_ids('EX_SIDE_SET'):
+                    for expected, actual in zip(exofile.get_side_set(ssId),
+                                                mapped.get_side_set(ssId)):
+                        self.assertArrayEqual(expected, actual)
+
+    def test_variables_match_library(self):
+        for path in self.paths:
+            with exo.exodus(path, mode='r', array_type='numpy') as exofile, \
+                    self.exodus_mmap(path) as mapped:
+                self.assertArrayEqual(exofile.get_times(), mapped.get_times())
+                steps = range(1, exofile.num_times() + 1)
+                for name in exofile.get_variable_names('EX_GLOBAL'):
+                    self.assertArrayEqual(exofile.get_global_variable_values(name),
+                                          mapped.get_global_variable_values(name))
+                for name in exofile.get_variable_names('EX_NODAL'):
+                    for step in steps:
+                        self.assertArrayEqual(exofile.get_node_variable_values(name, step),
+                                              mapped.get_node_variable_values(name, step))
+                for objType in ['EX_ELEM_BLOCK', 'EX_NODE_SET', 'EX_SIDE_SET']:
+                    names = exofile.get_variable_names(objType)
+                    self.assertEqual(names, mapped.get_variable_names(objType))
+                    if not names:
+                        continue
+                    truth = exofile.get_variable_truth_table(objType)
+                    self.assertEqual(list(truth), mapped.get_variable_truth_table(objType))
+                    for index, objId in enumerate(exofile.get_ids(objType)):
+                        for var, name in enumerate(names):
+                            if not truth[index * len(names) + var]:
+                                continue
+                            for step in steps:
+                                self.assertArrayEqual(
+                                    exofile.get_variable_values(objType, objId, name, step),
+                                    mapped.get_variable_values(objType, objId, name, step))
+
+    def test_arrays_are_read_only_views(self):
+        with self.exodus_mmap(self.temp_exo_path) as mapped:
+            temp = mapped.get_node_variable_values("temp", 2)
+            self.assertArrayEqual([2.0 + 0.1 * i for i in range(5)], temp)
+            self.assertFalse(temp.flags.writeable)
+            self.assertFalse(temp.flags.owndata)
+            with self.assertRaises(Exception):
+                mapped.get_variable_values('EX_ELEM_BLOCK', 20, "strain", 1)
+
+    def test_netcdf4_files_are_rejected(self):
+        path = os.path.join(self.tempdir.name, "temp-hdf5.exo")
+        with open(path, 'wb') as f:
+            f.write(b'\x89HDF\r\n\x1a\n' + bytes(64))
+        with self.assertRaises(Exception):
+            self.exodus_mmap(path)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def setUp(self):
+        import_numpy(self)
+        import benchmark_exodus3
+        self.benchmark_exodus3 = benchmark_exodus3
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_smoke_run_of_every_benchmark(self):
+        path = os.path.join(self.tempdir.name, "benchmark.json")
+        names = sorted(self.benchmark_exodus3.BENCHMARKS)
+        with redirect_stdout(io.StringIO()):
+            self.benchmark_exodus3.main(['--size', '2', '--steps', '1', '--repeat', '1',
+                                         '--elements', '8', '--sets', '10', '--variables', '5',
+                                         '--probes', '4', '--json', path] + names)
+        with open(path) as f:
+            results = json.load(f)['results']
+        self.assertEqual(names, sorted({record['benchmark'] for record in results}))
+        for record in results:
+            self.assertGreaterEqual(record['seconds'], 0.0)
+
+
+@contextmanager
+def swap_module_value(name, new_value):
+    old_value = getattr(exo, name)
+    setattr(exo, name, new_value)
+    yield
+    setattr(exo, name, old_value)
+
+
 @contextmanager
 def swap_ACCESS_value(new_access_value):
     old_value = exo.ACCESS